@@ -0,0 +1,7 @@
+# benchmarks/__init__.py
+#
+# Pruebas de rendimiento del lexer y del parser sobre programas generados a partir de la gramática.
+# Se ejecutan desde la raíz del repositorio:
+#   python -m benchmarks run --output base.json
+#   python -m benchmarks compare base.json nuevo.json
+#   python -m benchmarks generate --shape nested --statements 50
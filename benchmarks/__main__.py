@@ -0,0 +1,59 @@
+# benchmarks/__main__.py
+
+import argparse
+import sys
+
+from lexer import ENGINES
+
+from .corpus import DEFAULT_GRAMMAR, SHAPES, generate_program
+from .harness import compare, format_comparison, format_report, load, run, save
+
+arg_parser = argparse.ArgumentParser(prog='python -m benchmarks',
+                                     description="Pruebas de rendimiento del analizador léxico y sintáctico.")
+commands = arg_parser.add_subparsers(dest='command', required=True)
+
+run_parser = commands.add_parser('run', help="ejecuta las pruebas y muestra (o guarda) los resultados")
+run_parser.add_argument('--grammar', default=DEFAULT_GRAMMAR, help="archivo de gramática")
+run_parser.add_argument('--shapes', nargs='+', choices=SHAPES, default=list(SHAPES),
+                        help="formas de los programas generados (por defecto: todas)")
+run_parser.add_argument('--statements', nargs='+', type=int, default=[100, 1000], metavar='N',
+                        help="sentencias del nivel superior de cada programa (por defecto: 100 1000)")
+run_parser.add_argument('--engines', nargs='+', choices=ENGINES, default=list(ENGINES),
+                        help="motores léxicos a medir (por defecto: todos)")
+run_parser.add_argument('--seed', type=int, default=0, help="semilla del generador")
+run_parser.add_argument('--repeat', type=int, default=5, help="repeticiones por medida (se toma la mejor)")
+run_parser.add_argument('--grammar-copies', type=int, default=8, metavar='N',
+                        help="copias de la gramática para medir el cálculo de PRIMERO y SIGUIENTE (por defecto: 8)")
+run_parser.add_argument('--snippets', type=int, default=1000, metavar='N',
+                        help="fragmentos pequeños para medir el análisis por lotes (0: no medirlo; por defecto: 1000)")
+run_parser.add_argument('--lex-jobs', nargs='*', type=int, default=[2, 4], metavar='N',
+                        help="procesos del análisis léxico por regiones a medir (por defecto: 2 4)")
+run_parser.add_argument('--output', '-o', metavar='ARCHIVO', help="guarda los resultados en formato JSON")
+
+compare_parser = commands.add_parser('compare', help="compara dos resultados guardados con 'run --output'")
+compare_parser.add_argument('old', help="resultados de referencia")
+compare_parser.add_argument('new', help="resultados nuevos")
+compare_parser.add_argument('--threshold', type=float, default=0.05,
+                            help="cambio relativo de tiempo que se considera significativo (por defecto: 0.05)")
+
+generate_parser = commands.add_parser('generate', help="escribe un programa generado en la salida estándar")
+generate_parser.add_argument('--grammar', default=DEFAULT_GRAMMAR, help="archivo de gramática")
+generate_parser.add_argument('--shape', choices=SHAPES, help="forma del programa")
+generate_parser.add_argument('--statements', type=int, default=100, help="sentencias del nivel superior")
+generate_parser.add_argument('--seed', type=int, default=0, help="semilla del generador")
+
+args = arg_parser.parse_args()
+if args.command == 'run':
+    report = run(args.grammar, args.shapes, args.statements, args.engines, args.seed, args.repeat,
+                 args.grammar_copies, args.snippets, args.lex_jobs)
+    print(format_report(report))
+    if args.output:
+        save(report, args.output)
+elif args.command == 'compare':
+    rows = compare(load(args.old), load(args.new), args.threshold)
+    print(format_comparison(rows))
+    # Código de salida 1 si hay regresiones, para usarlo en integración continua
+    sys.exit(1 if any(row['verdict'] == 'regresión' for row in rows) else 0)
+else:
+    sys.stdout.write(generate_program(args.grammar, seed=args.seed, shape=args.shape,
+                                      statements=args.statements))
@@ -0,0 +1,231 @@
+# benchmarks/corpus.py
+
+import os
+import random
+import re
+
+from parser import Grammar
+from tokens import DELIMITERS, OPERATORS, RESERVED_WORDS
+
+# Gramática por defecto: la del repositorio, sin depender del directorio actual
+DEFAULT_GRAMMAR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'gramatica.txt')
+
+# Texto de cada terminal que el lexer puede producir a partir de su nombre
+TERMINAL_TEXT = {name: text for text, name in list(OPERATORS.items()) + list(DELIMITERS.items())
+                 if text[0] in OPERATORS or text in DELIMITERS}  # '!=', ':=', 'and'... no se pueden escanear
+TERMINAL_TEXT.update({word: word for word in RESERVED_WORDS})
+# Terminales que se reconocen por el lexema de un id
+ID_LEXEME_TERMINALS = ('range',)
+TERMINAL_TEXT.update({name: name for name in ID_LEXEME_TERMINALS})
+LEXEME_TERMINALS = ('id', 'tk_entero', 'tk_string')
+LAYOUT_TERMINALS = ('tk_newline', 'tk_indent', 'tk_dedent')
+
+# Formas predefinidas del corpus (ver generate_program)
+SHAPES = {
+    'flat': dict(depth=0, width=2),
+    'nested': dict(depth=6, nesting=0.6, block_statements=3),
+    'strings': dict(string_length=200, comment_lines=3, docstrings=0.3),
+    'wide': dict(width=40, list_length=20),
+}
+
+
+class ProgramGenerator:
+    """Genera programas válidos para la gramática derivando sus producciones al azar.
+
+    La forma del programa se controla con:
+      - statements: sentencias del nivel superior;
+      - depth: anidamiento máximo de bloques (BLOCK en def/for/while/if);
+      - nesting: probabilidad de que una sentencia sea compuesta (con bloque);
+      - block_statements: sentencias máximas por bloque;
+      - width: operadores máximos por expresión; list_length: elementos máximos por lista;
+      - string_length: longitud de las cadenas;
+      - comment_lines: líneas de comentario promedio antes de cada sentencia;
+      - docstrings: probabilidad de que un comentario sea multilínea con comillas triples.
+    Solo se usan producciones cuyos terminales puede producir el lexer (p. ej. no 'tk_morsa').
+    """
+
+    def __init__(self, grammar=DEFAULT_GRAMMAR, seed=0, statements=100, depth=3, nesting=0.3,
+                 block_statements=4, width=3, list_length=3, string_length=8, comment_lines=0.0,
+                 docstrings=0.0):
+        self.grammar = grammar if isinstance(grammar, Grammar) else Grammar(grammar)
+        self.random = random.Random(seed)
+        self.statements = statements
+        self.depth = depth
+        self.nesting = nesting
+        self.block_statements = block_statements
+        self.width = width
+        self.list_length = list_length
+        self.string_length = string_length
+        self.comment_lines = comment_lines
+        self.docstrings = docstrings
+        rules = self.grammar.rules
+        producible = set(TERMINAL_TEXT).union(LEXEME_TERMINALS, LAYOUT_TERMINALS)
+        self.productions = {
+            nt: [production for production in productions
+                 if all(symbol in rules or symbol in producible or symbol == 'ε' for symbol in production)]
+            for nt, productions in rules.items()}
+
+    def generate(self):
+        """Retorna el texto de un programa generado."""
+        self.pieces = []
+        self.level = 0  # Nivel de sangría actual
+        self.line_start = True
+        self.last = None  # Último terminal emitido
+        self.lists = []  # Sentencias restantes de cada lista de sentencias abierta
+        self.widths = []  # Operadores restantes de cada expresión abierta
+        self.iterables = 0  # Iterables anidados abiertos
+        self.in_element = False  # El próximo iterable es un ELEMENT
+
+        stack = [self.grammar.start_symbol]
+        while stack:
+            symbol = stack.pop()
+            if callable(symbol):
+                symbol()  # Marca de fin de una construcción
+            elif symbol in self.productions:
+                stack.extend(reversed(self.expand(symbol, stack)))
+            elif symbol != 'ε':
+                self.emit(symbol)
+        return ''.join(self.pieces)
+
+    def expand(self, nt, stack):
+        """Elige la producción de `nt` según la forma pedida y retorna sus símbolos (con marcas)."""
+        choices = self.productions[nt]
+        if nt == 'STATEMENT_LIST':
+            if self.last not in (None, 'tk_indent'):
+                return choices[0]  # Continuación de la lista abierta
+            limit = self.statements if not self.lists else self.random.randint(1, self.block_statements)
+            self.lists.append(limit)
+            return choices[0] + [self.lists.pop]
+        if nt == 'STATEMENT_LIST_PRIME':
+            if self.lists[-1] > 0:
+                return self.pick(choices, 'NEWLINE')
+            # Una lista solo puede terminar tras un fin de línea o de bloque, como la produce el lexer
+            if self.last in ('tk_newline', 'tk_dedent'):
+                return self.pick(choices, 'ε')
+            self.lists[-1] = -1
+            return self.pick(choices, 'NEWLINE')
+        if nt == 'STATEMENT':
+            self.lists[-1] -= 1
+            if self.lists[-1] < 0:
+                return ['ε']
+            compound = [c for c in choices if 'BLOCK' in self.rules_of(c)]
+            simple = [c for c in choices if c not in compound and c != ['ε']]
+            if compound and self.level < self.depth and self.random.random() < self.nesting:
+                return self.random.choice(compound)
+            return self.random.choice(simple)
+        if nt == 'EXPRESSION':
+            self.widths.append(self.random.randint(0, self.width))
+            return choices[0] + [self.widths.pop]
+        if nt == 'EXPRESSION_PRIME':
+            if self.widths[-1] > 0:
+                self.widths[-1] -= 1
+                return self.pick(choices, 'OP_STMT')
+            return self.pick(choices, 'ε')
+        if nt in ('ELEMENT_LIST', 'PAIR_LIST_PRIME'):
+            if self.random.random() < self.list_length / (self.list_length + 1):
+                return self.pick(choices, 'tk_coma')
+            return self.pick(choices, 'ε')
+        if nt == 'ELEMENT':
+            iterable = [c for c in choices if c == ['ITERABLE_EXPR']]
+            if iterable and self.iterables < 2 and self.random.random() < 0.1:
+                self.iterables += 1
+                self.in_element = True
+                return iterable[0] + [self.close_iterable]
+            return self.random.choice([c for c in choices if c not in iterable])
+        if nt == 'ITERABLE_EXPR' and self.in_element:
+            # Donde también cabe un id, la tabla prueba antes la columna 'id' que el lexema 'range'
+            self.in_element = False
+            return self.random.choice([c for c in choices
+                                       if not self.rules_of(c).intersection(ID_LEXEME_TERMINALS)])
+        return self.random.choice(choices)
+
+    def close_iterable(self):
+        """Marca el fin de un iterable anidado."""
+        self.iterables -= 1
+
+    def pick(self, choices, first):
+        """Retorna la producción que empieza con el símbolo `first`."""
+        for choice in choices:
+            if choice[0] == first:
+                return choice
+        return choices[0]
+
+    def rules_of(self, production):
+        """Retorna los no terminales alcanzables en un paso desde una producción."""
+        symbols = set(production)
+        for symbol in production:
+            for choice in self.productions.get(symbol, ()):
+                symbols.update(choice)
+        return symbols
+
+    def emit(self, terminal):
+        """Escribe el texto de un terminal, manejando saltos de línea y sangría."""
+        if terminal == 'tk_indent':
+            self.level += 1
+        elif terminal == 'tk_dedent':
+            self.level -= 1
+        elif terminal == 'tk_newline':
+            if self.line_start and self.last == 'tk_dedent':
+                # El lexer solo produce un tk_newline tras un tk_dedent en una línea con solo un comentario
+                self.pieces.append('    ' * self.level + '# fin de bloque')
+            self.pieces.append('\n')
+            self.line_start = True
+        else:
+            if self.line_start:
+                if self.comment_lines and terminal not in ('elif', 'else'):
+                    self.emit_comments()
+                self.pieces.append('    ' * self.level)
+                self.line_start = False
+            else:
+                self.pieces.append(' ')
+            self.pieces.append(self.lexeme(terminal))
+        self.last = terminal
+
+    def emit_comments(self):
+        """Escribe líneas de comentario en la sangría actual (cada una produce un tk_newline)."""
+        indent = '    ' * self.level
+        count = int(self.random.expovariate(1 / self.comment_lines) + 0.5)
+        for _ in range(count):
+            if self.random.random() < self.docstrings:
+                text = '\n'.join(self.words(self.string_length) for _ in range(3))
+                self.pieces.append(f'{indent}"""{text}"""\n')
+            else:
+                self.pieces.append(f'{indent}# {self.words(self.string_length)}\n')
+
+    def lexeme(self, terminal):
+        """Retorna el texto de un terminal, inventando el lexema de ids, enteros y cadenas."""
+        if terminal == 'id':
+            return f"v{self.random.randrange(1000)}"
+        if terminal == 'tk_entero':
+            return str(self.random.randrange(100000))
+        if terminal == 'tk_string':
+            return f'"{self.words(self.string_length)}"'
+        return TERMINAL_TEXT[terminal]
+
+    def words(self, length):
+        """Retorna un texto de `length` caracteres sin comillas ni saltos de línea."""
+        text = ' '.join('lorem' if self.random.random() < 0.5 else 'ipsum' for _ in range(length // 6 + 1))
+        return text[:length]
+
+
+def generate_program(grammar=DEFAULT_GRAMMAR, seed=0, shape=None, **options):
+    """Genera un programa con la forma `shape` (ver SHAPES) y las opciones indicadas."""
+    if shape is not None:
+        options = dict(SHAPES[shape], **options)
+    return ProgramGenerator(grammar, seed=seed, **options).generate()
+
+
+def scale_grammar(grammar_file=DEFAULT_GRAMMAR, copies=8):
+    """Retorna el texto de una gramática con `copies` copias de la indicada, renombrando sus no terminales.
+
+    Sirve para medir la construcción de las tablas con gramáticas de cientos de no terminales.
+    La primera copia conserva los nombres originales, de modo que el símbolo inicial es el mismo.
+    """
+    with open(grammar_file, 'r') as file:
+        text = file.read()
+    names = set(re.findall(r'^\s*([A-Z_]+)\s*->', text, re.MULTILINE))
+    parts = [text]
+    for copy in range(1, copies):
+        parts.append(re.sub(r'\b[A-Z_]+\b', lambda match: f'{match[0]}_{copy}' if match[0] in names else match[0],
+                            text))
+    return '\n'.join(parts)
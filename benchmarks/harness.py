@@ -0,0 +1,431 @@
+# benchmarks/harness.py
+
+import datetime
+import gc
+import importlib.machinery
+import importlib.util
+import json
+import os
+import platform
+import py_compile
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from codegen import generate_parser, generate_table_module
+from grammar_analysis import count_steps, load_rules, optimize_rules
+from lexer import ENGINES, create_lexer
+from parallel_lexer import MIN_REGION, ParallelLexer
+from parser import Grammar, Parser
+from tokens import HAS_LEXEME
+
+from .corpus import DEFAULT_GRAMMAR, SHAPES, generate_program, scale_grammar
+
+# Diferencia relativa de tiempo a partir de la cual compare() marca una regresión o mejora
+THRESHOLD = 0.05
+
+# Código con un error sintáctico por línea tras uno en el nivel superior, y la posición de cada error que
+# debe reportar la recuperación en modo pánico (ver Parser.recover) sin límite de errores
+RECOVERY_CODE = 'x = 1\n  y = 2\nz = (\nw = )\nq = ]\n'
+RECOVERY_ERRORS = [(2, 3), (3, 1), (4, 1), (4, 5), (5, 5)]
+
+
+def best_time(function, repeat):
+    """Retorna el menor tiempo (en segundos) de `repeat` ejecuciones de `function`, y su último resultado."""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def peak_memory(function):
+    """Retorna el pico de memoria (en bytes) reservada por `function` según tracemalloc."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def lex(code, engine):
+    """Tokeniza el código con el motor indicado, sin mensajes."""
+    return create_lexer(code, engine, verbose=False).tokenize()
+
+
+def lex_parallel(code, jobs):
+    """Tokeniza el código por regiones en `jobs` procesos (ver parallel_lexer.py), sin mensajes."""
+    return ParallelLexer(code, jobs=jobs, verbose=False).tokenize()
+
+
+def parse(grammar, tokens):
+    """Analiza los tokens y retorna el parser, abortando si el programa no es válido."""
+    parser = Parser.from_tokens(grammar, tokens, verbose=False)
+    parser.parse()
+    if parser.error_reported:
+        raise ValueError(f"el programa generado no es válido: {parser.error_message}")
+    return parser
+
+
+def parse_tree(grammar, tokens):
+    """Analiza los tokens construyendo el árbol de sintaxis y retorna el parser."""
+    parser = Parser.from_tokens(grammar, tokens, verbose=False, build_tree=True)
+    parser.parse()
+    return parser
+
+
+def parse_compiled(module, tokens):
+    """Analiza los tokens con el parser generado por codegen, abortando si el programa no es válido."""
+    parser = module.CompiledParser.from_tokens(tokens, verbose=False)
+    parser.parse()
+    if parser.error_reported:
+        raise ValueError(f"el programa generado no es válido: {parser.error_message}")
+    return parser
+
+
+def lex_parse(grammar, code, fused=False):
+    """Realiza el análisis léxico y sintáctico del código, en dos pasadas o en una (ver Parser.from_lexer),
+    y retorna el parser."""
+    lexer = create_lexer(code, verbose=False)
+    if fused:
+        parser = Parser.from_lexer(grammar, lexer, verbose=False)
+    else:
+        parser = Parser.from_tokens(grammar, lexer.tokenize(), verbose=False)
+    parser.parse()
+    return parser
+
+
+def lexemes(tokens):
+    """Retorna el lexema de cada token que lo tiene (los identificadores y enteros, desde la tabla de símbolos)."""
+    return [tokens.lexeme(index) for index in range(len(tokens)) if HAS_LEXEME[tokens.kinds[index]]]
+
+
+def import_module(path, name='compiled_parser'):
+    """Importa (de nuevo) el módulo de un archivo .py o .pyc, sin registrarlo en sys.modules."""
+    loader = None
+    if path.endswith('.pyc'):
+        loader = importlib.machinery.SourcelessFileLoader(name, path)
+    spec = importlib.util.spec_from_file_location(name, path, loader=loader)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def bench_grammar(grammar_file, repeat, compiled_path, tables_path):
+    """Mide la construcción de las tablas LL(1) sin caché, la carga desde la caché en disco, la importación
+    del módulo de tablas precalculadas y la del parser generado por codegen (ambos desde su bytecode)."""
+    seconds, _ = best_time(lambda: Grammar(grammar_file, cache_dir='', table_module=None), repeat)
+    peak = peak_memory(lambda: Grammar(grammar_file, cache_dir='', table_module=None))
+    results = [{'phase': 'grammar_build', 'seconds': seconds, 'peak_bytes': peak}]
+    with tempfile.TemporaryDirectory() as cache_dir:
+        Grammar(grammar_file, cache_dir=cache_dir, table_module=None)  # Deja las tablas en la caché
+        seconds, _ = best_time(lambda: Grammar(grammar_file, cache_dir=cache_dir, table_module=None), repeat)
+        peak = peak_memory(lambda: Grammar(grammar_file, cache_dir=cache_dir, table_module=None))
+        results.append({'phase': 'grammar_cached', 'seconds': seconds, 'peak_bytes': peak})
+    for phase, path, name in (('tables_import', tables_path, 'grammar_tables'),
+                              ('compiled_import', compiled_path, 'compiled_parser')):
+        seconds, _ = best_time(lambda: import_module(path, name), repeat)
+        peak = peak_memory(lambda: import_module(path, name))
+        results.append({'phase': phase, 'seconds': seconds, 'peak_bytes': peak})
+    return results
+
+
+def bench_startup(grammar_file, code, repeat):
+    """Mide el tiempo total de ejecutar main.py en un proceso nuevo (arranque del intérprete, importaciones,
+    carga de la gramática y primer análisis) y, como referencia, el del intérprete vacío.
+
+    main.py se ejecuta en un directorio temporal con el programa como codigo_fuente.py; la caché de
+    tablas se desactiva, así que la gramática sale del módulo de tablas precalculadas o se construye.
+    """
+    main_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'main.py')
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        shutil.copy(grammar_file, os.path.join(directory, 'gramatica.txt'))
+        with open(os.path.join(directory, 'codigo_fuente.py'), 'w') as file:
+            file.write(code)
+        # El bytecode se guarda fuera del repositorio, pero se guarda aunque el entorno lo desactive
+        env = dict(os.environ, ANALIZADOR_CACHE_DIR='', PYTHONPYCACHEPREFIX=os.path.join(directory, 'pycache'))
+        env.pop('PYTHONDONTWRITEBYTECODE', None)
+        for phase, command in (('python_startup', [sys.executable, '-c', 'pass']),
+                               ('main_startup', [sys.executable, main_path])):
+            run_command = lambda: subprocess.run(command, cwd=directory, env=env, check=True,
+                                                 stdout=subprocess.DEVNULL)
+            run_command()  # Deja el bytecode de los módulos en __pycache__, como en un uso normal
+            seconds, _ = best_time(run_command, repeat)
+            results.append({'phase': phase, 'seconds': seconds})
+    return results
+
+
+def compute_sets(grammar, naive=False):
+    """Recalcula los conjuntos PRIMERO y SIGUIENTE de una gramática ya leída."""
+    if naive:
+        grammar.compute_first_sets_naive()
+        grammar.compute_follow_sets_naive()
+    else:
+        grammar.compute_first_sets()
+        grammar.compute_follow_sets()
+    return grammar.first_sets, grammar.follow_sets
+
+
+def bench_sets(grammar_file, repeat, copies):
+    """Mide el cálculo de PRIMERO y SIGUIENTE sobre la gramática y sobre `copies` copias de ella,
+    comparando con la implementación de referencia (que debe dar los mismos conjuntos)."""
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for count in sorted({1, copies}):
+            path = os.path.join(directory, f'gramatica-x{count}.txt')
+            with open(path, 'w') as file:
+                file.write(scale_grammar(grammar_file, count))
+            grammar = Grammar(path, cache_dir='')
+            for phase, naive in (('sets', False), ('sets_naive', True)):
+                seconds, sets = best_time(lambda: compute_sets(grammar, naive), repeat)
+                if naive and sets != compute_sets(grammar):
+                    raise ValueError("los conjuntos PRIMERO/SIGUIENTE difieren de la implementación de referencia")
+                peak = peak_memory(lambda: compute_sets(grammar, naive))
+                results.append({'phase': phase, 'case': f'grammar-x{count}', 'seconds': seconds,
+                                'peak_bytes': peak, 'non_terminals': len(grammar.non_terminals)})
+    return results
+
+
+def bench_program(code, grammar, engines, repeat, compiled, lex_jobs=(), optimized=None):
+    """Mide el análisis léxico (por motor, y por regiones con cada número de procesos de `lex_jobs` si el
+    programa tiene al menos dos regiones) y el sintáctico de un programa: con Parser, con Parser
+    construyendo el árbol de sintaxis (incluida su memoria por nodo), con el parser generado `compiled` y,
+    si se indica, con la gramática `optimized` (ver grammar_analysis.optimize_rules).
+    Mide también la lectura de los lexemas de todos los tokens (ver TokenBuffer.lexeme) y ambos análisis
+    juntos, en dos pasadas y en una, sobre el programa y sobre el programa con un error sintáctico en el
+    primer token.
+
+    Cada fase se mide en ejecuciones separadas para tiempo y memoria, ya que tracemalloc
+    hace mucho más lento el código que observa.
+    """
+    results = []
+    tokens = None
+    for engine in engines:
+        # El motor 'mmap' recorre bytes: el código se codifica fuera de la medida, como si viniera de un mmap
+        source = code.encode('utf-8') if engine == 'mmap' else code
+        seconds, tokens = best_time(lambda: lex(source, engine), repeat)
+        peak = peak_memory(lambda: lex(source, engine))
+        results.append({'phase': f'lex_{engine}', 'seconds': seconds, 'peak_bytes': peak,
+                        'tokens': len(tokens), 'tokens_per_second': len(tokens) / seconds})
+
+    sequential = next((result['seconds'] for result in results if result['phase'] == 'lex_char'), None)
+    for jobs in lex_jobs if len(code) >= 2 * MIN_REGION else ():
+        # La memoria de los procesos trabajadores no es visible para tracemalloc: solo se mide el tiempo
+        seconds, parallel_tokens = best_time(lambda: lex_parallel(code, jobs), repeat)
+        result = {'phase': f'lex_par_j{jobs}', 'seconds': seconds, 'tokens': len(parallel_tokens),
+                  'tokens_per_second': len(parallel_tokens) / seconds}
+        if sequential is not None:
+            result['speedup'] = sequential / seconds
+        results.append(result)
+
+    seconds, texts = best_time(lambda: lexemes(tokens), repeat)
+    peak = peak_memory(lambda: lexemes(tokens))
+    results.append({'phase': 'lexemes', 'seconds': seconds, 'peak_bytes': peak, 'tokens': len(texts),
+                    'tokens_per_second': len(texts) / seconds, 'symbols': len(tokens.symbol_table)})
+
+    seconds, _ = best_time(lambda: parse(grammar, tokens), repeat)
+    peak = peak_memory(lambda: parse(grammar, tokens))
+    steps = count_steps(grammar, tokens)
+    results.append({'phase': 'parse', 'seconds': seconds, 'peak_bytes': peak, 'tokens': len(tokens),
+                    'tokens_per_second': len(tokens) / seconds, 'steps': steps,
+                    'steps_per_second': steps / seconds})
+
+    if optimized is not None:
+        seconds, _ = best_time(lambda: parse(optimized, tokens), repeat)
+        peak = peak_memory(lambda: parse(optimized, tokens))
+        optimized_steps = count_steps(optimized, tokens)
+        results.append({'phase': 'parse_optimized', 'seconds': seconds, 'peak_bytes': peak, 'tokens': len(tokens),
+                        'tokens_per_second': len(tokens) / seconds, 'steps': optimized_steps,
+                        'steps_per_second': optimized_steps / seconds, 'steps_saved': 1 - optimized_steps / steps})
+
+    seconds, parser = best_time(lambda: parse_tree(grammar, tokens), repeat)
+    peak = peak_memory(lambda: parse_tree(grammar, tokens))
+    nodes = len(parser.tree)
+    results.append({'phase': 'parse_tree', 'seconds': seconds, 'peak_bytes': peak, 'tokens': len(tokens),
+                    'tokens_per_second': len(tokens) / seconds, 'nodes': nodes,
+                    'arena_bytes_per_node': parser.tree.nbytes() / nodes, 'peak_bytes_per_node': peak / nodes})
+
+    seconds, _ = best_time(lambda: parse_compiled(compiled, tokens), repeat)
+    peak = peak_memory(lambda: parse_compiled(compiled, tokens))
+    results.append({'phase': 'parse_compiled', 'seconds': seconds, 'peak_bytes': peak, 'tokens': len(tokens),
+                    'tokens_per_second': len(tokens) / seconds})
+
+    early = ')\n' + code
+    for phase, source, fused in (('lex_parse', code, False), ('lex_parse_fused', code, True),
+                                 ('early_error', early, False), ('early_fused', early, True)):
+        seconds, _ = best_time(lambda: lex_parse(grammar, source, fused), repeat)
+        peak = peak_memory(lambda: lex_parse(grammar, source, fused))
+        results.append({'phase': phase, 'seconds': seconds, 'peak_bytes': peak})
+    return results
+
+
+def recover(grammar, code, build_tree=False, fused=False):
+    """Analiza el código sin límite de errores y retorna la posición de cada error reportado."""
+    lexer = create_lexer(code, verbose=False, max_errors=None)
+    if fused:
+        parser = Parser.from_lexer(grammar, lexer, verbose=False, max_errors=None, build_tree=build_tree)
+    else:
+        parser = Parser.from_tokens(grammar, lexer.tokenize(), verbose=False, max_errors=None, build_tree=build_tree)
+    parser.parse()
+    return [diagnostic[:2] for diagnostic in parser.all_diagnostics()]
+
+
+def bench_recovery(grammar, repeat):
+    """Mide la recuperación de errores sobre RECOVERY_CODE, abortando si no reporta RECOVERY_ERRORS."""
+    results = []
+    for phase, build_tree, fused in (('recovery', False, False), ('recovery_tree', True, False),
+                                     ('recovery_fused', False, True)):
+        seconds, errors = best_time(lambda: recover(grammar, RECOVERY_CODE, build_tree, fused), repeat)
+        if errors != RECOVERY_ERRORS:
+            raise ValueError(f"la recuperación de errores reportó {errors} en lugar de {RECOVERY_ERRORS}")
+        results.append({'phase': phase, 'seconds': seconds, 'errors': len(errors)})
+    return results
+
+
+def parse_each(grammar, token_streams):
+    """Analiza cada secuencia de tokens con un parser nuevo y retorna los diagnósticos de cada una."""
+    verdicts = []
+    for tokens in token_streams:
+        parser = Parser.from_tokens(grammar, tokens, verbose=False)
+        parser.parse()
+        verdicts.append(tuple(parser.diagnostics))
+    return verdicts
+
+
+def bench_snippets(grammar, seed, count, statements, repeat):
+    """Mide el análisis de `count` fragmentos pequeños (de `statements` sentencias cada uno): con un parser
+    nuevo por fragmento, con Parser.parse_many y con Parser.parse_sources (análisis léxico incluido)."""
+    sources = [generate_program(grammar, seed=seed + index, statements=statements) for index in range(count)]
+    token_streams = [lex(code, 'char') for code in sources]
+    tokens = sum(len(stream) for stream in token_streams)
+    engine = Parser.from_tokens(grammar, (), verbose=False)
+    results = []
+    for phase, function in (('snippets_each', lambda: parse_each(grammar, token_streams)),
+                            ('snippets_many', lambda: engine.parse_many(token_streams)),
+                            ('snippets_lexed', lambda: engine.parse_sources(sources))):
+        seconds, verdicts = best_time(function, repeat)
+        if any(verdicts):
+            raise ValueError(f"un fragmento generado no es válido: {next(filter(None, verdicts))[0]}")
+        peak = peak_memory(function)
+        results.append({'phase': phase, 'seconds': seconds, 'peak_bytes': peak, 'snippets': count,
+                        'snippets_per_second': count / seconds, 'tokens': tokens,
+                        'tokens_per_second': tokens / seconds})
+    return results
+
+
+def metadata(options):
+    """Describe la máquina y la configuración de una ejecución."""
+    return {'date': datetime.datetime.now().isoformat(timespec='seconds'),
+            'python': sys.version.split()[0],
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'machine': platform.machine(),
+            'cpus': os.cpu_count(),
+            'options': options}
+
+
+def run(grammar_file=DEFAULT_GRAMMAR, shapes=tuple(SHAPES), statements=(100, 1000), engines=ENGINES,
+        seed=0, repeat=5, grammar_copies=8, snippets=1000, lex_jobs=(2, 4)):
+    """Ejecuta la batería de pruebas y retorna los resultados como diccionario serializable en JSON.
+
+    Cada caso es un programa generado con una forma (ver corpus.SHAPES) y un número de sentencias;
+    sus resultados se identifican por 'case' y 'phase'. El cálculo de los conjuntos de la gramática
+    se mide también sobre `grammar_copies` copias de ella (ver corpus.scale_grammar), y el análisis
+    por lotes sobre `snippets` fragmentos de dos sentencias, y el análisis léxico por regiones con cada
+    número de procesos de `lex_jobs`.
+    """
+    options = {'grammar': os.path.basename(grammar_file), 'shapes': list(shapes),
+               'statements': list(statements), 'engines': list(engines), 'seed': seed, 'repeat': repeat,
+               'grammar_copies': grammar_copies, 'snippets': snippets, 'lex_jobs': list(lex_jobs)}
+    grammar = Grammar(grammar_file)
+    optimized = Grammar.from_rules(*optimize_rules(*load_rules(grammar_file))[:2])
+    with tempfile.TemporaryDirectory() as directory:
+        paths = []
+        for name, source in (('compiled_parser', generate_parser(grammar)),
+                             ('grammar_tables', generate_table_module(grammar, grammar_file))):
+            path = os.path.join(directory, name + '.py')
+            with open(path, 'w') as file:
+                file.write(source)
+            # Se mide la importación desde el bytecode, como cuando el módulo ya está en __pycache__
+            paths.append(py_compile.compile(path, cfile=path + 'c', doraise=True))
+        compiled_path, tables_path = paths
+        compiled = import_module(compiled_path)
+        results = [dict(result, case='grammar')
+                   for result in bench_grammar(grammar_file, repeat, compiled_path, tables_path)]
+    startup_code = generate_program(grammar, seed=seed, statements=min(statements))
+    results.extend(dict(result, case='startup') for result in bench_startup(grammar_file, startup_code, repeat))
+    results.extend(bench_sets(grammar_file, repeat, grammar_copies))
+    results.extend(dict(result, case='recovery') for result in bench_recovery(grammar, repeat))
+    if snippets:
+        results.extend(dict(result, case=f'snippets-{snippets}')
+                       for result in bench_snippets(grammar, seed, snippets, 2, repeat))
+    for shape in shapes:
+        for count in statements:
+            code = generate_program(grammar, seed=seed, shape=shape, statements=count)
+            case = f'{shape}-{count}'
+            for result in bench_program(code, grammar, engines, repeat, compiled, lex_jobs, optimized):
+                results.append(dict(result, case=case, bytes=len(code)))
+    return {'metadata': metadata(options), 'results': results}
+
+
+def save(report, path):
+    """Guarda los resultados en un archivo JSON."""
+    with open(path, 'w') as file:
+        json.dump(report, file, ensure_ascii=False, indent=2)
+
+
+def load(path):
+    """Lee los resultados guardados por save()."""
+    with open(path, 'r') as file:
+        return json.load(file)
+
+
+def compare(old, new, threshold=THRESHOLD):
+    """Compara dos ejecuciones y retorna una fila por (caso, fase) presente en ambas.
+
+    Cada fila tiene los tiempos, la razón nuevo/anterior y el veredicto: 'regresión' o 'mejora'
+    si el tiempo cambió más que `threshold`, o '' si no.
+    """
+    previous = {(result['case'], result['phase']): result for result in old['results']}
+    rows = []
+    for result in new['results']:
+        key = (result['case'], result['phase'])
+        if key not in previous:
+            continue
+        before, after = previous[key]['seconds'], result['seconds']
+        ratio = after / before
+        verdict = 'regresión' if ratio > 1 + threshold else 'mejora' if ratio < 1 - threshold else ''
+        rows.append({'case': key[0], 'phase': key[1], 'old_seconds': before, 'new_seconds': after,
+                     'ratio': ratio, 'verdict': verdict})
+    return rows
+
+
+def format_report(report):
+    """Formatea los resultados de una ejecución como tabla de texto."""
+    lines = [f"{'caso':<16}{'fase':<16}{'tiempo (ms)':>12}{'tokens/s':>12}{'pasos/s':>12}{'pico (KiB)':>12}"]
+    for result in report['results']:
+        tokens = result.get('tokens_per_second')
+        steps = result.get('steps_per_second')
+        peak = result.get('peak_bytes')  # Las medidas de arranque (otro proceso) no tienen memoria
+        lines.append(f"{result['case']:<16}{result['phase']:<16}{result['seconds'] * 1000:>12.2f}"
+                     f"{f'{tokens:,.0f}' if tokens else '-':>12}{f'{steps:,.0f}' if steps else '-':>12}"
+                     f"{f'{peak / 1024:,.0f}' if peak is not None else '-':>12}")
+    return '\n'.join(lines)
+
+
+def format_comparison(rows):
+    """Formatea el resultado de compare() como tabla de texto."""
+    lines = [f"{'caso':<16}{'fase':<16}{'antes (ms)':>12}{'después (ms)':>14}{'razón':>8}  veredicto"]
+    for row in rows:
+        lines.append(f"{row['case']:<16}{row['phase']:<16}{row['old_seconds'] * 1000:>12.2f}"
+                     f"{row['new_seconds'] * 1000:>14.2f}{row['ratio']:>8.2f}  {row['verdict']}")
+    return '\n'.join(lines)
@@ -0,0 +1,309 @@
+# codegen.py
+
+import argparse
+import os
+from itertools import chain
+
+from parser import TABLE_MODULE, Grammar
+
+# Encabezado del módulo generado; las llaves dobles son literales del código generado
+MODULE_HEADER = '''\
+# Módulo generado por codegen.py a partir de '{source}'; no editar a mano.
+# Parser descendente recursivo equivalente a Parser.parse() para esta gramática.
+
+from array import array
+from types import SimpleNamespace
+
+from parser import Parser
+from tokens import TOKEN_NAMES
+
+# Hash de la gramática de la que se generó este módulo (ver Grammar.compute_grammar_hash)
+GRAMMAR_HASH = {grammar_hash!r}
+
+# Columna de cada terminal: los mismos IDs que asigna Grammar.compile_tables
+TERMINAL_IDS = {terminal_ids}
+UNKNOWN_ID = {unknown_id}
+END = {end}
+
+# Lo que Parser.set_tokens y Parser.token_columns necesitan de la gramática
+TABLES = SimpleNamespace(
+    terminal_ids=TERMINAL_IDS,
+    unknown_id=UNKNOWN_ID,
+    kind_columns=array('i', (TERMINAL_IDS.get(name, UNKNOWN_ID) for name in TOKEN_NAMES)),
+    nonterminal_ids={{{start!r}: UNKNOWN_ID + 1}},
+    start_symbol={start!r},
+)
+
+
+class Halt(Exception):
+    """Detiene el análisis en el primer error sintáctico."""
+
+
+class CompiledParser(Parser):
+    """Parser generado con una función por no terminal, sin construir la gramática al importarse.
+
+    Acepta los mismos tokens que Parser y reporta el primer error con el mismo mensaje, pero no se
+    recupera de los errores (equivale a max_errors=1). Las construcciones anidadas usan la pila de
+    llamadas de Python, por lo que su profundidad está limitada por sys.getrecursionlimit().
+    """
+    grammar = TABLES
+
+    def __init__(self, tokens_file, verbose=True):
+        self.verbose = verbose
+        self.max_errors = 1
+        self.set_tokens(self.tokenize_from_file(tokens_file))
+
+    @classmethod
+    def from_tokens(cls, tokens, verbose=True):
+        """Crea un parser que consume directamente los tokens del lexer (ver Parser.from_tokens)."""
+        parser = cls.__new__(cls)
+        parser.verbose = verbose
+        parser.max_errors = 1
+        parser.set_tokens(tokens)
+        return parser
+
+    def parse(self):
+        """Realiza el análisis sintáctico llamando a la función del símbolo inicial."""
+        next_columns = self.columns.__next__
+        term, alt = next_columns()
+        position = self.position
+        rule = None
+
+        def fail(expected):
+            self.position = position
+            self.current_rule = rule
+            self.report_syntax_error(expected, current_rule=rule)
+            raise Halt
+'''
+
+MODULE_FOOTER = '''
+        try:
+            {start_call}
+            if term != END and alt != END:
+                fail(['$'])
+            term, alt = next_columns()
+            position += 1
+        except Halt:
+            pass
+
+        self.position = position
+        if not self.error_reported and self.verbose:
+            print("El análisis sintáctico ha finalizado exitosamente.")
+'''
+
+
+class ParserGenerator:
+    """Genera el código de un parser descendente recursivo a partir de las tablas LL(1) de una gramática.
+
+    Cada no terminal se convierte en una función que elige su producción comparando la columna del
+    token actual (o, si no tiene entrada, la de su lexema) con los conjuntos de predicción, igual que
+    Parser.parse(). Los no terminales con solo terminales se copian en las funciones que los usan
+    (manteniendo `rule` como en Parser para los mensajes de error). Cuando una producción termina en un no terminal la función lo retorna en lugar de
+    llamarlo, y quien la llamó lo ejecuta en un bucle: así las listas recursivas por la derecha
+    (STATEMENT_LIST, EXPRESSION_PRIME...) no consumen la pila de llamadas.
+    """
+
+    def __init__(self, grammar):
+        self.grammar = grammar
+        # Producciones de cada no terminal con sus columnas, y tokens esperados en el orden de Parser
+        self.choices = {nt: {} for nt in grammar.non_terminals}
+        self.expected = {nt: [] for nt in grammar.non_terminals}
+        for (nt, terminal), production in grammar.parse_table.items():
+            self.choices[nt].setdefault(tuple(production), []).append(grammar.terminal_ids[terminal])
+            self.expected[nt].append(terminal)
+        self.columns = {nt: {column for columns in productions.values() for column in columns}
+                        for nt, productions in self.choices.items()}
+        # No terminales cuyas producciones solo tienen terminales: se copian en quien los usa, ahorrando
+        # una llamada por token en cadenas como OP_STMT -> ARITHMETIC_OP -> tk_suma
+        self.inlined = {nt for nt, productions in self.choices.items()
+                        if not any(symbol in grammar.rules for production in productions for symbol in production)}
+        # No terminales con alguna producción terminada en otro sin copiar (retornan la función a continuar)
+        self.tail_calls = {nt for nt, productions in self.choices.items()
+                           if any(production[-1] in grammar.rules and production[-1] not in self.inlined
+                                  for production in productions)}
+
+    def generate(self, source='gramatica.txt'):
+        """Retorna el código fuente del módulo."""
+        grammar = self.grammar
+        terminal_ids = ''.join(f'\n    {symbol!r}: {idx},' for symbol, idx in grammar.terminal_ids.items())
+        lines = [MODULE_HEADER.format(source=os.path.basename(source), grammar_hash=grammar.grammar_hash,
+                                      terminal_ids=f'{{{terminal_ids}\n}}', unknown_id=grammar.unknown_id,
+                                      end=grammar.terminal_ids['$'], start=grammar.start_symbol)]
+        for nt in grammar.non_terminals:
+            lines.append('')
+            lines.extend(self.function(nt))
+        lines.append(MODULE_FOOTER.format(start_call='\n            '.join(self.call(grammar.start_symbol))))
+        return '\n'.join(lines)
+
+    def function(self, nt):
+        """Retorna las líneas de la función de un no terminal."""
+        return ([f'        def {nt}():', '            nonlocal term, alt, position, rule']
+                + ['            ' + line for line in self.body(nt)])
+
+    def body(self, nt, selected=False):
+        """Retorna las líneas (sin sangría) que eligen y reconocen la producción de un no terminal.
+
+        Con `selected` la variable `column` ya contiene la columna con la que se eligió el no terminal
+        y no hace falta volver a compararla con sus conjuntos de predicción.
+        """
+        grammar = self.grammar
+        lines = [f'rule = {nt!r}']
+        choices = list(self.choices[nt].items())
+        if not choices:
+            lines.append(f'fail({self.expected[nt]!r})')
+            return lines
+        columns = self.column_set(self.columns[nt])
+        if all(len(production) == 1 and production[0] in grammar.terminals for production, _ in choices):
+            # Solo terminales sueltos: basta con comprobar que el token está entre ellos
+            lines.append(f'# {nt} -> {" | ".join(production[0] for production, _ in choices)}')
+            if not selected:
+                lines += [f'if term not in {columns} and alt not in {columns}:',
+                          f'    fail({self.expected[nt]!r})']
+            return lines + ['term, alt = next_columns()', 'position += 1']
+
+        if len(choices) == 1:
+            production, _ = choices[0]
+            # Si empieza con un terminal, su comprobación reporta el mismo error que la del no terminal
+            if not selected and production[0] not in grammar.terminals:
+                lines += [f'if term not in {columns} and alt not in {columns}:',
+                          f'    fail({self.expected[nt]!r})']
+            lines.append(f'# {nt} -> {" ".join(production)}')
+            return lines + (self.production(production, selected=False) or ['pass'])
+
+        if not selected:
+            lines += [f'if term in {columns}:',
+                      '    column = term',
+                      f'elif alt in {columns}:',
+                      '    column = alt',
+                      'else:',
+                      f'    fail({self.expected[nt]!r})']
+        for idx, (production, production_columns) in enumerate(choices):
+            if idx == 0:
+                lines.append(f'if column in {self.column_set(production_columns)}:')
+            elif idx < len(choices) - 1:
+                lines.append(f'elif column in {self.column_set(production_columns)}:')
+            else:
+                lines.append('else:')
+            lines.append(f'    # {nt} -> {" ".join(production)}')
+            body = self.production(production, selected=set(production_columns))
+            lines.extend('    ' + line for line in body or ['pass'])
+        return lines
+
+    def production(self, production, selected):
+        """Retorna las líneas que reconocen los símbolos de una producción.
+
+        `selected` son las columnas con las que se eligió la producción (guardada en `column`), o False.
+        Un terminal al inicio de una producción elegida ya coincide con el token: su predicción es él mismo.
+        """
+        grammar = self.grammar
+        lines = []
+        symbols = [symbol for symbol in production if symbol != 'ε']
+        for idx, symbol in enumerate(symbols):
+            if symbol in self.inlined:
+                lines.extend(self.body(symbol, selected=idx == 0 and selected == self.columns[symbol]))
+            elif symbol in grammar.rules:
+                if idx == len(symbols) - 1:
+                    lines.append(f'return {symbol}')
+                else:
+                    lines.extend(self.call(symbol))
+            elif symbol in grammar.terminals:
+                column = grammar.terminal_ids[symbol]
+                if not (idx == 0 and selected):
+                    lines += [f'if term != {column} and alt != {column}:',
+                              f'    fail([{symbol!r}])']
+                lines += ['term, alt = next_columns()', 'position += 1']
+            else:
+                # Símbolo sin definir en la gramática: ningún token lo empareja
+                lines.append(f'fail([{symbol!r}])')
+        return lines
+
+    def call(self, nt):
+        """Retorna las líneas que ejecutan un no terminal (y los que retorne para continuar)."""
+        if nt not in self.tail_calls:
+            return [f'{nt}()']
+        return [f'function = {nt}',
+                'while function is not None:',
+                '    function = function()']
+
+    def column_set(self, columns):
+        """Literal de conjunto de columnas; Python lo compila como un frozenset constante."""
+        return '{' + ', '.join(str(column) for column in sorted(columns)) + '}'
+
+
+# Encabezado del módulo de tablas congeladas (ver generate_table_module)
+TABLE_MODULE_HEADER = '''\
+# Módulo generado por codegen.py --tables a partir de '{source}'; no editar a mano.
+# Tablas LL(1) precalculadas que Grammar importa en lugar de construirlas (ver Grammar.load_table_module).
+# Si la gramática cambia, el hash deja de coincidir y Grammar las vuelve a calcular.
+
+GRAMMAR_HASH = {grammar_hash!r}
+
+START_SYMBOL = {start!r}
+
+# Producciones de la gramática; las reglas, los conjuntos de predicción y la tabla comparten estas listas
+P = PRODUCTIONS = ['''
+
+
+def generate_table_module(grammar, source='gramatica.txt'):
+    """Retorna el código de un módulo con las tablas de la gramática (ver parser.CACHED_FIELDS) como literales.
+
+    Los conjuntos se escriben ordenados, y los diccionarios en el orden de la gramática, que es el
+    que determina el orden de los tokens esperados en los mensajes de error. Ese orden depende de la
+    semilla de hash de Python al construir las tablas: PYTHONHASHSEED=0 da un módulo reproducible.
+    """
+    index = {}
+    productions = []
+    for production in chain(chain.from_iterable(grammar.rules.values()), grammar.parse_table.values()):
+        if id(production) not in index:
+            index[id(production)] = len(productions)
+            productions.append(production)
+
+    def symbols(values):
+        return '{' + ', '.join(repr(value) for value in sorted(values)) + '}' if values else 'set()'
+
+    lines = [TABLE_MODULE_HEADER.format(source=os.path.basename(source), grammar_hash=grammar.grammar_hash,
+                                        start=grammar.start_symbol)]
+    lines += [f'    {production!r},' for production in productions]
+    lines += [']', '', f'TERMINALS = {symbols(grammar.terminals)}', '',
+              f'NON_TERMINALS = {grammar.non_terminals!r}', '', 'RULES = {']
+    lines += [f"    {nt!r}: [{', '.join(f'P[{index[id(production)]}]' for production in rules)}],"
+              for nt, rules in grammar.rules.items()]
+    for name, sets in (('FIRST_SETS', grammar.first_sets), ('FOLLOW_SETS', grammar.follow_sets)):
+        lines += ['}', '', f'{name} = {{']
+        lines += [f'    {symbol!r}: {symbols(values)},' for symbol, values in sets.items()]
+    lines += ['}', '', 'PREDICTION_SETS = {']
+    for nt, sets in grammar.prediction_sets.items():
+        entries = ', '.join(f'(P[{index[id(production)]}], {symbols(values)})' for production, values in sets)
+        lines.append(f'    {nt!r}: [{entries}],')
+    lines += ['}', '', 'PARSE_TABLE = {']
+    lines += [f'    {key!r}: P[{index[id(production)]}],' for key, production in grammar.parse_table.items()]
+    lines.append('}')
+    return '\n'.join(lines) + '\n'
+
+
+def generate_parser(grammar='gramatica.txt'):
+    """Retorna el código del módulo de parser generado para la gramática (instancia o ruta del archivo)."""
+    if isinstance(grammar, Grammar):
+        return ParserGenerator(grammar).generate()
+    return ParserGenerator(Grammar(grammar)).generate(grammar)
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Genera un parser descendente recursivo a partir de la gramática.")
+    arg_parser.add_argument('grammar', nargs='?', default='gramatica.txt',
+                            help="archivo de gramática (por defecto: gramatica.txt)")
+    arg_parser.add_argument('--output', '-o', default=None,
+                            help="módulo a generar (por defecto: compiled_parser.py, o grammar_tables.py con --tables)")
+    arg_parser.add_argument('--tables', action='store_true',
+                            help="genera el módulo de tablas precalculadas que importa Grammar en lugar del parser")
+    args = arg_parser.parse_args()
+    if args.tables:
+        output = args.output or TABLE_MODULE + '.py'
+        with open(output, 'w') as file:
+            file.write(generate_table_module(Grammar(args.grammar, cache_dir='', table_module=None), args.grammar))
+        print(f"Tablas generadas en '{output}'.")
+    else:
+        output = args.output or 'compiled_parser.py'
+        with open(output, 'w') as file:
+            file.write(generate_parser(args.grammar))
+        print(f"Parser generado en '{output}'.")
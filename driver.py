@@ -0,0 +1,295 @@
+# driver.py
+
+import glob
+import io
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from instrumentation import (Metrics, instrument_lexer, instrument_parser, no_phase, record_parse,
+                             record_tokens)
+from lexer import create_lexer
+from mapped_lexer import map_source
+from parser import Grammar, Parser
+from sinks import BufferSink
+from tokens import SymbolTable
+
+# Estados posibles del resultado de cada archivo
+OK = 'ok'
+LEXICAL_ERROR = 'lexical_error'
+SYNTAX_ERROR = 'syntax_error'
+IO_ERROR = 'io_error'
+
+# Símbolos más frecuentes que se incluyen en el reporte de analyze_paths
+TOP_SYMBOLS = 20
+
+# Gramática, motor léxico, límite de errores, recolección de métricas, caché de resultados y análisis
+# en una pasada de cada proceso trabajador (ver init_worker)
+_worker_grammar = None
+_worker_engine = 'char'
+_worker_max_errors = 1
+_worker_metrics = False
+_worker_cache = None
+_worker_fused = False
+
+
+def expand_paths(patterns):
+    """Expande archivos, directorios (recursivamente, archivos .py) y patrones glob en una lista de rutas."""
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            for root, dirs, files in os.walk(pattern):
+                dirs.sort()
+                paths.extend(os.path.join(root, name) for name in sorted(files) if name.endswith('.py'))
+        elif glob.has_magic(pattern):
+            paths.extend(sorted(glob.glob(pattern, recursive=True)))
+        else:
+            paths.append(pattern)
+    return paths
+
+
+def error_result(status, diagnostics):
+    """Construye el resultado de un análisis con errores a partir de sus diagnósticos (línea, columna, mensaje).
+
+    `line`, `column` y `message` corresponden al primer error; `diagnostics` los incluye todos.
+    """
+    line, column, message = diagnostics[0]
+    return {'status': status, 'line': line, 'column': column, 'message': message,
+            'diagnostics': [{'line': line, 'column': column, 'message': message}
+                            for line, column, message in diagnostics]}
+
+
+def analyze_source(code, grammar, engine='char', max_errors=1, metrics=None, sink=None, fused=False, symbols=None):
+    """Realiza el análisis léxico y sintáctico de un código y retorna el veredicto como diccionario.
+
+    Con `max_errors` mayor que 1 (o None, sin límite) el lexer y el parser se recuperan de los errores
+    y el resultado incluye todos los diagnósticos encontrados hasta ese límite.
+    Con `metrics` (ver instrumentation.Metrics) se cuentan las ramas del lexer, los tokens por tipo
+    y las producciones aplicadas, y se mide el tiempo de cada fase. `sink` (ver sinks.py) recibe los tokens.
+    Con `fused` el análisis se hace en una sola pasada (ver analyze_source_fused) y `sink` no se usa.
+    `symbols` (ver tokens.SymbolTable) permite internar los identificadores de varios códigos en la misma tabla.
+    """
+    if fused:
+        return analyze_source_fused(code, grammar, engine, max_errors, metrics, symbols)
+    phase = metrics.phase if metrics is not None else no_phase
+    lexer = create_lexer(code, engine, verbose=False, max_errors=max_errors, sink=sink, symbols=symbols)
+    if metrics is not None:
+        instrument_lexer(lexer, metrics)
+    try:
+        with phase('lex'):
+            tokens = lexer.tokenize()
+    except TabError as error:
+        return error_result(LEXICAL_ERROR, lexer.diagnostics + [(lexer.line, lexer.column, str(error))])
+    except UnicodeDecodeError as error:
+        return {'status': IO_ERROR, 'message': str(error)}  # Código en bytes que no es UTF-8 (motor 'mmap')
+    if metrics is not None:
+        record_tokens(metrics, tokens)
+    if lexer.halted:
+        return error_result(LEXICAL_ERROR, lexer.diagnostics)
+
+    # Tras recuperarse de errores léxicos, el parser usa el resto del límite de errores
+    remaining = None if max_errors is None else max_errors - len(lexer.diagnostics)
+    parser = Parser.from_tokens(grammar, tokens, verbose=False, max_errors=remaining)
+    if metrics is not None:
+        instrument_parser(parser)
+    with phase('parse'):
+        parser.parse()
+    if metrics is not None:
+        record_parse(metrics, parser)
+    if lexer.error_reported:
+        return error_result(LEXICAL_ERROR, lexer.diagnostics + parser.diagnostics)
+    if parser.error_reported:
+        return error_result(SYNTAX_ERROR, parser.diagnostics)
+    return {'status': OK, 'tokens': len(tokens)}
+
+
+def analyze_source_fused(code, grammar, engine='char', max_errors=1, metrics=None, symbols=None):
+    """Analiza un código en una sola pasada (ver parser.Parser.from_lexer) y retorna el veredicto.
+
+    El lexer avanza a medida que el parser pide tokens y se detiene con él: un error al principio de
+    un archivo grande cuesta en proporción a su posición, y los tokens no se acumulan. Los errores
+    se reportan en orden de aparición, así que con max_errors=1 gana el primero del código aunque sea
+    sintáctico; el resultado es un error léxico si alguno de los reportados lo es. Las métricas no
+    incluyen los tokens por tipo, y la fase 'parse' incluye el análisis léxico.
+    """
+    phase = metrics.phase if metrics is not None else no_phase
+    lexer = create_lexer(code, engine, verbose=False, max_errors=max_errors, symbols=symbols)
+    if metrics is not None:
+        instrument_lexer(lexer, metrics)
+    parser = Parser.from_lexer(grammar, lexer, verbose=False, max_errors=max_errors)
+    if metrics is not None:
+        instrument_parser(parser)
+    try:
+        with phase('parse'):
+            parser.parse()
+    except TabError as error:
+        return error_result(LEXICAL_ERROR, list(parser.all_diagnostics()) + [(lexer.line, lexer.column, str(error))])
+    except UnicodeDecodeError as error:
+        return {'status': IO_ERROR, 'message': str(error)}  # Código en bytes que no es UTF-8 (motor 'mmap')
+    if metrics is not None:
+        record_parse(metrics, parser)
+    diagnostics = parser.all_diagnostics()
+    if not diagnostics:
+        return {'status': OK, 'tokens': parser.token_base + len(lexer.tokens)}
+    lexical = any(diagnostic in lexer.diagnostics for diagnostic in diagnostics)
+    return error_result(LEXICAL_ERROR if lexical else SYNTAX_ERROR, diagnostics)
+
+
+def analyze_file(path, grammar, engine='char', max_errors=1, metrics=None, cache=None, fused=False, symbols=None):
+    """Analiza un archivo y retorna su resultado, incluyendo la ruta.
+
+    Con `cache` (ver result_cache.ResultCache) un archivo ya analizado con el mismo contenido, gramática
+    y opciones no se vuelve a analizar: basta con leerlo y calcular su hash. Con `fused` el análisis
+    se hace en una sola pasada (ver analyze_source_fused).
+    """
+    if cache is not None:
+        return analyze_file_cached(path, grammar, engine, max_errors, metrics, cache, fused, symbols)
+    phase = metrics.phase if metrics is not None else no_phase
+    try:
+        with phase('read'):
+            if engine == 'mmap':
+                code = map_source(path)
+            else:
+                with open(path, 'r') as file:
+                    code = file.read()
+    except (OSError, UnicodeDecodeError) as error:
+        result = {'status': IO_ERROR, 'message': str(error)}
+    else:
+        result = analyze_source(code, grammar, engine, max_errors, metrics, fused=fused, symbols=symbols)
+    if metrics is not None:
+        metrics.count('files_total', result['status'])
+    result['path'] = path
+    return result
+
+
+def analyze_file_cached(path, grammar, engine, max_errors, metrics, cache, fused=False, symbols=None):
+    """Analiza un archivo consultando antes la caché de resultados (ver analyze_file)."""
+    phase = metrics.phase if metrics is not None else no_phase
+    result = None
+    try:
+        with phase('read'):
+            with open(path, 'rb') as file:
+                data = file.read()
+            key = cache.key(data, grammar.grammar_hash, engine, max_errors, fused)
+            result = cache.get(key)
+            if result is None:
+                # Mismo texto que open(path, 'r'): codificación por defecto y saltos de línea universales
+                code = data if engine == 'mmap' else io.TextIOWrapper(io.BytesIO(data)).read()
+    except (OSError, UnicodeDecodeError) as error:
+        result = {'status': IO_ERROR, 'message': str(error)}
+    else:
+        if metrics is not None:
+            metrics.count('result_cache_total', 'hit' if result is not None else 'miss')
+        if result is None:
+            sink = BufferSink() if cache.store_tokens and not fused else None
+            result = analyze_source(code, grammar, engine, max_errors, metrics, sink, fused, symbols)
+            cache.put(key, result, sink.tokens if sink is not None else None)
+        else:
+            result['cached'] = True
+    if metrics is not None:
+        metrics.count('files_total', result['status'])
+    result['path'] = path
+    return result
+
+
+def init_worker(grammar, engine, max_errors=1, collect_metrics=False, cache=None, fused=False):
+    """Inicializa un proceso trabajador con la gramática ya construida por el proceso principal.
+
+    Con el método de inicio 'fork' la gramática se hereda en memoria sin serializarse.
+    """
+    global _worker_grammar, _worker_engine, _worker_max_errors, _worker_metrics, _worker_cache, _worker_fused
+    _worker_grammar = grammar
+    _worker_engine = engine
+    _worker_max_errors = max_errors
+    _worker_metrics = collect_metrics
+    _worker_cache = cache
+    _worker_fused = fused
+
+
+def analyze_in_worker(path):
+    """Analiza un archivo dentro de un proceso trabajador; sus métricas y su tabla de símbolos (nombres y
+    apariciones, para unirla a la del análisis con SymbolTable.merge) viajan en el resultado."""
+    symbols = SymbolTable()
+    metrics = Metrics() if _worker_metrics else None
+    result = analyze_file(path, _worker_grammar, _worker_engine, _worker_max_errors, metrics, _worker_cache,
+                          _worker_fused, symbols)
+    if metrics is not None:
+        result['metrics'] = metrics.to_dict()
+    result['symbols'] = (symbols.names, symbols.counts)
+    return result
+
+
+def analyze_source_in_worker(code, engine, max_errors):
+    """Analiza un código dentro de un proceso trabajador (ver server.py) e incluye el tiempo del análisis."""
+    start = time.perf_counter()
+    result = analyze_source(code, _worker_grammar, engine, max_errors)
+    result['seconds'] = time.perf_counter() - start
+    return result
+
+
+def pool_context():
+    """Contexto de multiprocessing para los pools: 'fork' si está disponible, para heredar la gramática."""
+    if 'fork' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('fork')
+    return multiprocessing.get_context()
+
+
+def summarize(results, symbols=None):
+    """Agrupa los resultados por archivo en un reporte con totales y, con `symbols`, los identificadores y
+    enteros distintos, sus apariciones y los TOP_SYMBOLS más frecuentes."""
+    report = {'files': len(results), OK: 0, LEXICAL_ERROR: 0, SYNTAX_ERROR: 0, IO_ERROR: 0, 'cached': 0}
+    for result in results:
+        report[result['status']] += 1
+        report['cached'] += result.get('cached', False)
+    if symbols is not None:
+        report['symbols'] = {'distinct': len(symbols), 'occurrences': sum(symbols.counts),
+                             'most_common': symbols.most_common(TOP_SYMBOLS)}
+    report['results'] = results
+    return report
+
+
+def analyze_paths(patterns, grammar_file='gramatica.txt', jobs=None, engine='char', max_errors=1, metrics=None,
+                  cache=None, fused=False, symbols=None):
+    """Analiza todos los archivos indicados, repartiéndolos en un pool de procesos.
+
+    `jobs` es el número de procesos (por defecto, uno por núcleo); con jobs=1 el análisis es secuencial.
+    Las tablas de la gramática se construyen una sola vez y se comparten con los trabajadores.
+    `max_errors` limita los errores reportados por archivo (None: sin límite).
+    Con `metrics` se acumulan las métricas de todos los archivos (los tiempos de las fases se suman
+    entre procesos). Con `cache` (ver result_cache.ResultCache) se reutilizan los resultados de los
+    archivos que no cambiaron; todos los procesos comparten su directorio. Con `fused` cada archivo
+    se analiza en una sola pasada (ver analyze_source_fused). Los identificadores y enteros de todos los
+    archivos analizados (no los de resultados de la caché) se internan en una misma tabla de símbolos,
+    `symbols` (ver tokens.SymbolTable) o una nueva: en el pool cada archivo usa su propia tabla, que se une
+    a esta al recibir su resultado. El reporte incluye sus totales (ver summarize).
+    """
+    paths = expand_paths(patterns)
+    grammar = Grammar(grammar_file, metrics=metrics)
+    jobs = jobs or os.cpu_count() or 1
+    symbols = symbols if symbols is not None else SymbolTable()
+    if jobs == 1 or len(paths) <= 1:
+        return summarize([analyze_file(path, grammar, engine, max_errors, metrics, cache, fused, symbols)
+                          for path in paths], symbols)
+
+    context = pool_context()
+    # Lotes grandes reducen la comunicación entre procesos cuando hay miles de archivos pequeños
+    chunksize = max(1, len(paths) // (jobs * 8))
+    with ProcessPoolExecutor(max_workers=jobs, mp_context=context,
+                             initializer=init_worker,
+                             initargs=(grammar, engine, max_errors, metrics is not None, cache,
+                                       fused)) as executor:
+        results = list(executor.map(analyze_in_worker, paths, chunksize=chunksize))
+    for result in results:
+        symbols.merge(*result.pop('symbols'))
+        if metrics is not None:
+            metrics.merge(result.pop('metrics'))
+    return summarize(results, symbols)
+
+
+def format_result(result):
+    """Formatea el resultado de un archivo con error con una línea 'ruta:línea:columna: mensaje' por error."""
+    if result['status'] == IO_ERROR:
+        return f"{result['path']}: {result['message']}"
+    return '\n'.join(f"{result['path']}:{error['line']}:{error['column']}: {error['message']}"
+                     for error in result['diagnostics'])
@@ -0,0 +1,292 @@
+# grammar_analysis.py
+
+import argparse
+import os
+
+from parser import Grammar, Parser
+
+
+class CountingStack(list):
+    """Pila del parser que cuenta los símbolos desapilados (un paso de Parser.parse() por símbolo)."""
+
+    def __init__(self, symbols):
+        super().__init__(symbols)
+        self.steps = 0
+
+    def pop(self):
+        self.steps += 1
+        return super().pop()
+
+
+def count_steps(grammar, tokens):
+    """Retorna los pasos (símbolos desapilados) que da Parser.parse() sobre los tokens."""
+    parser = Parser.from_tokens(grammar, tokens, verbose=False)
+    parser.stack = CountingStack(parser.stack)
+    parser.parse()
+    return parser.stack.steps
+
+
+def load_rules(grammar_file):
+    """Lee las reglas y el símbolo inicial de un archivo de gramática sin construir sus tablas."""
+    grammar = Grammar.__new__(Grammar)
+    grammar.rules = {}
+    grammar.terminals = set()
+    grammar.non_terminals = []
+    grammar.start_symbol = None
+    grammar.read_grammar(grammar_file)
+    return grammar.rules, grammar.start_symbol
+
+
+def reachable_symbols(rules, start_symbol):
+    """Retorna los no terminales que se pueden derivar desde el símbolo inicial."""
+    reachable = {start_symbol}
+    pending = [start_symbol]
+    while pending:
+        for production in rules.get(pending.pop(), ()):
+            for symbol in production:
+                if symbol in rules and symbol not in reachable:
+                    reachable.add(symbol)
+                    pending.append(symbol)
+    return reachable
+
+
+def undefined_symbols(rules):
+    """Retorna los símbolos en mayúsculas sin reglas: Grammar los trata como terminales que ningún token produce."""
+    return sorted({symbol for productions in rules.values() for production in productions for symbol in production
+                   if symbol.isupper() and symbol not in rules})
+
+
+def nullable_symbols(rules):
+    """Retorna los no terminales que derivan la cadena vacía."""
+    nullable = set()
+    changed = True
+    while changed:
+        changed = False
+        for nt, productions in rules.items():
+            if nt not in nullable and any(all(symbol == 'ε' or symbol in nullable for symbol in production)
+                                          for production in productions):
+                nullable.add(nt)
+                changed = True
+    return nullable
+
+
+def optimize_rules(rules, start_symbol):
+    """Retorna una gramática equivalente con menos no terminales que Parser.parse() deba desapilar.
+
+    Repite hasta que no haya cambios:
+      - un símbolo inicial con una sola producción de un solo no terminal se reemplaza por ese no terminal;
+      - un no terminal con una sola producción que no lo usa (NEWLINE -> tk_newline) se copia en cada uso;
+      - una alternativa formada solo por otro no terminal no anulable (LOOP_END -> BREAK_STMT | ...) se
+        reemplaza por las producciones de este.
+    Al final se eliminan los no terminales inalcanzables. Cada paso conserva el lenguaje y los conjuntos de
+    predicción de las producciones, así que una gramática LL(1) sigue siéndolo.
+    Retorna (reglas, símbolo inicial, cambios), con los cambios como (tipo, descripción).
+    """
+    rules = {nt: [list(production) for production in productions] for nt, productions in rules.items()}
+    changes = []
+    changed = True
+    while changed:
+        changed = False
+        start = rules[start_symbol]
+        if len(start) == 1 and len(start[0]) == 1 and start[0][0] in rules and start[0][0] != start_symbol:
+            changes.append(('start', f"{start_symbol} -> {start[0][0]}"))
+            start_symbol = start[0][0]
+            changed = True
+
+        for nt, productions in rules.items():
+            if nt == start_symbol or len(productions) != 1 or nt in productions[0]:
+                continue
+            body = [symbol for symbol in productions[0] if symbol != 'ε']
+            uses = 0
+            for other, other_productions in rules.items():
+                for index, production in enumerate(other_productions):
+                    if other != nt and nt in production:
+                        uses += production.count(nt)
+                        expanded = [part for symbol in production for part in (body if symbol == nt else (symbol,))
+                                    if part != 'ε']
+                        other_productions[index] = expanded or ['ε']
+            if uses:
+                changes.append(('inline', f"{nt} -> {' '.join(productions[0])} (usos: {uses})"))
+                changed = True
+
+        nullable = nullable_symbols(rules)
+        for nt, productions in rules.items():
+            expanded = []
+            for production in productions:
+                target = production[0]
+                if len(production) == 1 and target in rules and target != nt and target not in nullable:
+                    changes.append(('chain', f"{nt} -> {target}"))
+                    expanded.extend(list(alternative) for alternative in rules[target]
+                                    if alternative not in expanded and alternative not in productions)
+                    changed = True
+                elif production not in expanded:
+                    expanded.append(production)
+            productions[:] = expanded
+
+    reachable = reachable_symbols(rules, start_symbol)
+    changes.extend(('unreachable', nt) for nt in rules if nt not in reachable)
+    # El símbolo inicial va primero, como en gramatica.txt
+    optimized = {start_symbol: rules[start_symbol]}
+    optimized.update((nt, productions) for nt, productions in rules.items() if nt in reachable)
+    return optimized, start_symbol, changes
+
+
+def table_stats(grammar):
+    """Retorna el tamaño de la tabla LL(1) compilada de una gramática y cuántas celdas tienen producción."""
+    cells = len(grammar.table)
+    entries = sum(1 for production in grammar.table if production >= 0)
+    return {'non_terminals': len(grammar.non_terminals), 'columns': grammar.n_columns,
+            'productions': len(grammar.productions), 'cells': cells, 'entries': entries,
+            'density': entries / cells if cells else 0.0, 'table_bytes': cells * grammar.table.itemsize}
+
+
+def format_conflicts(grammar):
+    """Retorna una línea por cada conflicto LL(1) de una gramática (solo las construidas con strict=False
+    los tienen)."""
+    return [f"M[{nt}, {terminal}]: {' | '.join(' '.join(production) for production in productions)}"
+            for (nt, terminal), productions in grammar.conflicts.items()]
+
+
+def compare_steps(grammar, optimized, token_streams):
+    """Retorna los pasos de Parser.parse() sobre cada secuencia de tokens con la gramática original y con la
+    optimizada; falla si alguna secuencia se acepta con una y no con la otra o el error está en otro token."""
+    before = after = 0
+    for tokens in token_streams:
+        verdicts = []
+        for target in (grammar, optimized):
+            parser = Parser.from_tokens(target, tokens, verbose=False)
+            parser.stack = CountingStack(parser.stack)
+            parser.parse()
+            verdicts.append((parser.stack.steps, [diagnostic[:2] for diagnostic in parser.diagnostics]))
+        (steps, errors), (optimized_steps, optimized_errors) = verdicts
+        if errors != optimized_errors:
+            raise ValueError(f"la gramática optimizada no es equivalente: errores {errors} y {optimized_errors}")
+        before += steps
+        after += optimized_steps
+    return before, after
+
+
+def benchmark_corpus(grammar, statements=100, seed=0):
+    """Retorna los tokens de un programa generado con cada forma del corpus de benchmarks."""
+    from benchmarks.corpus import SHAPES, generate_program  # Solo para el reporte por defecto
+    from lexer import create_lexer
+    return {shape: create_lexer(generate_program(grammar, seed=seed, shape=shape, statements=statements),
+                                'char', verbose=False).tokenize()
+            for shape in SHAPES}
+
+
+def analyze_grammar(grammar_file, corpus=None):
+    """Analiza una gramática y su versión optimizada (ver optimize_rules) y retorna un reporte.
+
+    `corpus` es un diccionario nombre -> tokens sobre el que se comparan los pasos de Parser.parse(), o una
+    función que lo construye a partir de la gramática (p. ej. benchmark_corpus); si la gramática original
+    tiene conflictos no se construye la optimizada ni el corpus. Si el corpus no se puede generar, la
+    comparación se omite y el motivo queda en 'steps_skipped'.
+    """
+    rules, start_symbol = load_rules(grammar_file)
+    grammar = Grammar.from_rules(rules, start_symbol, strict=False)
+    report = {'grammar': os.path.basename(grammar_file), 'start_symbol': start_symbol,
+              'table': table_stats(grammar), 'conflicts': format_conflicts(grammar),
+              'unreachable': [nt for nt in rules if nt not in reachable_symbols(rules, start_symbol)],
+              'undefined': undefined_symbols(rules)}
+    if grammar.conflicts:
+        return report
+
+    optimized_rules, optimized_start, changes = optimize_rules(rules, start_symbol)
+    optimized = Grammar.from_rules(optimized_rules, optimized_start, strict=False)
+    report['optimized'] = {'start_symbol': optimized_start, 'table': table_stats(optimized),
+                           'conflicts': format_conflicts(optimized), 'changes': changes,
+                           'text': optimized.format_rules()}
+    if callable(corpus) and not optimized.conflicts:
+        try:
+            corpus = corpus(grammar)
+        except (IndexError, KeyError, ValueError, RecursionError) as error:
+            # El generador de benchmarks/corpus.py supone los no terminales de gramatica.txt
+            report['steps_skipped'] = f"no se pudo generar el corpus ({type(error).__name__}: {error})"
+            corpus = None
+    if corpus and not optimized.conflicts:
+        report['steps'] = {}
+        for name, tokens in corpus.items():
+            before, after = compare_steps(grammar, optimized, [tokens])
+            report['steps'][name] = {'tokens': len(tokens), 'before': before, 'after': after}
+    return report
+
+
+def format_report(report):
+    """Retorna el reporte de analyze_grammar como texto."""
+    def table_line(table):
+        return (f"{table['non_terminals']} no terminales, {table['columns']} columnas, "
+                f"{table['productions']} producciones; tabla de {table['cells']} celdas "
+                f"({table['table_bytes']} bytes), {table['entries']} ocupadas ({table['density']:.1%})")
+
+    lines = [f"Gramática '{report['grammar']}' (símbolo inicial {report['start_symbol']}):",
+             '  ' + table_line(report['table'])]
+    if report['conflicts']:
+        lines.append(f"  Conflictos LL(1): {len(report['conflicts'])}")
+        lines.extend(f"    {conflict}" for conflict in report['conflicts'])
+    else:
+        lines.append("  Sin conflictos LL(1).")
+    if report['unreachable']:
+        lines.append(f"  No terminales inalcanzables: {', '.join(report['unreachable'])}")
+    if report['undefined']:
+        lines.append(f"  Símbolos sin reglas (se tratan como terminales): {', '.join(report['undefined'])}")
+
+    optimized = report.get('optimized')
+    if optimized is None:
+        return '\n'.join(lines)
+    lines += ['', f"Gramática optimizada (símbolo inicial {optimized['start_symbol']}):",
+              '  ' + table_line(optimized['table'])]
+    titles = {'start': "Símbolo inicial reemplazado", 'inline': "No terminales copiados en sus usos",
+              'chain': "Alternativas encadenadas reemplazadas", 'unreachable': "No terminales eliminados"}
+    for kind, title in titles.items():
+        descriptions = [description for change, description in optimized['changes'] if change == kind]
+        if descriptions:
+            lines.append(f"  {title}: {len(descriptions)}")
+            lines.extend(f"    {description}" for description in descriptions)
+    if optimized['conflicts']:
+        lines.append(f"  Conflictos LL(1): {len(optimized['conflicts'])}")
+        lines.extend(f"    {conflict}" for conflict in optimized['conflicts'])
+
+    if report.get('steps_skipped'):
+        lines += ['', f"Pasos de Parser.parse(): comparación omitida, {report['steps_skipped']}."]
+    steps = report.get('steps')
+    if steps:
+        lines += ['', "Pasos de Parser.parse() (símbolos desapilados):"]
+        for name, counts in steps.items():
+            lines.append(f"  {name}: {counts['tokens']} tokens, {counts['before']} -> {counts['after']} pasos "
+                         f"({1 - counts['after'] / counts['before']:.1%} menos)")
+        before = sum(counts['before'] for counts in steps.values())
+        after = sum(counts['after'] for counts in steps.values())
+        lines.append(f"  total: {before} -> {after} pasos ({1 - after / before:.1%} menos)")
+    return '\n'.join(lines)
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(
+        description="Reporta el tamaño de la tabla LL(1), los conflictos y los símbolos inalcanzables de la "
+                    "gramática, y los pasos del análisis que ahorra su versión optimizada.")
+    arg_parser.add_argument('grammar', nargs='?', default='gramatica.txt',
+                            help="archivo de gramática (por defecto: gramatica.txt)")
+    arg_parser.add_argument('--output', '-o', metavar='ARCHIVO',
+                            help="guarda la gramática optimizada (se puede usar con --grammar o codegen.py)")
+    arg_parser.add_argument('--corpus', nargs='*', metavar='ARCHIVO',
+                            help="programas sobre los que comparar los pasos del análisis "
+                                 "(por defecto: un programa generado con cada forma de benchmarks/corpus.py)")
+    arg_parser.add_argument('--statements', type=int, default=100,
+                            help="sentencias de cada programa generado (por defecto: 100)")
+    args = arg_parser.parse_args()
+    if args.corpus:
+        from lexer import create_lexer
+        corpus = {}
+        for path in args.corpus:
+            with open(path, 'r') as file:
+                corpus[os.path.basename(path)] = create_lexer(file.read(), 'char', verbose=False).tokenize()
+    else:
+        # Se genera solo si la gramática no tiene conflictos (ver analyze_grammar)
+        corpus = lambda grammar: benchmark_corpus(grammar, args.statements)
+    report = analyze_grammar(args.grammar, corpus)
+    print(format_report(report))
+    if args.output and 'optimized' in report:
+        with open(args.output, 'w') as file:
+            file.write(report['optimized']['text'])
+        print(f"\nGramática optimizada guardada en '{args.output}'.")
@@ -0,0 +1,523 @@
+# Módulo generado por codegen.py --tables a partir de 'gramatica.txt'; no editar a mano.
+# Tablas LL(1) precalculadas que Grammar importa en lugar de construirlas (ver Grammar.load_table_module).
+# Si la gramática cambia, el hash deja de coincidir y Grammar las vuelve a calcular.
+
+GRAMMAR_HASH = '5a5b0e9520e26f270356ccf8ea9208fd755beb7af2b85ceb6679c015b90c26e8'
+
+START_SYMBOL = 'PROGRAM'
+
+# Producciones de la gramática; las reglas, los conjuntos de predicción y la tabla comparten estas listas
+P = PRODUCTIONS = [
+    ['STATEMENT_LIST'],
+    ['STATEMENT', 'STATEMENT_LIST_PRIME'],
+    ['NEWLINE', 'STATEMENT_LIST'],
+    ['ε'],
+    ['tk_newline'],
+    ['ASSIGNMENT_STMT'],
+    ['PRINT_STMT'],
+    ['FUNCTION_DEF'],
+    ['PASS_STMT'],
+    ['FOR_STMT'],
+    ['WHILE_STMT'],
+    ['IF_STMT'],
+    ['RETURN_STMT'],
+    ['LOOP_END'],
+    ['ε'],
+    ['id', 'ASSIGNMENT_OP', 'EXPRESSION'],
+    ['print', 'tk_par_izq', 'EXPRESSION', 'tk_par_der'],
+    ['pass'],
+    ['return', 'EXPRESSION'],
+    ['BREAK_STMT'],
+    ['CONTINUE_STMT'],
+    ['break', 'NEWLINE'],
+    ['continue', 'NEWLINE'],
+    ['def', 'id', 'tk_par_izq', 'ELEMENTS', 'tk_par_der', 'tk_dos_puntos', 'NEWLINE', 'BLOCK'],
+    ['ELEMENT', 'ELEMENT_LIST'],
+    ['ε'],
+    ['id'],
+    ['tk_string'],
+    ['tk_entero'],
+    ['True'],
+    ['False'],
+    ['None'],
+    ['ITERABLE_EXPR'],
+    ['tk_coma', 'ELEMENT', 'ELEMENT_LIST'],
+    ['ε'],
+    ['for', 'id', 'in', 'ITERABLE_EXPR', 'tk_dos_puntos', 'NEWLINE', 'BLOCK'],
+    ['while', 'EXPRESSION', 'tk_dos_puntos', 'NEWLINE', 'BLOCK'],
+    ['if', 'EXPRESSION', 'tk_dos_puntos', 'NEWLINE', 'BLOCK', 'ELIF_STMT', 'ELSE_STMT'],
+    ['elif', 'EXPRESSION', 'tk_dos_puntos', 'NEWLINE', 'BLOCK'],
+    ['ε'],
+    ['else', 'tk_dos_puntos', 'NEWLINE', 'BLOCK'],
+    ['ε'],
+    ['tk_indent', 'STATEMENT_LIST', 'tk_dedent'],
+    ['LIST_EXPR'],
+    ['TUPLE_EXPR'],
+    ['RANGE_EXPR'],
+    ['DICT_EXPR'],
+    ['tk_corchete_izq', 'ELEMENTS', 'tk_corchete_der'],
+    ['tk_par_izq', 'ELEMENTS', 'tk_par_der'],
+    ['range', 'tk_par_izq', 'EXPRESSION', 'tk_par_der'],
+    ['tk_llave_izq', 'PAIR_LIST', 'tk_llave_der'],
+    ['PAIR', 'PAIR_LIST_PRIME'],
+    ['ε'],
+    ['tk_coma', 'PAIR', 'PAIR_LIST_PRIME'],
+    ['ε'],
+    ['ELEMENT', 'tk_dos_puntos', 'ELEMENT'],
+    ['ELEMENT', 'EXPRESSION_PRIME'],
+    ['OP_STMT', 'ELEMENT', 'EXPRESSION_PRIME'],
+    ['ε'],
+    ['ARITHMETIC_OP'],
+    ['LOG_OP'],
+    ['ASSIGNMENT_OP'],
+    ['BIT_OP'],
+    ['BITWISE_ASSIGNMENT_OP'],
+    ['tk_suma'],
+    ['tk_resta'],
+    ['tk_multiplicacion'],
+    ['tk_division'],
+    ['tk_modulo'],
+    ['tk_exponente'],
+    ['tk_floor_div'],
+    ['tk_and'],
+    ['tk_or'],
+    ['tk_not'],
+    ['tk_igual'],
+    ['tk_distinto'],
+    ['tk_menor'],
+    ['tk_mayor'],
+    ['tk_menor_igual'],
+    ['tk_mayor_igual'],
+    ['tk_and_bit'],
+    ['tk_or_bit'],
+    ['tk_xor_bit'],
+    ['tk_complemento'],
+    ['tk_shift_izq'],
+    ['tk_shift_der'],
+    ['tk_asig'],
+    ['tk_suma_asig'],
+    ['tk_resta_asig'],
+    ['tk_mult_asig'],
+    ['tk_div_asig'],
+    ['tk_mod_asig'],
+    ['tk_exp_asig'],
+    ['tk_floor_div_asig'],
+    ['tk_morsa'],
+    ['tk_and_asig'],
+    ['tk_or_asig'],
+    ['tk_xor_asig'],
+    ['tk_izq_asig'],
+    ['tk_der_asig'],
+    ['tk_flecha_funcion'],
+    ['tk_arr'],
+]
+
+TERMINALS = {'$', 'False', 'None', 'True', 'break', 'continue', 'def', 'elif', 'else', 'for', 'id', 'if', 'in', 'pass', 'print', 'range', 'return', 'tk_and', 'tk_and_asig', 'tk_and_bit', 'tk_arr', 'tk_asig', 'tk_coma', 'tk_complemento', 'tk_corchete_der', 'tk_corchete_izq', 'tk_dedent', 'tk_der_asig', 'tk_distinto', 'tk_div_asig', 'tk_division', 'tk_dos_puntos', 'tk_entero', 'tk_exp_asig', 'tk_exponente', 'tk_flecha_funcion', 'tk_floor_div', 'tk_floor_div_asig', 'tk_igual', 'tk_indent', 'tk_izq_asig', 'tk_llave_der', 'tk_llave_izq', 'tk_mayor', 'tk_mayor_igual', 'tk_menor', 'tk_menor_igual', 'tk_mod_asig', 'tk_modulo', 'tk_morsa', 'tk_mult_asig', 'tk_multiplicacion', 'tk_newline', 'tk_not', 'tk_or', 'tk_or_asig', 'tk_or_bit', 'tk_par_der', 'tk_par_izq', 'tk_resta', 'tk_resta_asig', 'tk_shift_der', 'tk_shift_izq', 'tk_string', 'tk_suma', 'tk_suma_asig', 'tk_xor_asig', 'tk_xor_bit', 'while'}
+
+NON_TERMINALS = ['PROGRAM', 'STATEMENT_LIST', 'STATEMENT_LIST_PRIME', 'NEWLINE', 'STATEMENT', 'ASSIGNMENT_STMT', 'PRINT_STMT', 'PASS_STMT', 'RETURN_STMT', 'LOOP_END', 'BREAK_STMT', 'CONTINUE_STMT', 'FUNCTION_DEF', 'ELEMENTS', 'ELEMENT', 'ELEMENT_LIST', 'FOR_STMT', 'WHILE_STMT', 'IF_STMT', 'ELIF_STMT', 'ELSE_STMT', 'BLOCK', 'ITERABLE_EXPR', 'LIST_EXPR', 'TUPLE_EXPR', 'RANGE_EXPR', 'DICT_EXPR', 'PAIR_LIST', 'PAIR_LIST_PRIME', 'PAIR', 'EXPRESSION', 'EXPRESSION_PRIME', 'OP_STMT', 'ARITHMETIC_OP', 'LOG_OP', 'BITWISE_OP', 'ASSIGNMENT_OP', 'BITWISE_ASSIGNMENT_OP', 'SPECIAL_OP']
+
+RULES = {
+    'PROGRAM': [P[0]],
+    'STATEMENT_LIST': [P[1]],
+    'STATEMENT_LIST_PRIME': [P[2], P[3]],
+    'NEWLINE': [P[4]],
+    'STATEMENT': [P[5], P[6], P[7], P[8], P[9], P[10], P[11], P[12], P[13], P[14]],
+    'ASSIGNMENT_STMT': [P[15]],
+    'PRINT_STMT': [P[16]],
+    'PASS_STMT': [P[17]],
+    'RETURN_STMT': [P[18]],
+    'LOOP_END': [P[19], P[20]],
+    'BREAK_STMT': [P[21]],
+    'CONTINUE_STMT': [P[22]],
+    'FUNCTION_DEF': [P[23]],
+    'ELEMENTS': [P[24], P[25]],
+    'ELEMENT': [P[26], P[27], P[28], P[29], P[30], P[31], P[32]],
+    'ELEMENT_LIST': [P[33], P[34]],
+    'FOR_STMT': [P[35]],
+    'WHILE_STMT': [P[36]],
+    'IF_STMT': [P[37]],
+    'ELIF_STMT': [P[38], P[39]],
+    'ELSE_STMT': [P[40], P[41]],
+    'BLOCK': [P[42]],
+    'ITERABLE_EXPR': [P[43], P[44], P[45], P[46]],
+    'LIST_EXPR': [P[47]],
+    'TUPLE_EXPR': [P[48]],
+    'RANGE_EXPR': [P[49]],
+    'DICT_EXPR': [P[50]],
+    'PAIR_LIST': [P[51], P[52]],
+    'PAIR_LIST_PRIME': [P[53], P[54]],
+    'PAIR': [P[55]],
+    'EXPRESSION': [P[56]],
+    'EXPRESSION_PRIME': [P[57], P[58]],
+    'OP_STMT': [P[59], P[60], P[61], P[62], P[63]],
+    'ARITHMETIC_OP': [P[64], P[65], P[66], P[67], P[68], P[69], P[70]],
+    'LOG_OP': [P[71], P[72], P[73], P[74], P[75], P[76], P[77], P[78], P[79]],
+    'BITWISE_OP': [P[80], P[81], P[82], P[83], P[84], P[85]],
+    'ASSIGNMENT_OP': [P[86], P[87], P[88], P[89], P[90], P[91], P[92], P[93], P[94]],
+    'BITWISE_ASSIGNMENT_OP': [P[95], P[96], P[97], P[98], P[99]],
+    'SPECIAL_OP': [P[100], P[101]],
+}
+
+FIRST_SETS = {
+    'PROGRAM': {'break', 'continue', 'def', 'for', 'id', 'if', 'pass', 'print', 'return', 'tk_newline', 'while', 'ε'},
+    'STATEMENT_LIST': {'break', 'continue', 'def', 'for', 'id', 'if', 'pass', 'print', 'return', 'tk_newline', 'while', 'ε'},
+    'STATEMENT_LIST_PRIME': {'tk_newline', 'ε'},
+    'NEWLINE': {'tk_newline'},
+    'STATEMENT': {'break', 'continue', 'def', 'for', 'id', 'if', 'pass', 'print', 'return', 'while', 'ε'},
+    'ASSIGNMENT_STMT': {'id'},
+    'PRINT_STMT': {'print'},
+    'PASS_STMT': {'pass'},
+    'RETURN_STMT': {'return'},
+    'LOOP_END': {'break', 'continue'},
+    'BREAK_STMT': {'break'},
+    'CONTINUE_STMT': {'continue'},
+    'FUNCTION_DEF': {'def'},
+    'ELEMENTS': {'False', 'None', 'True', 'id', 'range', 'tk_corchete_izq', 'tk_entero', 'tk_llave_izq', 'tk_par_izq', 'tk_string', 'ε'},
+    'ELEMENT': {'False', 'None', 'True', 'id', 'range', 'tk_corchete_izq', 'tk_entero', 'tk_llave_izq', 'tk_par_izq', 'tk_string'},
+    'ELEMENT_LIST': {'tk_coma', 'ε'},
+    'FOR_STMT': {'for'},
+    'WHILE_STMT': {'while'},
+    'IF_STMT': {'if'},
+    'ELIF_STMT': {'elif', 'ε'},
+    'ELSE_STMT': {'else', 'ε'},
+    'BLOCK': {'tk_indent'},
+    'ITERABLE_EXPR': {'range', 'tk_corchete_izq', 'tk_llave_izq', 'tk_par_izq'},
+    'LIST_EXPR': {'tk_corchete_izq'},
+    'TUPLE_EXPR': {'tk_par_izq'},
+    'RANGE_EXPR': {'range'},
+    'DICT_EXPR': {'tk_llave_izq'},
+    'PAIR_LIST': {'False', 'None', 'True', 'id', 'range', 'tk_corchete_izq', 'tk_entero', 'tk_llave_izq', 'tk_par_izq', 'tk_string', 'ε'},
+    'PAIR_LIST_PRIME': {'tk_coma', 'ε'},
+    'PAIR': {'False', 'None', 'True', 'id', 'range', 'tk_corchete_izq', 'tk_entero', 'tk_llave_izq', 'tk_par_izq', 'tk_string'},
+    'EXPRESSION': {'False', 'None', 'True', 'id', 'range', 'tk_corchete_izq', 'tk_entero', 'tk_llave_izq', 'tk_par_izq', 'tk_string'},
+    'EXPRESSION_PRIME': {'BIT_OP', 'tk_and', 'tk_and_asig', 'tk_asig', 'tk_der_asig', 'tk_distinto', 'tk_div_asig', 'tk_division', 'tk_exp_asig', 'tk_exponente', 'tk_floor_div', 'tk_floor_div_asig', 'tk_igual', 'tk_izq_asig', 'tk_mayor', 'tk_mayor_igual', 'tk_menor', 'tk_menor_igual', 'tk_mod_asig', 'tk_modulo', 'tk_morsa', 'tk_mult_asig', 'tk_multiplicacion', 'tk_not', 'tk_or', 'tk_or_asig', 'tk_resta', 'tk_resta_asig', 'tk_suma', 'tk_suma_asig', 'tk_xor_asig', 'ε'},
+    'OP_STMT': {'BIT_OP', 'tk_and', 'tk_and_asig', 'tk_asig', 'tk_der_asig', 'tk_distinto', 'tk_div_asig', 'tk_division', 'tk_exp_asig', 'tk_exponente', 'tk_floor_div', 'tk_floor_div_asig', 'tk_igual', 'tk_izq_asig', 'tk_mayor', 'tk_mayor_igual', 'tk_menor', 'tk_menor_igual', 'tk_mod_asig', 'tk_modulo', 'tk_morsa', 'tk_mult_asig', 'tk_multiplicacion', 'tk_not', 'tk_or', 'tk_or_asig', 'tk_resta', 'tk_resta_asig', 'tk_suma', 'tk_suma_asig', 'tk_xor_asig'},
+    'ARITHMETIC_OP': {'tk_division', 'tk_exponente', 'tk_floor_div', 'tk_modulo', 'tk_multiplicacion', 'tk_resta', 'tk_suma'},
+    'LOG_OP': {'tk_and', 'tk_distinto', 'tk_igual', 'tk_mayor', 'tk_mayor_igual', 'tk_menor', 'tk_menor_igual', 'tk_not', 'tk_or'},
+    'BITWISE_OP': {'tk_and_bit', 'tk_complemento', 'tk_or_bit', 'tk_shift_der', 'tk_shift_izq', 'tk_xor_bit'},
+    'ASSIGNMENT_OP': {'tk_asig', 'tk_div_asig', 'tk_exp_asig', 'tk_floor_div_asig', 'tk_mod_asig', 'tk_morsa', 'tk_mult_asig', 'tk_resta_asig', 'tk_suma_asig'},
+    'BITWISE_ASSIGNMENT_OP': {'tk_and_asig', 'tk_der_asig', 'tk_izq_asig', 'tk_or_asig', 'tk_xor_asig'},
+    'SPECIAL_OP': {'tk_arr', 'tk_flecha_funcion'},
+}
+
+FOLLOW_SETS = {
+    'PROGRAM': {'$'},
+    'STATEMENT_LIST': {'$', 'tk_dedent'},
+    'STATEMENT_LIST_PRIME': {'$', 'tk_dedent'},
+    'NEWLINE': {'$', 'break', 'continue', 'def', 'for', 'id', 'if', 'pass', 'print', 'return', 'tk_dedent', 'tk_indent', 'tk_newline', 'while'},
+    'STATEMENT': {'$', 'tk_dedent', 'tk_newline'},
+    'ASSIGNMENT_STMT': {'$', 'tk_dedent', 'tk_newline'},
+    'PRINT_STMT': {'$', 'tk_dedent', 'tk_newline'},
+    'PASS_STMT': {'$', 'tk_dedent', 'tk_newline'},
+    'RETURN_STMT': {'$', 'tk_dedent', 'tk_newline'},
+    'LOOP_END': {'$', 'tk_dedent', 'tk_newline'},
+    'BREAK_STMT': {'$', 'tk_dedent', 'tk_newline'},
+    'CONTINUE_STMT': {'$', 'tk_dedent', 'tk_newline'},
+    'FUNCTION_DEF': {'$', 'tk_dedent', 'tk_newline'},
+    'ELEMENTS': {'tk_corchete_der', 'tk_par_der'},
+    'ELEMENT': {'$', 'BIT_OP', 'tk_and', 'tk_and_asig', 'tk_asig', 'tk_coma', 'tk_corchete_der', 'tk_dedent', 'tk_der_asig', 'tk_distinto', 'tk_div_asig', 'tk_division', 'tk_dos_puntos', 'tk_exp_asig', 'tk_exponente', 'tk_floor_div', 'tk_floor_div_asig', 'tk_igual', 'tk_izq_asig', 'tk_llave_der', 'tk_mayor', 'tk_mayor_igual', 'tk_menor', 'tk_menor_igual', 'tk_mod_asig', 'tk_modulo', 'tk_morsa', 'tk_mult_asig', 'tk_multiplicacion', 'tk_newline', 'tk_not', 'tk_or', 'tk_or_asig', 'tk_par_der', 'tk_resta', 'tk_resta_asig', 'tk_suma', 'tk_suma_asig', 'tk_xor_asig'},
+    'ELEMENT_LIST': {'tk_corchete_der', 'tk_par_der'},
+    'FOR_STMT': {'$', 'tk_dedent', 'tk_newline'},
+    'WHILE_STMT': {'$', 'tk_dedent', 'tk_newline'},
+    'IF_STMT': {'$', 'tk_dedent', 'tk_newline'},
+    'ELIF_STMT': {'$', 'else', 'tk_dedent', 'tk_newline'},
+    'ELSE_STMT': {'$', 'tk_dedent', 'tk_newline'},
+    'BLOCK': {'$', 'elif', 'else', 'tk_dedent', 'tk_newline'},
+    'ITERABLE_EXPR': {'$', 'BIT_OP', 'tk_and', 'tk_and_asig', 'tk_asig', 'tk_coma', 'tk_corchete_der', 'tk_dedent', 'tk_der_asig', 'tk_distinto', 'tk_div_asig', 'tk_division', 'tk_dos_puntos', 'tk_exp_asig', 'tk_exponente', 'tk_floor_div', 'tk_floor_div_asig', 'tk_igual', 'tk_izq_asig', 'tk_llave_der', 'tk_mayor', 'tk_mayor_igual', 'tk_menor', 'tk_menor_igual', 'tk_mod_asig', 'tk_modulo', 'tk_morsa', 'tk_mult_asig', 'tk_multiplicacion', 'tk_newline', 'tk_not', 'tk_or', 'tk_or_asig', 'tk_par_der', 'tk_resta', 'tk_resta_asig', 'tk_suma', 'tk_suma_asig', 'tk_xor_asig'},
+    'LIST_EXPR': {'$', 'BIT_OP', 'tk_and', 'tk_and_asig', 'tk_asig', 'tk_coma', 'tk_corchete_der', 'tk_dedent', 'tk_der_asig', 'tk_distinto', 'tk_div_asig', 'tk_division', 'tk_dos_puntos', 'tk_exp_asig', 'tk_exponente', 'tk_floor_div', 'tk_floor_div_asig', 'tk_igual', 'tk_izq_asig', 'tk_llave_der', 'tk_mayor', 'tk_mayor_igual', 'tk_menor', 'tk_menor_igual', 'tk_mod_asig', 'tk_modulo', 'tk_morsa', 'tk_mult_asig', 'tk_multiplicacion', 'tk_newline', 'tk_not', 'tk_or', 'tk_or_asig', 'tk_par_der', 'tk_resta', 'tk_resta_asig', 'tk_suma', 'tk_suma_asig', 'tk_xor_asig'},
+    'TUPLE_EXPR': {'$', 'BIT_OP', 'tk_and', 'tk_and_asig', 'tk_asig', 'tk_coma', 'tk_corchete_der', 'tk_dedent', 'tk_der_asig', 'tk_distinto', 'tk_div_asig', 'tk_division', 'tk_dos_puntos', 'tk_exp_asig', 'tk_exponente', 'tk_floor_div', 'tk_floor_div_asig', 'tk_igual', 'tk_izq_asig', 'tk_llave_der', 'tk_mayor', 'tk_mayor_igual', 'tk_menor', 'tk_menor_igual', 'tk_mod_asig', 'tk_modulo', 'tk_morsa', 'tk_mult_asig', 'tk_multiplicacion', 'tk_newline', 'tk_not', 'tk_or', 'tk_or_asig', 'tk_par_der', 'tk_resta', 'tk_resta_asig', 'tk_suma', 'tk_suma_asig', 'tk_xor_asig'},
+    'RANGE_EXPR': {'$', 'BIT_OP', 'tk_and', 'tk_and_asig', 'tk_asig', 'tk_coma', 'tk_corchete_der', 'tk_dedent', 'tk_der_asig', 'tk_distinto', 'tk_div_asig', 'tk_division', 'tk_dos_puntos', 'tk_exp_asig', 'tk_exponente', 'tk_floor_div', 'tk_floor_div_asig', 'tk_igual', 'tk_izq_asig', 'tk_llave_der', 'tk_mayor', 'tk_mayor_igual', 'tk_menor', 'tk_menor_igual', 'tk_mod_asig', 'tk_modulo', 'tk_morsa', 'tk_mult_asig', 'tk_multiplicacion', 'tk_newline', 'tk_not', 'tk_or', 'tk_or_asig', 'tk_par_der', 'tk_resta', 'tk_resta_asig', 'tk_suma', 'tk_suma_asig', 'tk_xor_asig'},
+    'DICT_EXPR': {'$', 'BIT_OP', 'tk_and', 'tk_and_asig', 'tk_asig', 'tk_coma', 'tk_corchete_der', 'tk_dedent', 'tk_der_asig', 'tk_distinto', 'tk_div_asig', 'tk_division', 'tk_dos_puntos', 'tk_exp_asig', 'tk_exponente', 'tk_floor_div', 'tk_floor_div_asig', 'tk_igual', 'tk_izq_asig', 'tk_llave_der', 'tk_mayor', 'tk_mayor_igual', 'tk_menor', 'tk_menor_igual', 'tk_mod_asig', 'tk_modulo', 'tk_morsa', 'tk_mult_asig', 'tk_multiplicacion', 'tk_newline', 'tk_not', 'tk_or', 'tk_or_asig', 'tk_par_der', 'tk_resta', 'tk_resta_asig', 'tk_suma', 'tk_suma_asig', 'tk_xor_asig'},
+    'PAIR_LIST': {'tk_llave_der'},
+    'PAIR_LIST_PRIME': {'tk_llave_der'},
+    'PAIR': {'tk_coma', 'tk_llave_der'},
+    'EXPRESSION': {'$', 'tk_dedent', 'tk_dos_puntos', 'tk_newline', 'tk_par_der'},
+    'EXPRESSION_PRIME': {'$', 'tk_dedent', 'tk_dos_puntos', 'tk_newline', 'tk_par_der'},
+    'OP_STMT': {'False', 'None', 'True', 'id', 'range', 'tk_corchete_izq', 'tk_entero', 'tk_llave_izq', 'tk_par_izq', 'tk_string'},
+    'ARITHMETIC_OP': {'False', 'None', 'True', 'id', 'range', 'tk_corchete_izq', 'tk_entero', 'tk_llave_izq', 'tk_par_izq', 'tk_string'},
+    'LOG_OP': {'False', 'None', 'True', 'id', 'range', 'tk_corchete_izq', 'tk_entero', 'tk_llave_izq', 'tk_par_izq', 'tk_string'},
+    'BITWISE_OP': set(),
+    'ASSIGNMENT_OP': {'False', 'None', 'True', 'id', 'range', 'tk_corchete_izq', 'tk_entero', 'tk_llave_izq', 'tk_par_izq', 'tk_string'},
+    'BITWISE_ASSIGNMENT_OP': {'False', 'None', 'True', 'id', 'range', 'tk_corchete_izq', 'tk_entero', 'tk_llave_izq', 'tk_par_izq', 'tk_string'},
+    'SPECIAL_OP': set(),
+}
+
+PREDICTION_SETS = {
+    'PROGRAM': [(P[0], {'$', 'break', 'continue', 'def', 'for', 'id', 'if', 'pass', 'print', 'return', 'tk_newline', 'while'})],
+    'STATEMENT_LIST': [(P[1], {'$', 'break', 'continue', 'def', 'for', 'id', 'if', 'pass', 'print', 'return', 'tk_dedent', 'tk_newline', 'while'})],
+    'STATEMENT_LIST_PRIME': [(P[2], {'tk_newline'}), (P[3], {'$', 'tk_dedent'})],
+    'NEWLINE': [(P[4], {'tk_newline'})],
+    'STATEMENT': [(P[5], {'id'}), (P[6], {'print'}), (P[7], {'def'}), (P[8], {'pass'}), (P[9], {'for'}), (P[10], {'while'}), (P[11], {'if'}), (P[12], {'return'}), (P[13], {'break', 'continue'}), (P[14], {'$', 'tk_dedent', 'tk_newline'})],
+    'ASSIGNMENT_STMT': [(P[15], {'id'})],
+    'PRINT_STMT': [(P[16], {'print'})],
+    'PASS_STMT': [(P[17], {'pass'})],
+    'RETURN_STMT': [(P[18], {'return'})],
+    'LOOP_END': [(P[19], {'break'}), (P[20], {'continue'})],
+    'BREAK_STMT': [(P[21], {'break'})],
+    'CONTINUE_STMT': [(P[22], {'continue'})],
+    'FUNCTION_DEF': [(P[23], {'def'})],
+    'ELEMENTS': [(P[24], {'False', 'None', 'True', 'id', 'range', 'tk_corchete_izq', 'tk_entero', 'tk_llave_izq', 'tk_par_izq', 'tk_string'}), (P[25], {'tk_corchete_der', 'tk_par_der'})],
+    'ELEMENT': [(P[26], {'id'}), (P[27], {'tk_string'}), (P[28], {'tk_entero'}), (P[29], {'True'}), (P[30], {'False'}), (P[31], {'None'}), (P[32], {'range', 'tk_corchete_izq', 'tk_llave_izq', 'tk_par_izq'})],
+    'ELEMENT_LIST': [(P[33], {'tk_coma'}), (P[34], {'tk_corchete_der', 'tk_par_der'})],
+    'FOR_STMT': [(P[35], {'for'})],
+    'WHILE_STMT': [(P[36], {'while'})],
+    'IF_STMT': [(P[37], {'if'})],
+    'ELIF_STMT': [(P[38], {'elif'}), (P[39], {'$', 'else', 'tk_dedent', 'tk_newline'})],
+    'ELSE_STMT': [(P[40], {'else'}), (P[41], {'$', 'tk_dedent', 'tk_newline'})],
+    'BLOCK': [(P[42], {'tk_indent'})],
+    'ITERABLE_EXPR': [(P[43], {'tk_corchete_izq'}), (P[44], {'tk_par_izq'}), (P[45], {'range'}), (P[46], {'tk_llave_izq'})],
+    'LIST_EXPR': [(P[47], {'tk_corchete_izq'})],
+    'TUPLE_EXPR': [(P[48], {'tk_par_izq'})],
+    'RANGE_EXPR': [(P[49], {'range'})],
+    'DICT_EXPR': [(P[50], {'tk_llave_izq'})],
+    'PAIR_LIST': [(P[51], {'False', 'None', 'True', 'id', 'range', 'tk_corchete_izq', 'tk_entero', 'tk_llave_izq', 'tk_par_izq', 'tk_string'}), (P[52], {'tk_llave_der'})],
+    'PAIR_LIST_PRIME': [(P[53], {'tk_coma'}), (P[54], {'tk_llave_der'})],
+    'PAIR': [(P[55], {'False', 'None', 'True', 'id', 'range', 'tk_corchete_izq', 'tk_entero', 'tk_llave_izq', 'tk_par_izq', 'tk_string'})],
+    'EXPRESSION': [(P[56], {'False', 'None', 'True', 'id', 'range', 'tk_corchete_izq', 'tk_entero', 'tk_llave_izq', 'tk_par_izq', 'tk_string'})],
+    'EXPRESSION_PRIME': [(P[57], {'BIT_OP', 'tk_and', 'tk_and_asig', 'tk_asig', 'tk_der_asig', 'tk_distinto', 'tk_div_asig', 'tk_division', 'tk_exp_asig', 'tk_exponente', 'tk_floor_div', 'tk_floor_div_asig', 'tk_igual', 'tk_izq_asig', 'tk_mayor', 'tk_mayor_igual', 'tk_menor', 'tk_menor_igual', 'tk_mod_asig', 'tk_modulo', 'tk_morsa', 'tk_mult_asig', 'tk_multiplicacion', 'tk_not', 'tk_or', 'tk_or_asig', 'tk_resta', 'tk_resta_asig', 'tk_suma', 'tk_suma_asig', 'tk_xor_asig'}), (P[58], {'$', 'tk_dedent', 'tk_dos_puntos', 'tk_newline', 'tk_par_der'})],
+    'OP_STMT': [(P[59], {'tk_division', 'tk_exponente', 'tk_floor_div', 'tk_modulo', 'tk_multiplicacion', 'tk_resta', 'tk_suma'}), (P[60], {'tk_and', 'tk_distinto', 'tk_igual', 'tk_mayor', 'tk_mayor_igual', 'tk_menor', 'tk_menor_igual', 'tk_not', 'tk_or'}), (P[61], {'tk_asig', 'tk_div_asig', 'tk_exp_asig', 'tk_floor_div_asig', 'tk_mod_asig', 'tk_morsa', 'tk_mult_asig', 'tk_resta_asig', 'tk_suma_asig'}), (P[62], {'BIT_OP'}), (P[63], {'tk_and_asig', 'tk_der_asig', 'tk_izq_asig', 'tk_or_asig', 'tk_xor_asig'})],
+    'ARITHMETIC_OP': [(P[64], {'tk_suma'}), (P[65], {'tk_resta'}), (P[66], {'tk_multiplicacion'}), (P[67], {'tk_division'}), (P[68], {'tk_modulo'}), (P[69], {'tk_exponente'}), (P[70], {'tk_floor_div'})],
+    'LOG_OP': [(P[71], {'tk_and'}), (P[72], {'tk_or'}), (P[73], {'tk_not'}), (P[74], {'tk_igual'}), (P[75], {'tk_distinto'}), (P[76], {'tk_menor'}), (P[77], {'tk_mayor'}), (P[78], {'tk_menor_igual'}), (P[79], {'tk_mayor_igual'})],
+    'BITWISE_OP': [(P[80], {'tk_and_bit'}), (P[81], {'tk_or_bit'}), (P[82], {'tk_xor_bit'}), (P[83], {'tk_complemento'}), (P[84], {'tk_shift_izq'}), (P[85], {'tk_shift_der'})],
+    'ASSIGNMENT_OP': [(P[86], {'tk_asig'}), (P[87], {'tk_suma_asig'}), (P[88], {'tk_resta_asig'}), (P[89], {'tk_mult_asig'}), (P[90], {'tk_div_asig'}), (P[91], {'tk_mod_asig'}), (P[92], {'tk_exp_asig'}), (P[93], {'tk_floor_div_asig'}), (P[94], {'tk_morsa'})],
+    'BITWISE_ASSIGNMENT_OP': [(P[95], {'tk_and_asig'}), (P[96], {'tk_or_asig'}), (P[97], {'tk_xor_asig'}), (P[98], {'tk_izq_asig'}), (P[99], {'tk_der_asig'})],
+    'SPECIAL_OP': [(P[100], {'tk_flecha_funcion'}), (P[101], {'tk_arr'})],
+}
+
+PARSE_TABLE = {
+    ('PROGRAM', 'tk_newline'): P[0],
+    ('PROGRAM', 'id'): P[0],
+    ('PROGRAM', 'def'): P[0],
+    ('PROGRAM', 'for'): P[0],
+    ('PROGRAM', 'return'): P[0],
+    ('PROGRAM', 'continue'): P[0],
+    ('PROGRAM', 'break'): P[0],
+    ('PROGRAM', 'if'): P[0],
+    ('PROGRAM', 'pass'): P[0],
+    ('PROGRAM', 'print'): P[0],
+    ('PROGRAM', '$'): P[0],
+    ('PROGRAM', 'while'): P[0],
+    ('STATEMENT_LIST', 'tk_newline'): P[1],
+    ('STATEMENT_LIST', 'id'): P[1],
+    ('STATEMENT_LIST', 'def'): P[1],
+    ('STATEMENT_LIST', 'for'): P[1],
+    ('STATEMENT_LIST', 'return'): P[1],
+    ('STATEMENT_LIST', 'continue'): P[1],
+    ('STATEMENT_LIST', 'break'): P[1],
+    ('STATEMENT_LIST', 'if'): P[1],
+    ('STATEMENT_LIST', 'pass'): P[1],
+    ('STATEMENT_LIST', 'print'): P[1],
+    ('STATEMENT_LIST', 'tk_dedent'): P[1],
+    ('STATEMENT_LIST', '$'): P[1],
+    ('STATEMENT_LIST', 'while'): P[1],
+    ('STATEMENT_LIST_PRIME', 'tk_newline'): P[2],
+    ('STATEMENT_LIST_PRIME', '$'): P[3],
+    ('STATEMENT_LIST_PRIME', 'tk_dedent'): P[3],
+    ('NEWLINE', 'tk_newline'): P[4],
+    ('STATEMENT', 'id'): P[5],
+    ('STATEMENT', 'print'): P[6],
+    ('STATEMENT', 'def'): P[7],
+    ('STATEMENT', 'pass'): P[8],
+    ('STATEMENT', 'for'): P[9],
+    ('STATEMENT', 'while'): P[10],
+    ('STATEMENT', 'if'): P[11],
+    ('STATEMENT', 'return'): P[12],
+    ('STATEMENT', 'continue'): P[13],
+    ('STATEMENT', 'break'): P[13],
+    ('STATEMENT', '$'): P[14],
+    ('STATEMENT', 'tk_newline'): P[14],
+    ('STATEMENT', 'tk_dedent'): P[14],
+    ('ASSIGNMENT_STMT', 'id'): P[15],
+    ('PRINT_STMT', 'print'): P[16],
+    ('PASS_STMT', 'pass'): P[17],
+    ('RETURN_STMT', 'return'): P[18],
+    ('LOOP_END', 'break'): P[19],
+    ('LOOP_END', 'continue'): P[20],
+    ('BREAK_STMT', 'break'): P[21],
+    ('CONTINUE_STMT', 'continue'): P[22],
+    ('FUNCTION_DEF', 'def'): P[23],
+    ('ELEMENTS', 'id'): P[24],
+    ('ELEMENTS', 'range'): P[24],
+    ('ELEMENTS', 'tk_corchete_izq'): P[24],
+    ('ELEMENTS', 'True'): P[24],
+    ('ELEMENTS', 'tk_llave_izq'): P[24],
+    ('ELEMENTS', 'tk_par_izq'): P[24],
+    ('ELEMENTS', 'tk_entero'): P[24],
+    ('ELEMENTS', 'None'): P[24],
+    ('ELEMENTS', 'False'): P[24],
+    ('ELEMENTS', 'tk_string'): P[24],
+    ('ELEMENTS', 'tk_corchete_der'): P[25],
+    ('ELEMENTS', 'tk_par_der'): P[25],
+    ('ELEMENT', 'id'): P[26],
+    ('ELEMENT', 'tk_string'): P[27],
+    ('ELEMENT', 'tk_entero'): P[28],
+    ('ELEMENT', 'True'): P[29],
+    ('ELEMENT', 'False'): P[30],
+    ('ELEMENT', 'None'): P[31],
+    ('ELEMENT', 'tk_llave_izq'): P[32],
+    ('ELEMENT', 'range'): P[32],
+    ('ELEMENT', 'tk_par_izq'): P[32],
+    ('ELEMENT', 'tk_corchete_izq'): P[32],
+    ('ELEMENT_LIST', 'tk_coma'): P[33],
+    ('ELEMENT_LIST', 'tk_corchete_der'): P[34],
+    ('ELEMENT_LIST', 'tk_par_der'): P[34],
+    ('FOR_STMT', 'for'): P[35],
+    ('WHILE_STMT', 'while'): P[36],
+    ('IF_STMT', 'if'): P[37],
+    ('ELIF_STMT', 'elif'): P[38],
+    ('ELIF_STMT', '$'): P[39],
+    ('ELIF_STMT', 'else'): P[39],
+    ('ELIF_STMT', 'tk_newline'): P[39],
+    ('ELIF_STMT', 'tk_dedent'): P[39],
+    ('ELSE_STMT', 'else'): P[40],
+    ('ELSE_STMT', '$'): P[41],
+    ('ELSE_STMT', 'tk_newline'): P[41],
+    ('ELSE_STMT', 'tk_dedent'): P[41],
+    ('BLOCK', 'tk_indent'): P[42],
+    ('ITERABLE_EXPR', 'tk_corchete_izq'): P[43],
+    ('ITERABLE_EXPR', 'tk_par_izq'): P[44],
+    ('ITERABLE_EXPR', 'range'): P[45],
+    ('ITERABLE_EXPR', 'tk_llave_izq'): P[46],
+    ('LIST_EXPR', 'tk_corchete_izq'): P[47],
+    ('TUPLE_EXPR', 'tk_par_izq'): P[48],
+    ('RANGE_EXPR', 'range'): P[49],
+    ('DICT_EXPR', 'tk_llave_izq'): P[50],
+    ('PAIR_LIST', 'id'): P[51],
+    ('PAIR_LIST', 'range'): P[51],
+    ('PAIR_LIST', 'tk_corchete_izq'): P[51],
+    ('PAIR_LIST', 'True'): P[51],
+    ('PAIR_LIST', 'tk_llave_izq'): P[51],
+    ('PAIR_LIST', 'tk_par_izq'): P[51],
+    ('PAIR_LIST', 'tk_entero'): P[51],
+    ('PAIR_LIST', 'None'): P[51],
+    ('PAIR_LIST', 'False'): P[51],
+    ('PAIR_LIST', 'tk_string'): P[51],
+    ('PAIR_LIST', 'tk_llave_der'): P[52],
+    ('PAIR_LIST_PRIME', 'tk_coma'): P[53],
+    ('PAIR_LIST_PRIME', 'tk_llave_der'): P[54],
+    ('PAIR', 'id'): P[55],
+    ('PAIR', 'range'): P[55],
+    ('PAIR', 'tk_corchete_izq'): P[55],
+    ('PAIR', 'True'): P[55],
+    ('PAIR', 'tk_llave_izq'): P[55],
+    ('PAIR', 'tk_par_izq'): P[55],
+    ('PAIR', 'tk_entero'): P[55],
+    ('PAIR', 'None'): P[55],
+    ('PAIR', 'False'): P[55],
+    ('PAIR', 'tk_string'): P[55],
+    ('EXPRESSION', 'id'): P[56],
+    ('EXPRESSION', 'range'): P[56],
+    ('EXPRESSION', 'tk_corchete_izq'): P[56],
+    ('EXPRESSION', 'True'): P[56],
+    ('EXPRESSION', 'tk_llave_izq'): P[56],
+    ('EXPRESSION', 'tk_par_izq'): P[56],
+    ('EXPRESSION', 'tk_entero'): P[56],
+    ('EXPRESSION', 'None'): P[56],
+    ('EXPRESSION', 'False'): P[56],
+    ('EXPRESSION', 'tk_string'): P[56],
+    ('EXPRESSION_PRIME', 'tk_asig'): P[57],
+    ('EXPRESSION_PRIME', 'tk_suma_asig'): P[57],
+    ('EXPRESSION_PRIME', 'tk_exp_asig'): P[57],
+    ('EXPRESSION_PRIME', 'tk_and_asig'): P[57],
+    ('EXPRESSION_PRIME', 'tk_menor'): P[57],
+    ('EXPRESSION_PRIME', 'tk_mayor_igual'): P[57],
+    ('EXPRESSION_PRIME', 'tk_izq_asig'): P[57],
+    ('EXPRESSION_PRIME', 'tk_or_asig'): P[57],
+    ('EXPRESSION_PRIME', 'tk_resta_asig'): P[57],
+    ('EXPRESSION_PRIME', 'tk_distinto'): P[57],
+    ('EXPRESSION_PRIME', 'tk_or'): P[57],
+    ('EXPRESSION_PRIME', 'tk_resta'): P[57],
+    ('EXPRESSION_PRIME', 'tk_morsa'): P[57],
+    ('EXPRESSION_PRIME', 'tk_and'): P[57],
+    ('EXPRESSION_PRIME', 'tk_div_asig'): P[57],
+    ('EXPRESSION_PRIME', 'tk_exponente'): P[57],
+    ('EXPRESSION_PRIME', 'tk_suma'): P[57],
+    ('EXPRESSION_PRIME', 'tk_menor_igual'): P[57],
+    ('EXPRESSION_PRIME', 'tk_mod_asig'): P[57],
+    ('EXPRESSION_PRIME', 'tk_mayor'): P[57],
+    ('EXPRESSION_PRIME', 'tk_not'): P[57],
+    ('EXPRESSION_PRIME', 'tk_mult_asig'): P[57],
+    ('EXPRESSION_PRIME', 'tk_xor_asig'): P[57],
+    ('EXPRESSION_PRIME', 'tk_multiplicacion'): P[57],
+    ('EXPRESSION_PRIME', 'tk_der_asig'): P[57],
+    ('EXPRESSION_PRIME', 'BIT_OP'): P[57],
+    ('EXPRESSION_PRIME', 'tk_floor_div'): P[57],
+    ('EXPRESSION_PRIME', 'tk_floor_div_asig'): P[57],
+    ('EXPRESSION_PRIME', 'tk_division'): P[57],
+    ('EXPRESSION_PRIME', 'tk_modulo'): P[57],
+    ('EXPRESSION_PRIME', 'tk_igual'): P[57],
+    ('EXPRESSION_PRIME', 'tk_newline'): P[58],
+    ('EXPRESSION_PRIME', 'tk_dedent'): P[58],
+    ('EXPRESSION_PRIME', '$'): P[58],
+    ('EXPRESSION_PRIME', 'tk_dos_puntos'): P[58],
+    ('EXPRESSION_PRIME', 'tk_par_der'): P[58],
+    ('OP_STMT', 'tk_multiplicacion'): P[59],
+    ('OP_STMT', 'tk_exponente'): P[59],
+    ('OP_STMT', 'tk_suma'): P[59],
+    ('OP_STMT', 'tk_floor_div'): P[59],
+    ('OP_STMT', 'tk_resta'): P[59],
+    ('OP_STMT', 'tk_division'): P[59],
+    ('OP_STMT', 'tk_modulo'): P[59],
+    ('OP_STMT', 'tk_menor_igual'): P[60],
+    ('OP_STMT', 'tk_mayor'): P[60],
+    ('OP_STMT', 'tk_menor'): P[60],
+    ('OP_STMT', 'tk_not'): P[60],
+    ('OP_STMT', 'tk_mayor_igual'): P[60],
+    ('OP_STMT', 'tk_distinto'): P[60],
+    ('OP_STMT', 'tk_or'): P[60],
+    ('OP_STMT', 'tk_and'): P[60],
+    ('OP_STMT', 'tk_igual'): P[60],
+    ('OP_STMT', 'tk_asig'): P[61],
+    ('OP_STMT', 'tk_mod_asig'): P[61],
+    ('OP_STMT', 'tk_suma_asig'): P[61],
+    ('OP_STMT', 'tk_exp_asig'): P[61],
+    ('OP_STMT', 'tk_mult_asig'): P[61],
+    ('OP_STMT', 'tk_resta_asig'): P[61],
+    ('OP_STMT', 'tk_floor_div_asig'): P[61],
+    ('OP_STMT', 'tk_morsa'): P[61],
+    ('OP_STMT', 'tk_div_asig'): P[61],
+    ('OP_STMT', 'BIT_OP'): P[62],
+    ('OP_STMT', 'tk_der_asig'): P[63],
+    ('OP_STMT', 'tk_izq_asig'): P[63],
+    ('OP_STMT', 'tk_or_asig'): P[63],
+    ('OP_STMT', 'tk_and_asig'): P[63],
+    ('OP_STMT', 'tk_xor_asig'): P[63],
+    ('ARITHMETIC_OP', 'tk_suma'): P[64],
+    ('ARITHMETIC_OP', 'tk_resta'): P[65],
+    ('ARITHMETIC_OP', 'tk_multiplicacion'): P[66],
+    ('ARITHMETIC_OP', 'tk_division'): P[67],
+    ('ARITHMETIC_OP', 'tk_modulo'): P[68],
+    ('ARITHMETIC_OP', 'tk_exponente'): P[69],
+    ('ARITHMETIC_OP', 'tk_floor_div'): P[70],
+    ('LOG_OP', 'tk_and'): P[71],
+    ('LOG_OP', 'tk_or'): P[72],
+    ('LOG_OP', 'tk_not'): P[73],
+    ('LOG_OP', 'tk_igual'): P[74],
+    ('LOG_OP', 'tk_distinto'): P[75],
+    ('LOG_OP', 'tk_menor'): P[76],
+    ('LOG_OP', 'tk_mayor'): P[77],
+    ('LOG_OP', 'tk_menor_igual'): P[78],
+    ('LOG_OP', 'tk_mayor_igual'): P[79],
+    ('BITWISE_OP', 'tk_and_bit'): P[80],
+    ('BITWISE_OP', 'tk_or_bit'): P[81],
+    ('BITWISE_OP', 'tk_xor_bit'): P[82],
+    ('BITWISE_OP', 'tk_complemento'): P[83],
+    ('BITWISE_OP', 'tk_shift_izq'): P[84],
+    ('BITWISE_OP', 'tk_shift_der'): P[85],
+    ('ASSIGNMENT_OP', 'tk_asig'): P[86],
+    ('ASSIGNMENT_OP', 'tk_suma_asig'): P[87],
+    ('ASSIGNMENT_OP', 'tk_resta_asig'): P[88],
+    ('ASSIGNMENT_OP', 'tk_mult_asig'): P[89],
+    ('ASSIGNMENT_OP', 'tk_div_asig'): P[90],
+    ('ASSIGNMENT_OP', 'tk_mod_asig'): P[91],
+    ('ASSIGNMENT_OP', 'tk_exp_asig'): P[92],
+    ('ASSIGNMENT_OP', 'tk_floor_div_asig'): P[93],
+    ('ASSIGNMENT_OP', 'tk_morsa'): P[94],
+    ('BITWISE_ASSIGNMENT_OP', 'tk_and_asig'): P[95],
+    ('BITWISE_ASSIGNMENT_OP', 'tk_or_asig'): P[96],
+    ('BITWISE_ASSIGNMENT_OP', 'tk_xor_asig'): P[97],
+    ('BITWISE_ASSIGNMENT_OP', 'tk_izq_asig'): P[98],
+    ('BITWISE_ASSIGNMENT_OP', 'tk_der_asig'): P[99],
+    ('SPECIAL_OP', 'tk_flecha_funcion'): P[100],
+    ('SPECIAL_OP', 'tk_arr'): P[101],
+}
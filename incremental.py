@@ -0,0 +1,343 @@
+# incremental.py
+
+from array import array
+from bisect import bisect_right
+
+from driver import OK, LEXICAL_ERROR, SYNTAX_ERROR, error_result
+from lexer import create_lexer
+from parser import Grammar, Parser
+from tokens import HAS_LEXEME, TOKEN_NAMES, SymbolTable, TokenBuffer
+
+
+class ShiftedColumns:
+    """Arreglos paralelos cuyos elementos desde `start` tienen pendiente una corrección por columna.
+
+    Funciona como el hueco de un editor de texto: tras una edición no se corrigen todos los elementos
+    posteriores, sino que la corrección se acumula y solo se aplica a los elementos que quedan entre
+    el punto de la edición anterior y el de la siguiente.
+    """
+
+    def __init__(self, *columns):
+        self.columns = columns
+        self.start = 0
+        self.shifts = [0] * len(columns)
+
+    def value(self, column, index):
+        """Retorna el valor corregido del elemento `index` de la columna `column`."""
+        if index >= self.start:
+            return self.columns[column][index] + self.shifts[column]
+        return self.columns[column][index]
+
+    def move(self, index):
+        """Aplica la corrección pendiente hasta `index`, que pasa a ser el inicio de la parte pendiente."""
+        low, high = sorted((self.start, index))
+        for column, shift in zip(self.columns, self.shifts):
+            if shift and low < high:
+                if index < self.start:
+                    shift = -shift
+                column[low:high] = array('i', map(shift.__add__, column[low:high]))
+        self.start = index
+
+    def advance(self, index, shifts):
+        """Marca como pendientes los elementos desde `index`, sumando `shifts` a su corrección."""
+        self.start = index
+        self.shifts = [pending + shift for pending, shift in zip(self.shifts, shifts)]
+
+    def reset(self):
+        """Descarta la corrección pendiente; todos los elementos deben estar ya corregidos."""
+        self.start = len(self.columns[0])
+        self.shifts = [0] * len(self.columns)
+
+    def last_not_after(self, column, value):
+        """Retorna el índice del último elemento con valor corregido <= `value` (la columna está ordenada)."""
+        values = self.columns[column]
+        if self.start < len(values) and values[self.start] + self.shifts[column] <= value:
+            return bisect_right(values, value - self.shifts[column], self.start) - 1
+        return bisect_right(values, value, 0, self.start) - 1
+
+    def find(self, column, value):
+        """Retorna el índice del elemento con valor corregido `value`, o None si no existe."""
+        index = self.last_not_after(column, value)
+        if index >= 0 and self.value(column, index) == value:
+            return index
+        return None
+
+
+class IncrementalAnalyzer:
+    """Mantiene el análisis de un texto y lo actualiza con cada edición, pensado para editores.
+
+    Durante el análisis se guardan puntos de reinicio:
+      - del lexer, en cada inicio de línea fuera de cadenas y comentarios: desplazamiento, línea,
+        número de tokens y estado (pila de indentación, tipo del último token);
+      - del parser, tras cada tk_newline: índice del siguiente token y estado (pila, última regla).
+    Una edición se vuelve a analizar desde el último punto anterior a ella y solo hasta que el
+    estado coincide con el del análisis anterior en el mismo punto del texto; desde ahí se
+    reutilizan los tokens y el veredicto anteriores. Las líneas, desplazamientos e índices de lo
+    reutilizado se corrigen de forma diferida (ver ShiftedColumns), así que el costo de una edición
+    depende de su tamaño y de la distancia a la edición anterior, no del tamaño del texto.
+    """
+
+    def __init__(self, code, grammar='gramatica.txt', engine='char'):
+        self.grammar = grammar if isinstance(grammar, Grammar) else Grammar(grammar)
+        self.engine = engine
+        self.messages = Parser.from_tokens(self.grammar, (), verbose=False)  # Solo para formatear errores
+        self.newline_id = self.grammar.terminal_ids.get('tk_newline', -1)
+        self.code = code
+        self.tokens = TokenBuffer(code, SymbolTable())  # Todos los reanálisis internan en la misma tabla
+        self.token_shifts = ShiftedColumns(self.tokens.lines, self.tokens.starts, self.tokens.ends)
+
+        # Puntos de reinicio del lexer (el primero es el inicio del texto)
+        self.lex_offsets = array('i', [0])
+        self.lex_lines = array('i', [1])
+        self.lex_counts = array('i', [0])
+        self.lex_states = [((0,), None)]
+        self.lex_shifts = ShiftedColumns(self.lex_offsets, self.lex_lines, self.lex_counts)
+        self.lex_error = None  # (línea, columna, mensaje) del error léxico
+        self.tab_error = False  # El error léxico es un TabError (su mensaje incluye la línea)
+
+        # Puntos de reinicio del parser (el primero es la pila inicial)
+        grammar = self.grammar
+        self.parse_counts = array('i', [0])
+        self.parse_states = [((grammar.terminal_ids['$'], grammar.nonterminal_ids[grammar.start_symbol]), None)]
+        self.parse_shifts = ShiftedColumns(self.parse_counts)
+        self.parse_error = None  # (índice del token, mensaje) del error sintáctico
+        self.parsed = False  # Los puntos del parser cubren todo el texto
+
+        self.result = self.update(0, len(code), 0)
+
+    def edit(self, offset, removed, inserted):
+        """Reemplaza `removed` caracteres desde `offset` por `inserted` y retorna el nuevo veredicto."""
+        if not 0 <= offset <= offset + removed <= len(self.code):
+            raise ValueError("edición fuera del texto")
+        self.code = self.code[:offset] + inserted + self.code[offset + removed:]
+        self.tokens.source = self.code
+        self.result = self.update(offset, offset + len(inserted), len(inserted) - removed)
+        return self.result
+
+    def token_buffer(self):
+        """Retorna el TokenBuffer del texto actual, aplicando las correcciones pendientes."""
+        self.token_shifts.move(len(self.tokens))
+        return self.tokens
+
+    def update(self, offset, edit_end, delta):
+        """Vuelve a analizar el texto tras una edición que terminó en `edit_end` y desplazó el resto `delta`."""
+        first, stop, token_shift = self.relex(offset, edit_end, delta)
+        if self.lex_error is not None:
+            # Sin tokens válidos no hay análisis sintáctico; se conservan los puntos anteriores a la edición
+            index = self.parse_shifts.last_not_after(0, first)
+            self.parse_shifts.move(index + 1)
+            del self.parse_counts[index + 1:]
+            del self.parse_states[index + 1:]
+            self.parse_shifts.reset()
+            self.parsed = False
+            return error_result(LEXICAL_ERROR, [self.lex_error])
+
+        self.reparse(first, stop, token_shift)
+        if self.parse_error is not None:
+            index, message = self.parse_error
+            token = self.token_at(index)
+            return error_result(SYNTAX_ERROR, [(token[-2], token[-1], message)])
+        return {'status': OK, 'tokens': len(self.tokens)}
+
+    def relex(self, offset, edit_end, delta):
+        """Reanaliza léxicamente desde el último punto de reinicio anterior a `offset`.
+
+        Retorna (primer token reemplazado, fin de los tokens nuevos, desplazamiento de los índices
+        de los tokens reutilizados); el desplazamiento es None si no se reutilizó ningún token.
+        """
+        checkpoints = self.lex_shifts
+        index = checkpoints.last_not_after(0, offset)
+        checkpoints.move(index + 1)
+        first = self.lex_counts[index]
+        indent_stack, last_kind = self.lex_states[index]
+        lexer = create_lexer(self.code, self.engine, verbose=False, symbols=self.tokens.symbol_table)
+        lexer.position = self.lex_offsets[index]
+        lexer.line = self.lex_lines[index]
+        lexer.indent_stack = list(indent_stack)
+        lexer.last_kind = last_kind
+        tokens = lexer.tokens
+
+        reusable = not self.tab_error
+        offsets, lines, counts, states = array('i'), array('i'), array('i'), []
+        code = self.code
+        last_offset = lexer.position
+        resync = None
+        error = None
+        try:
+            for _ in lexer.scan():
+                position = lexer.position
+                if position <= last_offset or code[position - 1] != '\n' or lexer.error_reported:
+                    continue
+                # Inicio de línea: el estado del lexer solo depende del texto anterior
+                last_offset = position
+                state = (tuple(lexer.indent_stack), tokens.kinds[-1] if tokens else last_kind)
+                offsets.append(position)
+                lines.append(lexer.line)
+                counts.append(first + len(tokens))
+                states.append(state)
+                if reusable and position >= edit_end:
+                    old = checkpoints.find(0, position - delta)
+                    if old is not None and self.lex_states[old] == state:
+                        resync = old
+                        break
+        except TabError as tab_error:
+            error = (lexer.line, lexer.column, str(tab_error))
+        stop = first + len(tokens)
+
+        self.token_shifts.move(first)
+        if resync is None:
+            self.tokens.splice(first, len(self.tokens), tokens)
+            self.token_shifts.reset()
+            self.lex_error = error or lexer.diagnostic
+            self.tab_error = error is not None
+            token_shift = None
+            line_shift = 0
+            resync = len(self.lex_offsets) - 1
+        else:
+            line_shift = lexer.line - checkpoints.value(1, resync)
+            old_stop = checkpoints.value(2, resync)
+            token_shift = stop - old_stop
+            self.tokens.splice(first, old_stop, tokens)
+            self.token_shifts.advance(stop, (line_shift, delta, delta))
+            if self.lex_error is not None:
+                line, column, message = self.lex_error
+                self.lex_error = (line + line_shift, column, message)
+
+        # Los puntos nuevos reemplazan a los que había entre el reinicio y la resincronización
+        self.lex_offsets[index + 1:resync + 1] = offsets
+        self.lex_lines[index + 1:resync + 1] = lines
+        self.lex_counts[index + 1:resync + 1] = counts
+        self.lex_states[index + 1:resync + 1] = states
+        if token_shift is None:
+            checkpoints.reset()
+        else:
+            checkpoints.advance(index + 1 + len(offsets), (delta, line_shift, token_shift))
+            # El parser solo puede reutilizar su resultado si también se reutilizaron tokens
+            if stop == len(self.tokens):
+                token_shift = None
+        return first, stop, token_shift
+
+    def reparse(self, first, stop, token_shift):
+        """Reanaliza sintácticamente desde el último punto de reinicio anterior al token `first`.
+
+        El análisis se detiene al terminar, al encontrar un error, o en un tk_newline posterior a `stop`
+        cuyo estado coincide con el del análisis anterior; en ese caso se adopta el veredicto anterior.
+        """
+        grammar = self.grammar
+        table = grammar.table
+        productions = grammar.productions
+        is_terminal = grammar.is_terminal
+        n_terms = grammar.n_terms
+        n_columns = grammar.n_columns
+        newline_id = self.newline_id
+
+        checkpoints = self.parse_shifts
+        index = checkpoints.last_not_after(0, first)
+        checkpoints.move(index + 1)
+        saved_stack, rule = self.parse_states[index]
+        stack = list(saved_stack)
+        pop = stack.pop
+        push = stack.extend
+        position = self.parse_counts[index]
+        next_columns = self.token_columns(position).__next__
+        term, alt = next_columns()
+
+        reusable = self.parsed and token_shift is not None
+        counts, states = array('i'), []
+        error = None
+        resync = None
+
+        while stack:
+            top = pop()
+            if top >= n_terms:
+                rule = top
+                row = (top - n_terms) * n_columns
+                production = table[row + term]
+                if production < 0:
+                    production = table[row + alt]
+                if production >= 0:
+                    push(productions[production])
+                else:
+                    name = grammar.symbol_names[rule]
+                    error = (position, self.messages.expected_tokens(name), name)
+                    break
+            elif is_terminal[top] and (top == term or top == alt):
+                term, alt = next_columns()
+                position += 1
+                if top == newline_id:
+                    state = (tuple(stack), rule)
+                    counts.append(position)
+                    states.append(state)
+                    if reusable and position >= stop:
+                        old = checkpoints.find(0, position - token_shift)
+                        if old is not None and self.parse_states[old] == state:
+                            resync = old
+                            break
+            else:
+                name = grammar.symbol_names[rule] if rule is not None else None
+                error = (position, [grammar.symbol_names[top]], name)
+                break
+
+        reused = resync is not None
+        if not reused:
+            resync = len(self.parse_counts) - 1
+            if error is None:
+                self.parse_error = None
+            else:
+                position, expected, name = error
+                detail = self.messages.describe_syntax_error(self.token_at(position), expected, name)[2]
+                self.parse_error = (position, detail)
+        elif self.parse_error is not None:
+            position, message = self.parse_error
+            self.parse_error = (position + token_shift, message)
+
+        self.parse_counts[index + 1:resync + 1] = counts
+        self.parse_states[index + 1:resync + 1] = states
+        if reused:
+            checkpoints.advance(index + 1 + len(counts), (token_shift,))
+        else:
+            checkpoints.reset()
+        self.parsed = True
+
+    def token_columns(self, position):
+        """Genera las columnas de la tabla (nombre y lexema) de los tokens desde `position`."""
+        grammar = self.grammar
+        kind_columns = grammar.kind_columns
+        terminal_ids = grammar.terminal_ids
+        unknown_id = grammar.unknown_id
+        tokens = self.tokens
+        kinds, starts, ends, symbols = tokens.kinds, tokens.starts, tokens.ends, tokens.symbols
+        source = tokens.source
+        pending = self.token_shifts.start
+        shift = self.token_shifts.shifts[1]
+        # Los IDs de los símbolos no cambian con las ediciones: no necesitan corregirse (ver Parser.symbol_columns)
+        symbol_columns = self.messages.symbol_columns(tokens.symbol_table)
+        for index in range(position, len(kinds)):
+            kind = kinds[index]
+            term = kind_columns[kind]
+            if not HAS_LEXEME[kind]:
+                yield term, term
+            elif symbols[index] >= 0:
+                yield term, symbol_columns[symbols[index]]
+            elif index < pending:
+                yield term, terminal_ids.get(source[starts[index]:ends[index]], unknown_id)
+            else:
+                yield term, terminal_ids.get(source[starts[index] + shift:ends[index] + shift], unknown_id)
+        end = terminal_ids['$']
+        while True:
+            yield end, end
+
+    def token_at(self, index):
+        """Retorna el token `index` como tupla, o el fin de entrada '$' en la posición del último token."""
+        tokens = self.tokens
+        shifts = self.token_shifts
+        if index >= len(tokens):
+            if not tokens:
+                return ('$', '$', 0, 0)
+            return ('$', '$', shifts.value(0, len(tokens) - 1), tokens.columns[-1])
+        line = shifts.value(0, index)
+        kind = tokens.kinds[index]
+        if HAS_LEXEME[kind]:
+            lexeme = self.code[shifts.value(1, index):shifts.value(2, index)]
+            return (TOKEN_NAMES[kind], lexeme, line, tokens.columns[index])
+        return (TOKEN_NAMES[kind], line, tokens.columns[index])
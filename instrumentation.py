@@ -0,0 +1,194 @@
+# instrumentation.py
+
+import time
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from itertools import accumulate
+
+from tokens import DEDENT, INDENT, TOKEN_NAMES
+
+# Prefijo de los nombres de las métricas en el formato de texto de Prometheus
+PROMETHEUS_PREFIX = 'analizador_'
+
+# Métodos de Lexer que implementan cada rama de Lexer.scan(); RegexLexer resuelve las ramas dentro
+# de su propio bucle, por lo que con ese motor estos contadores quedan vacíos
+LEXER_BRANCHES = ('handle_indentation', 'tokenize_comment', 'tokenize_multiline_comment', 'tokenize_string',
+                  'tokenize_identifier', 'tokenize_number', 'tokenize_operator', 'tokenize_delimiter')
+
+# Etiqueta de cada contador (los contadores sin etiqueta no aparecen)
+COUNTER_LABELS = {
+    'lexer_branch_calls_total': 'branch',
+    'lexer_branch_chars_total': 'branch',
+    'lexer_branch_tokens_total': 'branch',
+    'tokens_total': 'kind',
+    'production_expansions_total': 'production',
+    'files_total': 'status',
+    'result_cache_total': 'outcome',
+}
+
+# Variación de la sangría de cada tipo de token, para calcular la profundidad máxima sin recorrer la pila
+INDENT_DELTAS = tuple(1 if kind == INDENT else -1 if kind == DEDENT else 0 for kind in range(len(TOKEN_NAMES)))
+
+
+def no_phase(name):
+    """Fase sin medición, para quien recibe metrics=None."""
+    return nullcontext()
+
+
+class Metrics:
+    """Contadores, máximos y tiempos de las fases del análisis.
+
+    Nada se mide salvo que se pase una instancia a Grammar, driver.analyze_source o analyze_paths
+    (o se usen instrument_lexer/instrument_parser): el código sin instrumentar no cambia.
+    Se exporta como JSON (to_json) o como texto de Prometheus (to_prometheus).
+    """
+
+    def __init__(self):
+        self.counters = {}  # nombre -> {valor de la etiqueta (o ''): cuenta}
+        self.maxima = {}  # nombre -> máximo observado
+        self.phases = {}  # fase -> segundos acumulados
+
+    def count(self, name, label='', value=1):
+        """Suma `value` al contador `name` con la etiqueta `label`."""
+        counter = self.counters.setdefault(name, {})
+        counter[label] = counter.get(label, 0) + value
+
+    def observe_max(self, name, value):
+        """Registra `value` en el máximo `name`."""
+        if value > self.maxima.get(name, value - 1):
+            self.maxima[name] = value
+
+    @contextmanager
+    def phase(self, name):
+        """Mide el tiempo del bloque y lo acumula en la fase `name`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    def merge(self, other):
+        """Acumula las métricas de otra instancia o de su diccionario (ver to_dict), p. ej. de otro proceso."""
+        if isinstance(other, Metrics):
+            other = other.to_dict()
+        for name, counter in other['counters'].items():
+            for label, value in counter.items():
+                self.count(name, label, value)
+        for name, value in other['maxima'].items():
+            self.observe_max(name, value)
+        for name, seconds in other['phases'].items():
+            self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def to_dict(self):
+        """Retorna las métricas como diccionario serializable en JSON."""
+        return {'counters': {name: dict(counter) for name, counter in self.counters.items()},
+                'maxima': dict(self.maxima),
+                'phases': dict(self.phases)}
+
+    def to_json(self):
+        """Retorna las métricas en formato JSON, con los contadores de mayor a menor."""
+        import json  # Solo aquí: parser.py importa este módulo y json alarga el arranque
+        data = self.to_dict()
+        data['counters'] = {name: dict(sorted(counter.items(), key=lambda item: -item[1]))
+                            for name, counter in data['counters'].items()}
+        return json.dumps(data, ensure_ascii=False, indent=2)
+
+    def to_prometheus(self):
+        """Retorna las métricas en el formato de texto de exposición de Prometheus."""
+        lines = []
+        for name, counter in sorted(self.counters.items()):
+            metric = PROMETHEUS_PREFIX + name
+            lines.append(f'# TYPE {metric} counter')
+            label = COUNTER_LABELS.get(name)
+            for value, count in sorted(counter.items()):
+                if label and value:
+                    lines.append(f'{metric}{{{label}="{escape_label(value)}"}} {count}')
+                else:
+                    lines.append(f'{metric} {count}')
+        for name, value in sorted(self.maxima.items()):
+            metric = PROMETHEUS_PREFIX + name
+            lines += [f'# TYPE {metric} gauge', f'{metric} {value}']
+        if self.phases:
+            metric = PROMETHEUS_PREFIX + 'phase_seconds_total'
+            lines.append(f'# TYPE {metric} counter')
+            for name, seconds in sorted(self.phases.items()):
+                lines.append(f'{metric}{{phase="{escape_label(name)}"}} {seconds:.6f}')
+        return '\n'.join(lines) + '\n'
+
+
+def escape_label(value):
+    """Escapa el valor de una etiqueta de Prometheus."""
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def instrument_lexer(lexer, metrics):
+    """Cuenta las llamadas, los caracteres consumidos y los tokens producidos por cada rama de Lexer.scan().
+
+    Los métodos de las ramas se reemplazan solo en esta instancia: los demás lexers no pagan ningún costo.
+    """
+    for branch in LEXER_BRANCHES:
+        setattr(lexer, branch, counted_branch(lexer, metrics, branch, getattr(lexer, branch)))
+
+
+def counted_branch(lexer, metrics, branch, method):
+    """Envuelve el método de una rama del lexer para contar su actividad."""
+    name = branch.replace('tokenize_', '').replace('handle_', '')
+
+    def branch_method():
+        position = lexer.position
+        count = len(lexer.tokens)
+        method()
+        metrics.count('lexer_branch_calls_total', name)
+        metrics.count('lexer_branch_chars_total', name, lexer.position - position)
+        metrics.count('lexer_branch_tokens_total', name, len(lexer.tokens) - count)
+    return branch_method
+
+
+def record_tokens(metrics, tokens):
+    """Cuenta los tokens de un TokenBuffer por tipo y registra la profundidad máxima de sangría y los
+    símbolos distintos de su tabla de símbolos."""
+    for kind, count in Counter(tokens.kinds).items():
+        metrics.count('tokens_total', TOKEN_NAMES[kind], count)
+    metrics.count('source_chars_total', value=len(tokens.source))
+    metrics.observe_max('indent_depth_max', max(accumulate(map(INDENT_DELTAS.__getitem__, tokens.kinds)), default=0))
+    if tokens.symbol_table is not None:
+        # Con una tabla compartida entre archivos (ver driver.analyze_paths) el máximo es su tamaño final
+        metrics.observe_max('symbols_distinct_max', len(tokens.symbol_table))
+
+
+class InstrumentedStack(list):
+    """Pila de Parser que cuenta las producciones aplicadas y su profundidad máxima.
+
+    Parser.parse() apila cada producción con una sola llamada a extend() justo después de desapilar
+    el no terminal, así que cada extend() corresponde a una expansión del último símbolo desapilado.
+    """
+
+    def __init__(self, symbols):
+        super().__init__(symbols)
+        self.top = None
+        self.expansions = Counter()
+        self.max_depth = len(symbols)
+
+    def pop(self):
+        self.top = super().pop()
+        return self.top
+
+    def extend(self, symbols):
+        super().extend(symbols)
+        self.expansions[self.top, symbols] += 1
+        if len(self) > self.max_depth:
+            self.max_depth = len(self)
+
+
+def instrument_parser(parser):
+    """Reemplaza la pila del parser por una InstrumentedStack (ver record_parse)."""
+    parser.stack = InstrumentedStack(parser.stack)
+
+
+def record_parse(metrics, parser):
+    """Registra las producciones aplicadas y la profundidad máxima de la pila de un parser instrumentado."""
+    names = parser.grammar.symbol_names
+    for (nt, symbols), count in parser.stack.expansions.items():
+        production = ' '.join(names[symbol] for symbol in reversed(symbols)) or 'ε'
+        metrics.count('production_expansions_total', f'{names[nt]} -> {production}', count)
+    metrics.observe_max('parse_stack_depth_max', parser.stack.max_depth)
@@ -1,18 +1,52 @@
-from tokens import is_reserved_word, is_operator, is_delimiter, DELIMITERS, OPERATORS, RESERVED_WORDS
+from tokens import (is_reserved_word, ASCII_CHAR_CLASSES, CHAR_BLANK, CHAR_COMMENT, CHAR_DELIMITER, CHAR_DIGIT,
+                    CHAR_IDENTIFIER, CHAR_INVALID, CHAR_OPERATOR, CHAR_QUOTE, DELIMITERS, OPERATOR_MATCHES,
+                    RESERVED_WORDS, TOKEN_IDS, SymbolTable, TokenBuffer, char_class, ID, INTEGER, STRING, NEWLINE,
+                    INDENT, DEDENT)
+
+# Tamaño de los bloques leídos del flujo de entrada en modo perezoso
+CHUNK_SIZE = 1 << 16
+
+# Motores de análisis léxico disponibles (ver create_lexer)
+ENGINES = ('char', 'regex', 'mmap')
+
+def create_lexer(code='', engine='char', **kwargs):
+    """Crea el analizador léxico del motor indicado: 'char' (carácter a carácter), 'regex' (expresión maestra)
+    o 'mmap' (expresión maestra sobre los bytes del código, p. ej. un archivo mapeado con mapped_lexer.map_source)."""
+    if engine == 'char':
+        return Lexer(code, **kwargs)
+    if engine == 'regex':
+        from regex_lexer import RegexLexer
+        return RegexLexer(code, **kwargs)
+    if engine == 'mmap':
+        from mapped_lexer import MappedLexer
+        return MappedLexer(code, **kwargs)
+    raise ValueError(f"Motor léxico desconocido: '{engine}'")
 
 class Lexer:
-    def __init__(self, code):
+    def __init__(self, code='', output_file=None, verbose=True, max_errors=1, sink=None, symbols=None):
         self.code = code
         self.position = 0
         self.line = 1
         self.column = 1
-        self.tokens = []
+        # Tabla de símbolos de los identificadores y enteros (ver tokens.SymbolTable); se puede compartir
+        self.symbols = symbols if symbols is not None else SymbolTable()
+        self.tokens = TokenBuffer(code, self.symbols)
         self.error_reported = False
         self.error_message = ""
+        self.diagnostic = None  # (línea, columna, mensaje) del primer error léxico
+        self.diagnostics = []  # (línea, columna, mensaje) de todos los errores léxicos
+        self.max_errors = max_errors  # Errores tras los que se detiene el análisis (None: sin límite)
+        self.halted = False  # Se alcanzó el límite de errores
+        self.verbose = verbose  # Muestra los errores en pantalla
         self.indent_stack = [0]  # Pila para manejar los niveles de indentación
-
-        # Reiniciar el archivo de salida al inicio
-        open('output.txt', 'w').close()  # Vacía el archivo al iniciar
+        # Destino de los tokens (ver sinks.py); output_file equivale a un TextSink sin eco en pantalla
+        self.sink = sink
+        if sink is None and output_file:
+            from sinks import TextSink
+            self.sink = TextSink(output_file)
+        self.stream = None  # Archivo leído por bloques en modo perezoso (ver iter_tokens)
+        self.chunk_size = CHUNK_SIZE
+        self.last_kind = None  # Tipo del último token entregado en modo perezoso
 
     def advance(self):
         """Avanza el puntero de posición y ajusta columna y línea."""
@@ -27,16 +61,76 @@ class Lexer:
     def peek(self, offset=0):
         """Retorna el carácter en la posición actual + offset sin avanzar."""
         pos = self.position + offset
-        if pos < len(self.code):
+        if pos < len(self.code) or self.fill(pos):
             return self.code[pos]
         return None
 
+    def fill(self, pos):
+        """Lee bloques del flujo de entrada hasta que la posición `pos` esté disponible."""
+        if self.stream is None:
+            return False
+        while pos >= len(self.code):
+            chunk = self.stream.read(self.chunk_size)
+            if not chunk:
+                self.stream = None  # Fin del flujo
+                return False
+            self.code += chunk
+        return True
+
+    def discard_consumed(self):
+        """Descarta el texto ya analizado, conservando el último carácter para detectar uniones de línea."""
+        self.code = self.code[self.position - 1:]
+        self.position = 1
+
     def tokenize(self):
         """Realiza el análisis léxico del código fuente, soportando unión de líneas con barra invertida."""
+        for _ in self.scan():
+            pass
+
+        # Entregar los tokens generados al destino de salida, si lo hay
+        if self.sink is not None:
+            self.write_output()
+        return self.tokens
+
+    def iter_tokens(self, stream=None, chunk_size=CHUNK_SIZE):
+        """Genera los tokens de forma perezosa, leyendo `stream` por bloques si se indica.
+
+        Los tokens no se acumulan en `self.tokens`, así que la memoria usada no depende del tamaño de la entrada.
+        """
+        if stream is not None:
+            self.stream = stream
+            self.chunk_size = chunk_size
+        pending = self.tokens = TokenBuffer(self.code, self.symbols)
+        for _ in self.scan():
+            if pending:
+                pending.source = self.code  # El búfer de lectura cambia al leer nuevos bloques
+                yield from pending.tuples()
+                self.last_kind = pending.kinds[-1]
+                pending.clear()
+
+    def scan(self):
+        """Recorre el código agregando tokens a `self.tokens`; cede el control tras cada paso del análisis."""
         at_line_start = True  # Indica si estamos al inicio de una línea
+        # Rama de cada clase de carácter (ver tokens.char_class), tomadas de la instancia para que
+        # instrumentation.instrument_lexer pueda reemplazarlas; None es un carácter inválido
+        handlers = {
+            CHAR_BLANK: self.advance,  # Ignorar espacios en blanco (excepto para la indentación)
+            CHAR_COMMENT: self.tokenize_comment,
+            CHAR_QUOTE: self.tokenize_quoted,
+            CHAR_IDENTIFIER: self.tokenize_identifier,
+            CHAR_DIGIT: self.tokenize_number,
+            CHAR_OPERATOR: self.tokenize_operator,
+            CHAR_DELIMITER: self.tokenize_delimiter,
+            CHAR_INVALID: None,
+        }
+        dispatch = {char: handlers[char_class] for char, char_class in ASCII_CHAR_CLASSES.items()}
         while True:
-            if self.error_reported:
-                break  # Detener si ya se ha reportado un error
+            yield
+            if self.stream is not None and self.position > self.chunk_size:
+                self.discard_consumed()
+
+            if self.halted:
+                break  # Detener si se alcanzó el límite de errores
 
             char = self.peek()
             if char is None:
@@ -51,7 +145,7 @@ class Lexer:
                     continue
                 else:
                     self.advance()
-                    self.tokens.append(('tk_newline', self.line, self.column))
+                    self.tokens.append(NEWLINE, self.line, self.column)
                     at_line_start = True
                     continue
 
@@ -61,61 +155,30 @@ class Lexer:
                 at_line_start = False
                 continue
 
-            # Ignorar espacios en blanco (excepto para la indentación)
-            if char == ' ' or char == '\t':
-                self.advance()
-                continue
-
-            # Procesar comentarios de una línea
-            if char == '#':
-                self.tokenize_comment()
-                continue
-
-            # Detectar comentarios multilínea
-            if char in {'"', "'"}:
-                if self.peek(1) == char and self.peek(2) == char:
-                    self.tokenize_multiline_comment()
-                    continue
-                else:
-                    self.tokenize_string()
-                    continue
-
-            # Tokenizar identificadores y palabras reservadas
-            if char.isalpha() or char == '_':
-                self.tokenize_identifier()
-                continue
-
-            # Tokenizar números
-            if char.isdigit():
-                self.tokenize_number()
+            # Elegir la rama según la clase del carácter: una consulta en la tabla para ASCII
+            handler = dispatch.get(char)
+            if handler is None and not char.isascii():
+                handler = handlers[char_class(char)]
+            if handler is not None:
+                handler()
                 continue
 
-            # Tokenizar operadores
-            if is_operator(char):
-                self.tokenize_operator()
-                continue
-
-            # Tokenizar delimitadores
-            if is_delimiter(char):
-                self.tokenize_delimiter()
-                continue
-
-            # Si no coincide con nada, es un error léxico
+            # Si no coincide con nada, es un error léxico: se salta el carácter y se continúa
             self.report_error()
-            break
+            if self.halted:
+                break
+            self.advance()
 
         # Inserta un tk_newline si el último token no es un tk_newline
-        if self.tokens and self.tokens[-1][0] != 'tk_newline':
-            self.tokens.append(('tk_newline', self.line, self.column))
+        last_kind = self.tokens.kinds[-1] if self.tokens else self.last_kind
+        if last_kind is not None and last_kind != NEWLINE:
+            self.tokens.append(NEWLINE, self.line, self.column)
 
         # Manejar dedentaciones al final del archivo
         while len(self.indent_stack) > 1:
             self.indent_stack.pop()
-            self.tokens.append(('tk_dedent', self.line, self.column))
-
-        # Escribir los tokens generados en el archivo de salida
-        self.write_output()
-        return self.tokens
+            self.tokens.append(DEDENT, self.line, self.column)
+        yield
 
     def handle_indentation(self):
         """Maneja la sangría con tabulaciones y espacios, generando tokens tk_indent y tk_dedent."""
@@ -126,7 +189,7 @@ class Lexer:
         has_spaces = False
 
         # Procesa la sangría al inicio de cada línea
-        while pos < len(self.code) and self.code[pos] in (' ', '\t', '\f'):
+        while (pos < len(self.code) or self.fill(pos)) and self.code[pos] in (' ', '\t', '\f'):
             if self.code[pos] == ' ':
                 spaces += 1
                 has_spaces = True
@@ -152,35 +215,38 @@ class Lexer:
         if current_indent > previous_indent:
             # Aumentar la sangría: agregar `tk_indent` y actualizar la pila
             self.indent_stack.append(current_indent)
-            self.tokens.append(('tk_indent', self.line, self.column))
+            self.tokens.append(INDENT, self.line, self.column)
 
         elif current_indent < previous_indent:
             # Disminuir la sangría: generar `tk_dedent` hasta alcanzar el nivel actual
             while len(self.indent_stack) > 1 and self.indent_stack[-1] > current_indent:
                 self.indent_stack.pop()
-                self.tokens.append(('tk_dedent', self.line, self.column))
+                self.tokens.append(DEDENT, self.line, self.column)
 
     def report_error(self, message="Error léxico"):
-        """Almacena un mensaje de error léxico sin escribirlo inmediatamente."""
-        if not self.error_reported:
-            self.error_message = f">>> {message}(linea:{self.line},columna:{self.column})\n"
-            print(f"{message} reportado: linea:{self.line}, columna:{self.column}")  # Para depuración
+        """Almacena un mensaje de error léxico sin escribirlo inmediatamente.
+
+        El análisis se detiene al llegar a `max_errors` errores; antes de eso, quien reporta
+        el error salta el carácter inválido y el análisis continúa.
+        """
+        if not self.halted:
+            self.error_message += f">>> {message}(linea:{self.line},columna:{self.column})\n"
+            if not self.error_reported:
+                self.diagnostic = (self.line, self.column, message)
+            self.diagnostics.append((self.line, self.column, message))
+            if self.verbose:
+                print(f"{message} reportado: linea:{self.line}, columna:{self.column}")  # Para depuración
             self.error_reported = True
+            self.halted = self.max_errors is not None and len(self.diagnostics) >= self.max_errors
 
     def write_output(self):
-        """Muestra los tokens y el mensaje de error (si existe) en pantalla y archivo."""
-        with open('output.txt', 'a') as output_file:
-            for token in self.tokens:
-                if isinstance(token, tuple):
-                    if len(token) == 4:
-                        token_str = f"<{token[0]},{token[1]},{token[2]},{token[3]}>"
-                    elif len(token) == 3:
-                        token_str = f"<{token[0]},{token[1]},{token[2]}>"
-                    output_file.write(token_str + '\n')
-                    print(token_str)
+        """Entrega los tokens y el mensaje de error (si existe) al destino de salida."""
+        try:
+            self.sink.write_tokens(self.tokens)
             if self.error_message:
-                output_file.write(self.error_message)
-                print(self.error_message)
+                self.sink.write_errors(self.error_message)
+        finally:
+            self.sink.close()
 
     def tokenize_identifier(self):
         """Tokeniza identificadores y palabras reservadas."""
@@ -194,9 +260,10 @@ class Lexer:
                 break
         identifier = self.code[start_pos:self.position]
         if is_reserved_word(identifier):
-            self.tokens.append((identifier, self.line, start_column))
+            self.tokens.append(TOKEN_IDS[identifier], self.line, start_column)
         else:
-            self.tokens.append(("id", identifier, self.line, start_column))
+            self.tokens.append(ID, self.line, start_column, start_pos, self.position,
+                               self.symbols.intern(identifier))
 
     def tokenize_number(self):
         """Tokeniza números enteros y maneja errores léxicos si un número es seguido por caracteres inválidos."""
@@ -208,49 +275,32 @@ class Lexer:
                 self.advance()
             else:
                 break
-        number = self.code[start_pos:self.position]
-        self.tokens.append(("tk_entero", number, self.line, start_column))
+        self.tokens.append(INTEGER, self.line, start_column, start_pos, self.position,
+                           self.symbols.intern(self.code[start_pos:self.position]))
 
         # Después de tokenizar el número, verificar si hay caracteres no válidos
         char = self.peek()
         if char is not None and (char.isalpha() or char == '_'):
             self.report_error()
+            if not self.halted:
+                self.advance()  # Saltar el carácter inválido
 
     def tokenize_operator(self):
-        """Tokeniza operadores de uno, dos o tres caracteres."""
-        start_column = self.column
-        char = self.peek()
-
-        # Verifica si hay uno o dos caracteres después del operador actual
-        next_char = self.peek(1)
-        next_next_char = self.peek(2)
-
-        # Combinaciones de tres caracteres para operadores triples (e.g. //=, **=, etc.)
-        combined_three = char + (next_char or '') + (next_next_char or '')
-        if combined_three in OPERATORS:
-            token_name = OPERATORS[combined_three]
-            self.tokens.append((token_name, self.line, start_column))
-            self.advance()
-            self.advance()
-            self.advance()
-            return
-
-        # Combinaciones de dos caracteres para operadores dobles (e.g. +=, ==, etc.)
-        combined_two = char + (next_char or '')
-        if combined_two in OPERATORS:
-            token_name = OPERATORS[combined_two]
-            self.tokens.append((token_name, self.line, start_column))
-            self.advance()
-            self.advance()
-            return
-
-        # Operador de un solo carácter
-        if char in OPERATORS:
-            token_name = OPERATORS[char]
-            self.tokens.append((token_name, self.line, start_column))
+        """Tokeniza el operador más largo (de uno, dos o tres caracteres) que empieza en la posición actual."""
+        position = self.position
+        if self.stream is not None:
+            self.fill(position + 2)  # En modo perezoso, asegura que los caracteres siguientes estén leídos
+        # Se compara en el código sin construir cadenas (ver tokens.OPERATOR_MATCHES)
+        for operator, length, kind in OPERATOR_MATCHES.get(self.code[position], ()):
+            if self.code.startswith(operator, position):
+                self.tokens.append(kind, self.line, self.column)
+                # Ningún operador contiene saltos de línea: basta con avanzar la posición y la columna
+                self.position += length
+                self.column += length
+                return
+        self.report_error()
+        if not self.halted:
             self.advance()
-        else:
-            self.report_error()
 
     def tokenize_delimiter(self):
         """Tokeniza delimitadores sin manejar el balanceo de símbolos."""
@@ -258,10 +308,20 @@ class Lexer:
         char = self.peek()
         token_name = DELIMITERS.get(char, None)
         if token_name:
-            self.tokens.append((token_name, self.line, start_column))
+            self.tokens.append(TOKEN_IDS[token_name], self.line, start_column)
             self.advance()
         else:
             self.report_error()
+            if not self.halted:
+                self.advance()
+
+    def tokenize_quoted(self):
+        """Tokeniza una cadena, o ignora un comentario multilínea si empieza con tres comillas iguales."""
+        char = self.peek()
+        if self.peek(1) == char and self.peek(2) == char:
+            self.tokenize_multiline_comment()
+        else:
+            self.tokenize_string()
 
     def tokenize_string(self):
         """Tokeniza cadenas de texto."""
@@ -269,7 +329,7 @@ class Lexer:
         start_column = self.column
         quote_char = self.peek()
         self.advance()
-        string_content = ""
+        content_start = self.position  # El contenido es la rebanada hasta la comilla de cierre
         while True:
             current_char = self.peek()
             if current_char is None:
@@ -280,15 +340,13 @@ class Lexer:
                 return
             if current_char == quote_char:
                 self.advance()
-                self.tokens.append(("tk_string", string_content, start_line, start_column))
+                self.tokens.append(STRING, start_line, start_column, content_start, self.position - 1)
                 return
             if current_char == '\n':
                 self.advance()
                 self.line += 1
                 self.column = 1
-                string_content += '\n'
             else:
-                string_content += current_char
                 self.advance()
                 self.column += 1
 
@@ -1,29 +1,171 @@
 # main.py
 
-from lexer import Lexer
-from parser import Parser
+import time
+
+STARTED = time.perf_counter()  # Antes de las demás importaciones, para medirlas con --time-startup
+
+import argparse
+import sys
+
+from instrumentation import Metrics, instrument_lexer, instrument_parser, no_phase, record_parse, record_tokens
+from lexer import ENGINES, create_lexer
+
+# Los módulos que no siempre se usan (parser, sinks, mapped_lexer...) se importan recién al necesitarlos:
+# en ejecuciones cortas el arranque es la mayor parte del tiempo
+
+def main(debug=False, engine='char', max_errors=1, metrics=None, timer=None, fused=False, jobs=None):
+    # Con métricas (--metrics) se instrumentan el lexer y el parser y se mide cada fase
+    # Con `timer` (--time-startup) solo se mide cada fase
+    timer = metrics if metrics is not None else timer
+    phase = timer.phase if timer is not None else no_phase
 
-def main():
     # Leer archivo de entrada
+    # Con el motor 'mmap' el archivo se mapea en memoria y se analiza sin decodificarlo
     input_file = 'codigo_fuente.py'
-    with open(input_file, 'r') as file:
-        code = file.read()
-    
+    with phase('read'):
+        if engine == 'mmap':
+            from mapped_lexer import map_source
+            code = map_source(input_file)
+        else:
+            with open(input_file, 'r') as file:
+                code = file.read()
+
     # Crear el analizador léxico y tokenizar el código
-    lexer = Lexer(code)
-    lexer.tokenize()  # Los tokens se manejan internamente y se escriben en 'output.txt'
+    # En modo depuración los tokens se vuelcan en 'output.txt' y se muestran en pantalla
+    # Con max_errors > 1 el lexer salta los caracteres inválidos y continúa
+    # Con jobs > 1 y el motor 'char' las regiones del archivo se analizan en paralelo (ver parallel_lexer.py)
+    sink = None
+    if debug:
+        from sinks import TextSink
+        sink = TextSink('output.txt', echo=True)
+    if jobs is not None and jobs > 1 and engine == 'char':
+        from parallel_lexer import ParallelLexer
+        lexer = ParallelLexer(code, jobs=jobs, sink=sink, max_errors=max_errors)
+    else:
+        lexer = create_lexer(code, engine, sink=sink, max_errors=max_errors)
+    if metrics is not None:
+        instrument_lexer(lexer, metrics)
+    if fused:
+        return main_fused(lexer, max_errors, metrics, timer)
+    with phase('lex'):
+        tokens = lexer.tokenize()
+    if metrics is not None:
+        record_tokens(metrics, tokens)
 
-    # Verificar si hubo un error léxico
-    if lexer.error_reported:
+    # Verificar si el análisis léxico se detuvo por un error
+    if lexer.halted:
         print("Se encontró un error léxico. El análisis sintáctico no se realizará.")
         return
 
-    # Crear el parser y realizar el análisis sintáctico
+    # Crear el parser y realizar el análisis sintáctico sobre los tokens en memoria
+    # La gramática se carga solo aquí, cuando el análisis léxico no se detuvo
+    from parser import Grammar, Parser
     grammar_file = 'gramatica.txt'  # Asegúrate de que este archivo existe y contiene la gramática
-    tokens_file = 'output.txt'      # Archivo generado por el lexer
 
-    parser = Parser(grammar_file, tokens_file)
-    parser.parse()
+    remaining = None if max_errors is None else max_errors - len(lexer.diagnostics)
+    parser = Parser.from_tokens(Grammar(grammar_file, metrics=timer), tokens, max_errors=remaining)
+    if metrics is not None:
+        instrument_parser(parser)
+    with phase('parse'):
+        parser.parse()
+    if metrics is not None:
+        record_parse(metrics, parser)
+
+def main_fused(lexer, max_errors=1, metrics=None, timer=None):
+    # Análisis en una sola pasada (--fused): el parser pide los tokens al lexer a medida que los necesita,
+    # así que el análisis léxico se detiene en cuanto falla el sintáctico
+    phase = timer.phase if timer is not None else no_phase
+    from parser import Grammar, Parser
+    grammar_file = 'gramatica.txt'
+
+    parser = Parser.from_lexer(Grammar(grammar_file, metrics=timer), lexer, max_errors=max_errors)
+    if metrics is not None:
+        instrument_parser(parser)
+    with phase('parse'):
+        parser.parse()
+    if metrics is not None:
+        record_parse(metrics, parser)
+    if lexer.halted:
+        print("Se encontró un error léxico. El análisis sintáctico se detuvo.")
+
+def analyze_many(paths, grammar_file='gramatica.txt', jobs=None, engine='char', report_file=None, max_errors=1,
+                 metrics=None, cache=None, fused=False):
+    """Analiza varios archivos en paralelo y muestra un resumen agregado."""
+    from driver import OK, IO_ERROR, LEXICAL_ERROR, SYNTAX_ERROR, analyze_paths, format_result
+
+    report = analyze_paths(paths, grammar_file, jobs=jobs, engine=engine, max_errors=max_errors, metrics=metrics,
+                           cache=cache, fused=fused)
+    for result in report['results']:
+        if result['status'] != OK:
+            print(format_result(result))
+    print(f"Archivos analizados: {report['files']}, correctos: {report[OK]}, "
+          f"errores léxicos: {report[LEXICAL_ERROR]}, errores sintácticos: {report[SYNTAX_ERROR]}, "
+          f"errores de lectura: {report[IO_ERROR]}")
+    if cache is not None:
+        print(f"Resultados reutilizados de la caché: {report['cached']}")
+
+    if report_file:
+        import json
+        with open(report_file, 'w') as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+    return report
+
+def report_startup(imported, timer):
+    """Muestra en la salida de errores el tiempo de las importaciones, de cada fase y el total desde el arranque."""
+    parts = [f"importación {(imported - STARTED) * 1000:.2f} ms"]
+    parts += [f"{name} {seconds * 1000:.2f} ms" for name, seconds in timer.phases.items()]
+    parts.append(f"total {(time.perf_counter() - STARTED) * 1000:.2f} ms")
+    print("Tiempo de arranque: " + ", ".join(parts), file=sys.stderr)
 
 if __name__ == "__main__":
-    main()
+    arg_parser = argparse.ArgumentParser(description="Analizador léxico y sintáctico.")
+    arg_parser.add_argument('paths', nargs='*',
+                            help="archivos, directorios o patrones glob a analizar (por defecto: codigo_fuente.py)")
+    arg_parser.add_argument('--debug', action='store_true',
+                            help="vuelca los tokens en 'output.txt' y los muestra en pantalla")
+    arg_parser.add_argument('--engine', choices=ENGINES, default='char',
+                            help="motor del análisis léxico; 'mmap' analiza el archivo mapeado en memoria (por defecto: char)")
+    arg_parser.add_argument('--grammar', default='gramatica.txt',
+                            help="archivo de gramática para el análisis de varios archivos")
+    arg_parser.add_argument('--jobs', '-j', type=int, default=None,
+                            help="procesos para el análisis de varios archivos (por defecto: uno por núcleo) o, "
+                                 "con un solo archivo y el motor 'char', para su análisis léxico por regiones")
+    arg_parser.add_argument('--report', metavar='ARCHIVO',
+                            help="guarda el reporte agregado en formato JSON")
+    arg_parser.add_argument('--max-errors', type=int, default=1, metavar='N',
+                            help="errores a reportar por archivo antes de detenerse (0: sin límite; por defecto: 1)")
+    arg_parser.add_argument('--metrics', metavar='ARCHIVO',
+                            help="guarda métricas del análisis (ramas del lexer, tokens, producciones, tiempos)")
+    arg_parser.add_argument('--metrics-format', choices=('json', 'prometheus'), default='json',
+                            help="formato de las métricas (por defecto: json)")
+    arg_parser.add_argument('--result-cache', nargs='?', const='', metavar='DIRECTORIO',
+                            help="reutiliza los resultados de los archivos que no cambiaron en el análisis de varios "
+                                 "archivos (por defecto: ~/.cache/analizador/results)")
+    arg_parser.add_argument('--result-cache-size', type=int, default=256, metavar='MIB',
+                            help="tamaño máximo de la caché de resultados en MiB (por defecto: 256)")
+    arg_parser.add_argument('--fused', action='store_true',
+                            help="analiza en una sola pasada: el lexer avanza a medida que el parser pide tokens")
+    arg_parser.add_argument('--time-startup', action='store_true',
+                            help="muestra el tiempo de las importaciones y de cada fase hasta terminar el análisis")
+    args = arg_parser.parse_args()
+    if args.fused and args.debug:
+        arg_parser.error("--fused no se puede combinar con --debug: los tokens no se acumulan")
+    imported = time.perf_counter()
+    max_errors = args.max_errors or None
+    metrics = Metrics() if args.metrics else None
+    timer = Metrics() if args.time_startup else None
+    if args.paths:
+        cache = None
+        if args.result_cache is not None:
+            from result_cache import DEFAULT_RESULT_CACHE_DIR, ResultCache
+            cache = ResultCache(args.result_cache or DEFAULT_RESULT_CACHE_DIR, args.result_cache_size * 1024 * 1024)
+        analyze_many(args.paths, args.grammar, jobs=args.jobs, engine=args.engine, report_file=args.report,
+                     max_errors=max_errors, metrics=metrics, cache=cache, fused=args.fused)
+    else:
+        main(debug=args.debug, engine=args.engine, max_errors=max_errors, metrics=metrics, timer=timer,
+             fused=args.fused, jobs=args.jobs)
+    if timer is not None:
+        report_startup(imported, metrics or timer)
+    if metrics is not None:
+        with open(args.metrics, 'w') as file:
+            file.write(metrics.to_json() if args.metrics_format == 'json' else metrics.to_prometheus())
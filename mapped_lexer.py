@@ -0,0 +1,68 @@
+# mapped_lexer.py
+
+import mmap
+import os
+import re
+from types import SimpleNamespace
+
+from regex_lexer import INDENT_PATTERN as TEXT_INDENT_PATTERN, MASTER_PATTERN as TEXT_MASTER_PATTERN, RegexLexer
+from tokens import DELIMITERS, OPERATORS, TOKEN_IDS, RESERVED_IDS
+
+# Las mismas expresiones de RegexLexer, compiladas para recorrer bytes
+MASTER_PATTERN = re.compile(TEXT_MASTER_PATTERN.pattern.encode('ascii'))
+INDENT_PATTERN = re.compile(TEXT_INDENT_PATTERN.pattern.encode('ascii'))
+NON_ASCII_PATTERN = re.compile(rb'[\x80-\xff]')
+
+# Tipo de token (entero) de cada palabra reservada y operador en bytes, y de cada delimitador por su byte
+RESERVED_BYTE_IDS = {word.encode('ascii'): kind for word, kind in RESERVED_IDS.items()}
+OPERATOR_BYTE_KINDS = {op.encode('ascii'): TOKEN_IDS[name] for op, name in OPERATORS.items()}
+DELIMITER_BYTE_KINDS = {ord(char): TOKEN_IDS[name] for char, name in DELIMITERS.items()}
+
+# Versión en bytes de regex_lexer.TEXT_SYNTAX: indexar bytes o un mmap retorna enteros. El código ya no
+# tiene bytes fuera de ASCII (ver MappedLexer.scan), así que ningún byte supera `last_ascii`
+BYTE_SYNTAX = SimpleNamespace(
+    master=MASTER_PATTERN,
+    indent=INDENT_PATTERN,
+    word=re.compile(rb'\w').match,
+    reserved=RESERVED_BYTE_IDS,
+    operators=OPERATOR_BYTE_KINDS,
+    delimiters=DELIMITER_BYTE_KINDS,
+    newline=ord('\n'),
+    backslash=ord('\\'),
+    last_ascii=0x7f,
+    decode=bytes.decode,
+)
+
+
+def map_source(path):
+    """Mapea un archivo en memoria en modo de solo lectura, sin leerlo ni decodificarlo.
+
+    Un archivo vacío no se puede mapear: en ese caso se retornan bytes vacíos.
+    """
+    with open(path, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return b''
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class MappedLexer(RegexLexer):
+    """Lexer que recorre directamente los bytes del código (p. ej. un mmap de map_source) sin decodificarlo.
+
+    Los tokens guardan desplazamientos en bytes y el TokenBuffer retiene el mmap como código fuente:
+    los lexemas solo se decodifican al pedirlos (TokenBuffer.lexeme), así que la memoria usada es
+    prácticamente la del TokenBuffer. Produce los mismos tokens que Lexer. Las columnas cuentan
+    caracteres, por lo que un código con bytes fuera de ASCII se decodifica una vez y se analiza
+    como RegexLexer; lo mismo ocurre si el código ya es un str.
+    """
+
+    def scan(self):
+        """Recorre los bytes con la expresión maestra agregando tokens a `self.tokens`."""
+        code = self.code
+        if isinstance(code, str) or self.stream is not None:
+            yield from super().scan()
+            return
+        if NON_ASCII_PATTERN.search(code):
+            self.code = self.tokens.source = str(code, 'utf-8')
+            yield from super().scan()
+            return
+        yield from self.scan_code(BYTE_SYNTAX)
@@ -0,0 +1,166 @@
+# parallel_lexer.py
+
+import os
+import re
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from lexer import Lexer
+from tokens import NEWLINE
+
+# Tamaño mínimo (en caracteres) de cada región analizada en paralelo; un código menor que dos regiones
+# se analiza de forma secuencial
+MIN_REGION = 64 * 1024
+
+# Regiones por proceso: con más regiones que procesos la carga se reparte mejor si difieren en costo
+REGIONS_PER_JOB = 4
+
+# Salto de línea seguido de una línea no vacía y sin sangría, inicio de comentario o comilla (ver split_points)
+SPLIT_PATTERN = re.compile(r'\n(?=[^ \t\f\n])|#|["\']')
+
+_worker_code = ''  # Código completo de cada proceso trabajador (ver init_worker)
+
+
+def split_points(code, parts):
+    """Retorna desplazamientos crecientes en los que el código se puede dividir en hasta `parts` regiones
+    de tamaño parecido que se analizan de forma independiente.
+
+    Cada punto es el inicio de una línea no vacía y sin sangría (en una línea vacía Lexer no cierra la
+    sangría pendiente), fuera de cadenas, comentarios y comentarios multilínea, cuya línea anterior
+    no termina en barra invertida. Ahí el estado de Lexer no depende
+    del texto anterior salvo por el número de línea: el último token es tk_newline y los tk_dedent
+    que cierran la sangría pendiente son los mismos que emite el fin de la región anterior.
+    """
+    points = []
+    step = len(code) // parts
+    target = step
+    pos = 0
+    search = SPLIT_PATTERN.search
+    while len(points) < parts - 1:
+        match = search(code, pos)
+        if match is None:
+            break
+        start = match.start()
+        char = code[start]
+        if char == '\n':
+            pos = start + 1
+            if pos >= target and code[start - 1:start] != '\\':
+                points.append(pos)
+                target = pos + step
+        elif char == '#':
+            pos = code.find('\n', start)  # El comentario termina en el salto de línea, que se busca después
+            if pos == -1:
+                break
+        else:
+            # Cadena o comentario multilínea: se salta hasta su cierre, como Lexer (sin secuencias de escape)
+            delimiter = char * 3 if code.startswith(char * 3, start) else char
+            close = code.find(delimiter, start + len(delimiter))
+            if close == -1:
+                break
+            pos = close + len(delimiter)
+    return points
+
+
+def lex_region(code, max_errors, offset=0):
+    """Analiza una región con Lexer y retorna sus tokens (con los lexemas desplazados en `offset`), su tabla
+    de símbolos y su estado final, con las líneas relativas al inicio de la región."""
+    lexer = Lexer(code, verbose=False, max_errors=max_errors)
+    tab_error = False
+    try:
+        lexer.tokenize()
+    except TabError:
+        tab_error = True
+    tokens = lexer.tokens
+    starts, ends = tokens.starts, tokens.ends
+    if offset:
+        # Los tokens sin lexema conservan -1
+        starts = array('i', [start + offset if start >= 0 else start for start in starts])
+        ends = array('i', [end + offset if end >= 0 else end for end in ends])
+    return {'kinds': tokens.kinds, 'lines': tokens.lines, 'columns': tokens.columns, 'starts': starts,
+            'ends': ends, 'symbols': tokens.symbols, 'symbol_names': lexer.symbols.names,
+            'symbol_counts': lexer.symbols.counts, 'line': lexer.line, 'column': lexer.column,
+            'position': lexer.position, 'diagnostics': lexer.diagnostics, 'halted': lexer.halted,
+            'tab_error': tab_error}
+
+
+def init_worker(code):
+    """Inicializa un proceso trabajador con el código completo; con 'fork' se hereda sin serializarse."""
+    global _worker_code
+    _worker_code = code
+
+
+def lex_worker_region(start, stop, max_errors):
+    """Analiza la región [start, stop) del código dentro de un proceso trabajador."""
+    return lex_region(_worker_code[start:stop], max_errors, start)
+
+
+class ParallelLexer(Lexer):
+    """Lexer que divide un código grande en regiones independientes (ver split_points), las analiza en un
+    pool de `jobs` procesos y une sus tokens en el orden del código.
+
+    Produce los mismos tokens, diagnósticos y errores que Lexer: las líneas de cada región se desplazan
+    según la línea en que termina la anterior, y si una región agota el límite de errores se vuelve a
+    analizar con el límite que le queda y las siguientes se descartan. Los códigos pequeños, los flujos
+    de entrada (iter_tokens) y jobs=1 se analizan como Lexer. Las métricas de instrumentation solo
+    cuentan las ramas del análisis secuencial.
+    """
+
+    def __init__(self, code='', jobs=None, **kwargs):
+        super().__init__(code, **kwargs)
+        self.jobs = jobs or os.cpu_count() or 1
+
+    def scan(self):
+        """Analiza las regiones en paralelo agregando sus tokens a `self.tokens`; cede el control al terminar."""
+        code = self.code
+        parts = min(self.jobs * REGIONS_PER_JOB, len(code) // MIN_REGION) if isinstance(code, str) else 0
+        sequential = self.jobs == 1 or parts < 2 or self.stream is not None or self.position != 0
+        points = [] if sequential else split_points(code, parts)
+        if not points:
+            yield from super().scan()
+            return
+
+        from driver import pool_context
+        bounds = list(zip([0] + points, points + [len(code)]))
+        with ProcessPoolExecutor(max_workers=self.jobs, mp_context=pool_context(), initializer=init_worker,
+                                 initargs=(code,)) as executor:
+            futures = [executor.submit(lex_worker_region, start, stop, self.max_errors) for start, stop in bounds]
+            try:
+                for (start, stop), future in zip(bounds, futures):
+                    region = future.result()
+                    remaining = None if self.max_errors is None else self.max_errors - len(self.diagnostics)
+                    if remaining is not None and len(region['diagnostics']) >= remaining:
+                        # El análisis secuencial se detiene dentro de esta región
+                        region = lex_region(code[start:stop], remaining, start)
+                    if not self.append_region(region, start):
+                        break
+            finally:
+                for future in futures:
+                    future.cancel()
+        yield
+
+    def append_region(self, region, start):
+        """Agrega los tokens y errores de una región analizada, ajustando sus líneas y pasando sus símbolos a
+        la tabla del lexer; retorna False si el análisis se detiene en ella. Un error de sangría se vuelve a
+        lanzar con la línea del código completo."""
+        line_offset = self.line - 1  # Las líneas de la región empiezan en 1
+        tokens = self.tokens
+        if region['kinds']:
+            tokens.kinds.extend(region['kinds'])
+            tokens.lines.extend(array('i', map(line_offset.__add__, region['lines'])))
+            tokens.columns.extend(region['columns'])
+            tokens.starts.extend(region['starts'])
+            tokens.ends.extend(region['ends'])
+            remap = self.symbols.merge(region['symbol_names'], region['symbol_counts'])
+            tokens.symbols.extend(array('i', [remap[symbol] if symbol >= 0 else -1 for symbol in region['symbols']]))
+        for line, column, message in region['diagnostics']:
+            self.line, self.column = line + line_offset, column
+            self.report_error(message)
+        self.line = region['line'] + line_offset
+        self.column = region['column']
+        self.position = start + region['position']
+        if region['tab_error']:
+            raise TabError(f"Inconsistent use of tabs and spaces for indentation at line {self.line}")
+        if not region['kinds'] and tokens and tokens.kinds[-1] != NEWLINE:
+            # Región sin tokens tras los tk_dedent de la anterior: el fin del archivo agrega el tk_newline
+            tokens.append(NEWLINE, self.line, self.column)
+        return not self.halted
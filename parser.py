@@ -1,9 +1,44 @@
 # parser.py
 
+import hashlib
+import importlib
+import marshal
+from array import array
+import os
 import sys
+from itertools import chain, repeat
+
+from instrumentation import no_phase
+from lexer import create_lexer
+from syntax_tree import SyntaxTree
+from tokens import HAS_LEXEME, TOKEN_NAMES, TokenBuffer
+
+# Versión del formato de las tablas en caché; cambiarla invalida los archivos ya guardados
+TABLE_FORMAT_VERSION = 1
+
+# Directorio de la caché de tablas LL(1); ANALIZADOR_CACHE_DIR='' desactiva la caché
+DEFAULT_CACHE_DIR = os.environ.get('ANALIZADOR_CACHE_DIR',
+                                   os.path.join(os.path.expanduser('~'), '.cache', 'analizador'))
+
+# Módulo de tablas precalculadas que Grammar importa antes de consultar la caché (ver codegen.py --tables)
+TABLE_MODULE = 'grammar_tables'
+
+# Tokens consumidos que el análisis en una pasada acumula antes de descartarlos (ver Parser.lexer_columns)
+DISCARD_SIZE = 4096
+
+# Atributos de Grammar que se guardan en la caché (y, en mayúsculas, en el módulo de tablas)
+CACHED_FIELDS = ('rules', 'terminals', 'non_terminals', 'first_sets', 'follow_sets',
+                 'prediction_sets', 'parse_table', 'start_symbol')
+
+def grammar_text_hash(content):
+    """Calcula el hash del texto (en bytes) de una gramática y del formato de las tablas."""
+    digest = hashlib.sha256(f"ll1-v{TABLE_FORMAT_VERSION}\n".encode())
+    digest.update(content)
+    return digest.hexdigest()
 
 class Grammar:
-    def __init__(self, grammar_file):
+    def __init__(self, grammar_file, cache_dir=DEFAULT_CACHE_DIR, metrics=None, table_module=TABLE_MODULE):
+        phase = metrics.phase if metrics is not None else no_phase  # Tiempo de cada fase (ver instrumentation)
         self.rules = {}
         self.terminals = set()
         self.non_terminals = []
@@ -11,12 +46,112 @@ class Grammar:
         self.follow_sets = {}
         self.prediction_sets = {}
         self.parse_table = {}
+        # Las tablas guardadas se construyeron con build_parse_table(strict=True), así que no tienen conflictos
+        self.conflicts = {}
         self.start_symbol = None
-        self.read_grammar(grammar_file)
-        self.compute_first_sets()
-        self.compute_follow_sets()
-        self.compute_prediction_sets()
-        self.build_parse_table()
+        self.grammar_hash = self.compute_grammar_hash(grammar_file)
+        loaded = False
+        if table_module:
+            with phase('load_table_module'):
+                loaded = self.load_table_module(table_module)
+        if cache_dir and not loaded:
+            with phase('load_tables'):
+                loaded = self.load_tables(cache_dir)
+        if not loaded:
+            with phase('read_grammar'):
+                self.read_grammar(grammar_file)
+            with phase('first_sets'):
+                self.compute_first_sets()
+            with phase('follow_sets'):
+                self.compute_follow_sets()
+            with phase('parse_table'):
+                self.compute_prediction_sets()
+                self.build_parse_table()
+            if cache_dir:
+                with phase('save_tables'):
+                    self.save_tables(cache_dir)
+        with phase('compile_tables'):
+            self.compile_tables()
+
+    @classmethod
+    def from_rules(cls, rules, start_symbol, strict=True):
+        """Construye las tablas de una gramática dada como diccionario no terminal -> producciones, sin
+        leer archivos ni usar la caché (ver grammar_analysis.py). Con strict=False los conflictos LL(1)
+        se guardan en `conflicts` en lugar de detener el programa."""
+        grammar = cls.__new__(cls)
+        grammar.rules = {nt: [list(production) for production in productions] for nt, productions in rules.items()}
+        grammar.terminals = set()
+        grammar.non_terminals = list(grammar.rules)
+        grammar.first_sets = {}
+        grammar.follow_sets = {}
+        grammar.prediction_sets = {}
+        grammar.parse_table = {}
+        grammar.conflicts = {}
+        grammar.start_symbol = start_symbol
+        # Mismo hash que tendría la gramática guardada con format_rules()
+        grammar.grammar_hash = grammar_text_hash(grammar.format_rules().encode('utf-8'))
+        grammar.find_terminals()
+        grammar.compute_first_sets()
+        grammar.compute_follow_sets()
+        grammar.compute_prediction_sets()
+        grammar.build_parse_table(strict)
+        grammar.compile_tables()
+        return grammar
+
+    def format_rules(self):
+        """Retorna el texto de la gramática en el formato de gramatica.txt, una regla por no terminal."""
+        return ''.join(f"{nt} -> {' | '.join(' '.join(production) for production in productions)}\n"
+                       for nt, productions in self.rules.items())
+
+    def compute_grammar_hash(self, filename):
+        """Calcula el hash del contenido del archivo de gramática (y del formato de las tablas)."""
+        try:
+            with open(filename, 'rb') as f:
+                content = f.read()
+        except FileNotFoundError:
+            print(f"Error: El archivo de gramática '{filename}' no se encontró.")
+            sys.exit(1)
+        return grammar_text_hash(content)
+
+    def cache_path(self, cache_dir):
+        """Ruta del archivo de tablas en caché para esta gramática."""
+        return os.path.join(cache_dir, f"{self.grammar_hash}.ll1")
+
+    def load_tables(self, cache_dir):
+        """Carga las tablas precalculadas si existe un archivo en caché con el mismo hash."""
+        try:
+            with open(self.cache_path(cache_dir), 'rb') as f:
+                tables = marshal.loads(f.read())
+        except (OSError, EOFError, ValueError, TypeError):
+            return False  # No hay caché válida: se reconstruyen las tablas
+        for field in CACHED_FIELDS:
+            setattr(self, field, tables[field])
+        return True
+
+    def load_table_module(self, module_name):
+        """Toma las tablas del módulo precalculado si existe y fue generado a partir de esta misma gramática."""
+        try:
+            module = importlib.import_module(module_name)
+        except ImportError:
+            return False
+        if getattr(module, 'GRAMMAR_HASH', None) != self.grammar_hash:
+            return False  # Módulo desactualizado o de otra gramática
+        for field in CACHED_FIELDS:
+            setattr(self, field, getattr(module, field.upper()))
+        return True
+
+    def save_tables(self, cache_dir):
+        """Guarda las tablas calculadas en la caché (en formato marshal) de forma atómica."""
+        import tempfile  # Solo al escribir la caché: importarlo alarga el arranque de cada ejecución
+        tables = {field: getattr(self, field) for field in CACHED_FIELDS}
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                marshal.dump(tables, f)
+            os.replace(tmp_path, self.cache_path(cache_dir))
+        except OSError:
+            pass  # La caché es opcional: un directorio sin permisos no impide el análisis
 
     def read_grammar(self, filename):
         """Lee la gramática desde un archivo y la almacena en estructuras de datos."""
@@ -71,29 +206,144 @@ class Grammar:
                         self.rules[current_lhs] = []
                     # Filtrar producciones vacías
                     self.rules[current_lhs].extend([prod for prod in current_rhs if prod])
-                
-                # Identificar terminales y no terminales
-                for lhs, productions in self.rules.items():
-                    for prod in productions:
-                        for symbol in prod:
-                            if symbol.isupper():
-                                continue  # Es un no terminal
-                            elif symbol == 'ε':
-                                continue  # Epsilon
-                            else:
-                                self.terminals.add(symbol)
-                
-                self.terminals.add('$')  # Añadir el símbolo de fin de entrada
+
+                self.find_terminals()
 
         except FileNotFoundError:
             print(f"Error: El archivo de gramática '{filename}' no se encontró.")
             sys.exit(1)
 
+    def find_terminals(self):
+        """Identifica los terminales de las producciones y añade el símbolo de fin de entrada."""
+        for lhs, productions in self.rules.items():
+            for prod in productions:
+                for symbol in prod:
+                    if symbol.isupper():
+                        continue  # Es un no terminal
+                    elif symbol == 'ε':
+                        continue  # Epsilon
+                    else:
+                        self.terminals.add(symbol)
+
+        self.terminals.add('$')  # Añadir el símbolo de fin de entrada
+
 
 
 
+    def symbol_bits(self):
+        """Asigna un bit a cada símbolo que puede aparecer en PRIMERO o SIGUIENTE (terminales, ε y
+        símbolos sin definir, que se tratan como terminales) y retorna el diccionario símbolo -> bit."""
+        symbols = sorted(self.terminals)
+        symbols.append('ε')
+        for productions in self.rules.values():
+            for production in productions:
+                symbols.extend(symbol for symbol in production if symbol not in self.rules)
+        return {symbol: 1 << idx for idx, symbol in enumerate(dict.fromkeys(symbols))}
+
+    def bits_to_set(self, bits, symbol_bits):
+        """Convierte un conjunto de bits en el conjunto de símbolos correspondiente."""
+        return {symbol for symbol, bit in symbol_bits.items() if bits & bit}
+
     def compute_first_sets(self):
-        """Calcula los conjuntos PRIMERO para cada no terminal."""
+        """Calcula los conjuntos PRIMERO para cada no terminal.
+
+        Los conjuntos son enteros usados como conjuntos de bits. Un no terminal solo se recalcula
+        cuando cambia el PRIMERO de alguno de los no terminales de los que depende (los que pueden
+        iniciar alguna de sus producciones), usando una lista de trabajo.
+        """
+        rules = self.rules
+        self.set_bits = bits = self.symbol_bits()
+        epsilon = bits['ε']
+        dependents = {nt: set() for nt in rules}
+        for nt, productions in rules.items():
+            for production in productions:
+                for symbol in production:
+                    if symbol not in rules:
+                        break
+                    dependents[symbol].add(nt)
+
+        first = dict.fromkeys(rules, 0)
+        worklist = list(reversed(self.non_terminals))
+        pending = set(worklist)
+        while worklist:
+            nt = worklist.pop()
+            pending.discard(nt)
+            value = first[nt]
+            for production in rules[nt]:
+                for symbol in production:
+                    if symbol in rules:
+                        value |= first[symbol] & ~epsilon
+                        if not first[symbol] & epsilon:
+                            break
+                    else:
+                        value |= bits[symbol]  # Terminal, ε o símbolo sin definir
+                        break
+                else:
+                    value |= epsilon
+            if value != first[nt]:
+                first[nt] = value
+                for dependent in dependents[nt]:
+                    if dependent not in pending:
+                        pending.add(dependent)
+                        worklist.append(dependent)
+
+        self.first_bits = first
+        self.first_sets = {nt: self.bits_to_set(first[nt], bits) for nt in self.non_terminals}
+
+    def compute_follow_sets(self):
+        """Calcula los conjuntos SIGUIENTE para cada no terminal.
+
+        Cada aparición de un no terminal B en A -> α B β aporta a SIGUIENTE(B) una parte fija
+        (PRIMERO(β) sin ε) y, si β puede ser vacía, todo SIGUIENTE(A). Primero se reúnen las partes
+        fijas y las aristas A -> B, y luego SIGUIENTE se propaga por las aristas con una lista de trabajo.
+        Requiere compute_first_sets.
+        """
+        rules = self.rules
+        bits = self.set_bits
+        first = self.first_bits
+        epsilon = bits['ε']
+        follow = dict.fromkeys(rules, 0)
+        follow[self.start_symbol] = bits['$']
+        successors = {nt: set() for nt in rules}
+        for nt, productions in rules.items():
+            for production in productions:
+                trailer = 0
+                inherits = True  # El sufijo visto hasta ahora puede ser vacío
+                for symbol in reversed(production):
+                    if symbol in rules:
+                        follow[symbol] |= trailer
+                        if inherits and symbol != nt:
+                            successors[nt].add(symbol)
+                        if first[symbol] & epsilon:
+                            trailer |= first[symbol] & ~epsilon
+                        else:
+                            trailer = first[symbol]
+                            inherits = False
+                    else:
+                        # Un terminal corta el sufijo; ε y los símbolos sin definir lo dejan vacío
+                        trailer = bits[symbol] if symbol in self.terminals else 0
+                        inherits = False
+
+        worklist = list(reversed(self.non_terminals))
+        pending = set(worklist)
+        while worklist:
+            nt = worklist.pop()
+            pending.discard(nt)
+            value = follow[nt]
+            for successor in successors[nt]:
+                if value & ~follow[successor]:
+                    follow[successor] |= value
+                    if successor not in pending:
+                        pending.add(successor)
+                        worklist.append(successor)
+
+        self.follow_sets = {nt: self.bits_to_set(follow[nt], bits) for nt in self.non_terminals}
+
+    def compute_first_sets_naive(self):
+        """Calcula los conjuntos PRIMERO iterando sobre todas las producciones hasta que no cambien.
+
+        Implementación de referencia para comparar con compute_first_sets (ver benchmarks).
+        """
         for nt in self.non_terminals:
             self.first_sets[nt] = set()
         changed = True
@@ -122,8 +372,11 @@ class Grammar:
                     if after > before:
                         changed = True
 
-    def compute_follow_sets(self):
-        """Calcula los conjuntos SIGUIENTE para cada no terminal."""
+    def compute_follow_sets_naive(self):
+        """Calcula los conjuntos SIGUIENTE iterando sobre todas las producciones hasta que no cambien.
+
+        Implementación de referencia para comparar con compute_follow_sets (ver benchmarks).
+        """
         for nt in self.non_terminals:
             self.follow_sets[nt] = set()
         self.follow_sets[self.start_symbol].add('$')
@@ -140,7 +393,7 @@ class Grammar:
                             if 'ε' in self.first_sets[symbol]:
                                 trailer.update(self.first_sets[symbol] - {'ε'})
                             else:
-                                trailer = self.first_sets[symbol]
+                                trailer = set(self.first_sets[symbol])  # Copia: trailer se modifica después
                             after = len(self.follow_sets[symbol])
                             if after > before:
                                 changed = True
@@ -162,7 +415,7 @@ class Grammar:
                         if symbol in self.terminals:
                             prediction_set.add(symbol)
                             break
-                        elif symbol in self.non_terminals:
+                        elif symbol in self.rules:
                             prediction_set.update(self.first_sets[symbol] - {'ε'})
                             if 'ε' not in self.first_sets[symbol]:
                                 break
@@ -173,16 +426,81 @@ class Grammar:
                         prediction_set.update(self.follow_sets[nt])
                 self.prediction_sets[nt].append((production, prediction_set))
 
-    def build_parse_table(self):
-        """Construye la tabla de análisis sintáctico LL(1)."""
+    def build_parse_table(self, strict=True):
+        """Construye la tabla de análisis sintáctico LL(1).
+
+        Los conflictos se acumulan en `conflicts` ((no terminal, terminal) -> producciones en conflicto) y la
+        celda conserva la primera producción; con `strict` se reportan todos juntos y el programa se detiene.
+        """
+        self.conflicts = {}
         for nt in self.non_terminals:
             for idx, (production, prediction_set) in enumerate(self.prediction_sets[nt]):
                 for terminal in prediction_set:
                     key = (nt, terminal)
                     if key in self.parse_table:
-                        print(f"Error: Gramática no es LL(1), conflicto en M[{nt}, {terminal}]")
-                        sys.exit(1)
+                        self.conflicts.setdefault(key, [self.parse_table[key]]).append(production)
+                        continue
                     self.parse_table[key] = production
+        if strict and self.conflicts:
+            for (nt, terminal), productions in self.conflicts.items():
+                alternatives = ' | '.join(' '.join(production) for production in productions)
+                print(f"Error: Gramática no es LL(1), conflicto en M[{nt}, {terminal}]: {alternatives}")
+            sys.exit(1)
+
+    def compile_tables(self):
+        """Codifica los símbolos como enteros y construye la tabla LL(1) densa que usa Parser.parse().
+
+        Los terminales (y cualquier otro símbolo que pueda aparecer como columna) reciben los IDs
+        0..n_terms-1; la columna extra `unknown_id` representa tokens que la gramática no conoce.
+        Los no terminales reciben los IDs n_terms..n_terms+len(non_terminals)-1, de modo que
+        `symbol >= n_terms` identifica un no terminal en la pila del parser.
+        La tabla es un array plano indexado por [(nt_id - n_terms) * n_columns + term_id] que guarda
+        el índice de la producción en `productions` (o -1), y cada producción es una tupla de IDs
+        ya invertida (lista para apilar) y sin ε.
+        """
+        columns = set(self.terminals)
+        columns.update(terminal for (_, terminal) in self.parse_table)
+        for productions in self.rules.values():
+            columns.update(symbol for production in productions for symbol in production
+                           if symbol not in self.rules and symbol != 'ε')
+        columns = sorted(columns)
+        self.n_terms = len(columns)
+        self.unknown_id = self.n_terms
+        self.n_columns = self.n_terms + 1
+        self.terminal_ids = {symbol: idx for idx, symbol in enumerate(columns)}
+        self.nonterminal_ids = {nt: self.n_terms + idx for idx, nt in enumerate(self.non_terminals)}
+        self.symbol_names = columns + self.non_terminals
+        # Solo los terminales de la gramática pueden emparejarse con un token
+        self.is_terminal = bytes(symbol in self.terminals for symbol in columns)
+        # Columna de cada tipo de token entero que produce el lexer (ver tokens.TOKEN_NAMES)
+        self.kind_columns = array('i', (self.terminal_ids.get(name, self.unknown_id) for name in TOKEN_NAMES))
+
+        def symbol_id(symbol):
+            if symbol in self.terminals:
+                return self.terminal_ids[symbol]
+            return self.nonterminal_ids.get(symbol, self.terminal_ids.get(symbol))
+
+        self.productions = []
+        production_index = {}
+        self.table = array('i', [-1]) * (len(self.non_terminals) * self.n_columns)
+        self.follow_columns = None  # Se calculan al primer error (ver sync_columns)
+        for (nt, terminal), production in self.parse_table.items():
+            key = id(production)
+            if key not in production_index:
+                production_index[key] = len(self.productions)
+                self.productions.append(tuple(symbol_id(symbol) for symbol in reversed(production)
+                                              if symbol != 'ε'))
+            row = (self.nonterminal_ids[nt] - self.n_terms) * self.n_columns
+            self.table[row + self.terminal_ids[terminal]] = production_index[key]
+        self.productions = tuple(self.productions)
+
+    def sync_columns(self, nt_id):
+        """Retorna las columnas de SIGUIENTE del no terminal `nt_id`, usadas para recuperarse de errores."""
+        if self.follow_columns is None:
+            self.follow_columns = [frozenset(self.terminal_ids[symbol] for symbol in self.follow_sets.get(nt, ())
+                                             if symbol in self.terminal_ids)
+                                   for nt in self.non_terminals]
+        return self.follow_columns[nt_id - self.n_terms]
 
     def print_sets(self):
         """Imprime los conjuntos PRIMERO y SIGUIENTE (opcional)."""
@@ -197,63 +515,462 @@ class Grammar:
             print(f"M[{key[0]}, {key[1]}] = {production}")
 
 class Parser:
-    def __init__(self, grammar_file, tokens_file):
+    def __init__(self, grammar_file, tokens_file, verbose=True, max_errors=1, build_tree=False):
         self.grammar = Grammar(grammar_file)
-        self.tokens = self.tokenize_from_file(tokens_file)
-        self.position = 0
-        self.current_token = self.tokens[self.position] if self.tokens else None
-        self.stack = ['$']
-        self.stack.append(self.grammar.start_symbol)
+        self.verbose = verbose  # Muestra el resultado del análisis en pantalla
+        self.max_errors = max_errors  # Errores tras los que se detiene el análisis (None: sin límite)
+        self.build_tree = build_tree  # Construye el árbol de sintaxis en `tree` (ver parse_tree)
+        self.set_tokens(self.tokenize_from_file(tokens_file))
+
+    @classmethod
+    def from_tokens(cls, grammar, tokens, verbose=True, max_errors=1, build_tree=False):
+        """Crea un parser que consume directamente los tokens del lexer, sin copiarlos ni pasar por archivo.
+
+        `grammar` puede ser una instancia de Grammar (para reutilizarla) o la ruta del archivo de gramática.
+        `tokens` es un TokenBuffer o cualquier iterable de tuplas (nombre, [lexema,] línea, columna).
+        """
+        parser = cls.__new__(cls)
+        parser.grammar = grammar if isinstance(grammar, Grammar) else Grammar(grammar)
+        parser.verbose = verbose
+        parser.max_errors = max_errors
+        parser.build_tree = build_tree
+        parser.set_tokens(tokens)
+        return parser
+
+    @classmethod
+    def from_lexer(cls, grammar, lexer, verbose=True, max_errors=1, build_tree=False):
+        """Crea un parser que analiza en una sola pasada: pide cada token al lexer cuando lo necesita
+        (ver lexer_columns), así que el análisis léxico avanza a la par del sintáctico y se detiene
+        con él. `lexer` es un analizador léxico recién creado (ver lexer.create_lexer), cuyo destino
+        de salida no recibe los tokens.
+        """
+        parser = cls.from_tokens(grammar, (), verbose, max_errors, build_tree)
+        parser.set_lexer(lexer)
+        return parser
+
+    def set_tokens(self, tokens):
+        """Prepara el estado del análisis para consumir los tokens de forma perezosa.
+
+        `tokens` puede ser un TokenBuffer (se recorre por índice, sin crear objetos por token)
+        o cualquier iterable de tuplas. Puede llamarse de nuevo para analizar otros tokens con el
+        mismo parser (ver parse_many): la lista de la pila se reutiliza.
+        """
+        self.tokens = tokens
+        self.position = 0  # Índice del token actual
+        self.current_token = ('$', '$', 0, 0)
+        self.columns = self.token_columns(tokens)
+        start = (self.grammar.terminal_ids['$'], self.grammar.nonterminal_ids[self.grammar.start_symbol])
+        if getattr(self, 'stack', None) is None:
+            self.stack = list(start)
+        else:
+            self.stack[:] = start
         self.error_reported = False
+        self.error_message = ""
+        self.diagnostic = None  # (línea, columna, mensaje) del primer error sintáctico
+        self.diagnostics = []  # (línea, columna, mensaje) de todos los errores sintácticos
+        self.halted = False  # Se alcanzó el límite de errores
+        self.error_position = -1  # Token en el que se reanudó el análisis tras el último error
         self.current_rule = None  # Almacena la regla en evaluación
+        self.tree = None  # Árbol de sintaxis, si se construye (ver parse_tree)
+        self.lexer = None  # Lexer del que se piden los tokens en el análisis en una pasada (ver set_lexer)
+        self.token_base = 0  # Tokens ya descartados de `tokens` en el análisis en una pasada
 
-    def advance(self):
-        """Avanza al siguiente token."""
-        if self.position < len(self.tokens) - 1:
-            self.position += 1
-            self.current_token = self.tokens[self.position]
-        else:
-            self.current_token = ('$', '$', self.current_token[2], self.current_token[3])
+    def set_lexer(self, lexer):
+        """Prepara el análisis en una sola pasada de los tokens que genere `lexer` (ver from_lexer)."""
+        self.set_tokens(lexer.tokens)
+        self.lexer = lexer
+        self.columns = self.lexer_columns(lexer)
 
-    def parse(self):
-        """Realiza el análisis sintáctico."""
-        while self.stack:
-            top = self.stack.pop()
-            token_name = self.current_token[0]
-            lexeme = self.current_token[1]
+    def token_columns(self, tokens):
+        """Retorna un iterador con las columnas de la tabla del nombre y del lexema de cada token.
 
-            if top == 'ε':
-                continue
-            elif top in self.grammar.terminals:
-                if top == token_name or top == lexeme:
-                    self.advance()
+        El lexema también puede nombrar un terminal (p. ej. 'range' es un id); los tokens sin lexema
+        (palabras reservadas, operadores...) usan su nombre como lexema. Al agotarse la entrada
+        el iterador genera indefinidamente el fin de entrada '$'.
+        """
+        terminal_ids = self.grammar.terminal_ids
+        unknown_id = self.grammar.unknown_id
+        end = terminal_ids['$']
+        if not isinstance(tokens, TokenBuffer):
+            return self.tuple_columns(tokens, terminal_ids, unknown_id, end)
+
+        # Con un TokenBuffer las columnas se calculan de una vez y se recorren a velocidad de C
+        terms = array('i', map(self.grammar.kind_columns.__getitem__, tokens.kinds))
+        alts = array('i', terms)
+        source, starts, ends, symbols = tokens.source, tokens.starts, tokens.ends, tokens.symbols
+        # Los identificadores y enteros se resuelven por su ID, sin extraer ni comparar su lexema
+        symbol_columns = self.symbol_columns(tokens.symbol_table) if tokens.symbol_table is not None else None
+        if not isinstance(source, str):
+            # Código en bytes (ver mapped_lexer): los lexemas se comparan sin decodificarlos
+            terminal_ids = {name.encode('utf-8'): idx for name, idx in terminal_ids.items()}
+        for index, kind in enumerate(tokens.kinds):
+            if HAS_LEXEME[kind]:
+                symbol = symbols[index]
+                if symbol >= 0:
+                    alts[index] = symbol_columns[symbol]
                 else:
-                    self.report_syntax_error([top], current_rule=self.current_rule)
-                    break
-            elif top in self.grammar.non_terminals:
-                # Actualizar la regla en evaluación
-                self.current_rule = top
+                    alts[index] = terminal_ids.get(source[starts[index]:ends[index]], unknown_id)
+        if tokens:
+            self.current_token = ('$', '$', tokens.lines[-1], tokens.columns[-1])
+        return chain(zip(terms, alts), repeat((end, end)))
 
+    def symbol_columns(self, table):
+        """Retorna la columna de la tabla de cada símbolo de `table` (ver tokens.SymbolTable), indexada por su ID.
+
+        Un símbolo cuyo texto nombra un terminal (p. ej. 'range') tiene su columna y los demás `unknown_id`.
+        Las columnas se guardan en el parser y solo se calculan las de los símbolos agregados desde la
+        última llamada, así que analizar varios archivos con la misma tabla no repite el trabajo.
+        """
+        cached = getattr(self, 'symbol_map', None)
+        terminal_ids = self.grammar.terminal_ids
+        if cached is None or cached[0] is not table or cached[1] is not terminal_ids:
+            cached = self.symbol_map = (table, terminal_ids, array('i'))
+        columns = cached[2]
+        if len(columns) < len(table.names):
+            unknown_id = self.grammar.unknown_id
+            columns.extend(terminal_ids.get(name, unknown_id) for name in table.names[len(columns):])
+        return columns
+
+    def lexer_columns(self, lexer):
+        """Genera las columnas de los tokens a medida que el lexer los produce, avanzando su análisis
+        (Lexer.scan) solo cuando el parser pide un token que aún no existe.
+
+        Los tokens consumidos se descartan del TokenBuffer del lexer cada DISCARD_SIZE tokens (salvo
+        al construir el árbol, que los referencia), de modo que la memoria no depende del tamaño de
+        la entrada. Los errores léxicos y sintácticos comparten el límite `max_errors`; si el lexer
+        se detiene, se entregan los tokens anteriores a su error seguidos del fin de entrada, y el
+        análisis sintáctico termina sin reportar más errores.
+        """
+        grammar = self.grammar
+        kind_columns = grammar.kind_columns
+        unknown_id = grammar.unknown_id
+        end = grammar.terminal_ids['$']
+        str_ids = grammar.terminal_ids
+        bytes_ids = None
+        budget = self.max_errors
+        tokens = lexer.tokens
+        kinds, starts, ends, symbols = tokens.kinds, tokens.starts, tokens.ends, tokens.symbols
+        symbol_columns = self.symbol_columns(lexer.symbols)
+        symbol_names = lexer.symbols.names
+        index = 0
+        lexer.max_errors = budget
+        for _ in lexer.scan():
+            count = len(kinds)
+            if lexer.halted:
+                # Solo los tokens anteriores al error léxico: los demás son los del cierre del archivo
+                stop = (lexer.diagnostics[-1][0], lexer.diagnostics[-1][1])
+                while count > index and (tokens.lines[count - 1], tokens.columns[count - 1]) >= stop:
+                    count -= 1
+            if index < count:
+                if index > DISCARD_SIZE and not self.build_tree:
+                    tokens.discard(index - 1)  # Se conserva el token actual para los mensajes de error
+                    self.token_base += index - 1
+                    count -= index - 1
+                    index = 1
+                source = tokens.source = lexer.code  # En modo perezoso el búfer de lectura cambia
+                if isinstance(source, str):
+                    terminal_ids = str_ids
+                else:
+                    # Código en bytes (ver mapped_lexer): los lexemas se comparan sin decodificarlos
+                    if bytes_ids is None:
+                        bytes_ids = {name.encode('utf-8'): idx for name, idx in str_ids.items()}
+                    terminal_ids = bytes_ids
+                if len(symbol_columns) < len(symbol_names):
+                    self.symbol_columns(lexer.symbols)  # Agrega las columnas de los símbolos nuevos de este paso
+                while index < count:
+                    kind = kinds[index]
+                    term = kind_columns[kind]
+                    if HAS_LEXEME[kind]:
+                        symbol = symbols[index]
+                        if symbol >= 0:
+                            yield term, symbol_columns[symbol]
+                        else:
+                            yield term, terminal_ids.get(source[starts[index]:ends[index]], unknown_id)
+                    else:
+                        yield term, term
+                    index += 1
+            if lexer.halted:
+                break
+            if budget is not None:
+                # Antes del siguiente paso del lexer: los errores sintácticos también agotan el límite
+                lexer.max_errors = budget - len(self.diagnostics)
+
+        if lexer.halted:
+            # Detenido, el parser termina en el primer símbolo que no acepte el fin de entrada (ver recover)
+            self.halted = True
+        elif tokens:
+            self.current_token = ('$', '$', tokens.lines[-1], tokens.columns[-1])
+        while True:
+            yield end, end
+
+    def tuple_columns(self, tokens, terminal_ids, unknown_id, end):
+        """Genera las columnas de una secuencia de tuplas, guardando cada token en `current_token`."""
+        token = None
+        for token in tokens:
+            self.current_token = token
+            term = terminal_ids.get(token[0], unknown_id)
+            if len(token) == 4:
+                yield term, terminal_ids.get(token[1], unknown_id)
+            else:
+                yield term, term
+        if token is not None:
+            self.current_token = ('$', '$', token[-2], token[-1])
+        while True:
+            yield end, end
+
+    def current(self):
+        """Retorna el token actual (tupla o vista Token) para los mensajes de error."""
+        index = self.position - self.token_base
+        if isinstance(self.tokens, TokenBuffer) and index < len(self.tokens):
+            return self.tokens[index]
+        return self.current_token
+
+    def parse(self):
+        """Realiza el análisis sintáctico sobre la tabla LL(1) codificada con enteros."""
+        if self.build_tree:
+            return self.parse_tree()
+        grammar = self.grammar
+        table = grammar.table
+        productions = grammar.productions
+        is_terminal = grammar.is_terminal
+        n_terms = grammar.n_terms
+        n_columns = grammar.n_columns
+        stack = self.stack
+        pop = stack.pop
+        push = stack.extend
+        next_columns = self.columns.__next__
+        term, alt = next_columns()
+        position = self.position
+        rule = None
+
+        while stack:
+            top = pop()
+            if top >= n_terms:
                 # Utiliza la tabla de parsing para decidir la producción
-                key = (top, token_name)
-                if key not in self.grammar.parse_table:
-                    key = (top, lexeme)
-                if key in self.grammar.parse_table:
-                    production = self.grammar.parse_table[key]
-                    for symbol in reversed(production):
-                        self.stack.append(symbol)
+                rule = top
+                row = (top - n_terms) * n_columns
+                production = table[row + term]
+                if production < 0:
+                    production = table[row + alt]
+                if production >= 0:
+                    push(productions[production])
                 else:
-                    # Si no se puede decidir, reportar error
-                    expected = self.expected_tokens(top)
-                    self.report_syntax_error(expected, current_rule=self.current_rule)
-                    break
+                    # Si no se puede decidir, reportar error y recuperarse si no se alcanzó el límite
+                    recovered = self.recover(top, rule, term, alt, position)
+                    if recovered is None:
+                        break
+                    term, alt, position = recovered
+            elif is_terminal[top] and (top == term or top == alt):
+                term, alt = next_columns()
+                position += 1
             else:
-                self.report_syntax_error([top], current_rule=self.current_rule)
+                recovered = self.recover(top, rule, term, alt, position)
+                if recovered is None:
+                    break
+                term, alt, position = recovered
+
+        self.position = position
+        if not self.error_reported and not self.halted and self.verbose:
+            print("El análisis sintáctico ha finalizado exitosamente.")
+
+    def parse_many(self, token_streams):
+        """Analiza varias secuencias de tokens con este parser y retorna un veredicto por secuencia.
+
+        Cada veredicto es la tupla de diagnósticos (línea, columna, mensaje), hasta `max_errors`;
+        una tupla vacía indica que la secuencia es correcta. La gramática compilada y la pila se
+        reutilizan entre secuencias, así que analizar miles de fragmentos pequeños no crea un parser
+        por fragmento. Para usarlo sin tokens iniciales: Parser.from_tokens(grammar, (), verbose=False).
+        """
+        verdicts = []
+        for tokens in token_streams:
+            self.set_tokens(tokens)
+            self.parse()
+            verdicts.append(tuple(self.diagnostics))
+        return verdicts
+
+    def parse_sources(self, sources, engine='char', fused=False):
+        """Como parse_many, pero recibe códigos fuente y realiza el análisis léxico de cada uno antes
+        del sintáctico (con el motor `engine`, ver lexer.create_lexer).
+
+        Los errores léxicos forman parte del veredicto y cuentan para `max_errors`; un código cuyo
+        análisis léxico se detuvo no se analiza sintácticamente. Con `fused` cada código se analiza
+        en una sola pasada (ver from_lexer) y el veredicto tiene los errores en orden de aparición.
+        """
+        max_errors = self.max_errors
+        verdicts = []
+        try:
+            for code in sources:
+                lexer = create_lexer(code, engine, verbose=False, max_errors=max_errors)
+                if fused:
+                    self.set_lexer(lexer)
+                    try:
+                        self.parse()
+                    except TabError as error:
+                        verdicts.append(self.all_diagnostics() + ((lexer.line, lexer.column, str(error)),))
+                        continue
+                    verdicts.append(self.all_diagnostics())
+                    continue
+                try:
+                    tokens = lexer.tokenize()
+                except TabError as error:
+                    verdicts.append(tuple(lexer.diagnostics) + ((lexer.line, lexer.column, str(error)),))
+                    continue
+                if lexer.halted:
+                    verdicts.append(tuple(lexer.diagnostics))
+                    continue
+                # Tras recuperarse de errores léxicos, el parser usa el resto del límite de errores
+                self.max_errors = None if max_errors is None else max_errors - len(lexer.diagnostics)
+                self.set_tokens(tokens)
+                self.parse()
+                verdicts.append(tuple(lexer.diagnostics + self.diagnostics))
+        finally:
+            self.max_errors = max_errors
+        return verdicts
+
+    def parse_tree(self):
+        """Realiza el análisis sintáctico como parse() y construye el árbol de sintaxis en `self.tree`.
+
+        Cada producción aplicada crea los nodos de sus símbolos en la arena de SyntaxTree; una pila
+        paralela a la de símbolos guarda el nodo de cada símbolo apilado.
+        """
+        grammar = self.grammar
+        table = grammar.table
+        productions = grammar.productions
+        is_terminal = grammar.is_terminal
+        n_terms = grammar.n_terms
+        n_columns = grammar.n_columns
+        tokens = self.tokens if isinstance(self.tokens, (TokenBuffer, list, tuple)) else None
+        tree = self.tree = SyntaxTree(grammar.symbol_names, n_terms, tokens)
+        kinds, first_tokens = tree.kinds, tree.first_tokens
+        child_starts, child_counts = tree.child_starts, tree.child_counts
+        # Valores iniciales de las columnas de los hijos de cada producción, para extenderlas de una vez
+        unset = [array('i', [-1]) * len(production) for production in productions]
+        zeros = [array('i', [0]) * len(production) for production in productions]
+        stack = self.stack
+        pop = stack.pop
+        push = stack.extend
+        nodes = [-1, tree.append(stack[-1])]  # El fin de entrada '$' no tiene nodo
+        pop_node = nodes.pop
+        push_nodes = nodes.extend
+        next_columns = self.columns.__next__
+        term, alt = next_columns()
+        position = self.position
+        rule = None
+
+        while stack:
+            top = pop()
+            node = pop_node()
+            if top >= n_terms:
+                rule = top
+                row = (top - n_terms) * n_columns
+                production = table[row + term]
+                if production < 0:
+                    production = table[row + alt]
+                if production >= 0:
+                    symbols = productions[production]
+                    start = len(kinds)
+                    first_tokens[node] = position
+                    child_starts[node] = start
+                    child_counts[node] = len(symbols)
+                    push(symbols)
+                    push_nodes(range(start, start + len(symbols)))
+                    kinds.extend(symbols)
+                    first_tokens.extend(unset[production])
+                    child_starts.extend(zeros[production])
+                    child_counts.extend(zeros[production])
+                    continue
+            elif is_terminal[top] and (top == term or top == alt):
+                if node >= 0:
+                    first_tokens[node] = position
+                term, alt = next_columns()
+                position += 1
+                continue
+            # El símbolo no se pudo emparejar: recuperarse y mantener la pila de nodos alineada
+            depth = len(stack)
+            recovered = self.recover(top, rule, term, alt, position)
+            if recovered is None:
                 break
+            term, alt, position = recovered
+            if len(stack) > depth + 1:
+                nodes.extend((-1, tree.append(stack[-1])))  # Se reanudó con el símbolo inicial (ver recover)
+            elif len(stack) > depth:
+                nodes.append(node)
 
-        if not self.error_reported:
+        self.position = position
+        if not self.error_reported and not self.halted and self.verbose:
             print("El análisis sintáctico ha finalizado exitosamente.")
 
+    def recover(self, top, rule, term, alt, position):
+        """Reporta un error sintáctico y se recupera en modo pánico.
+
+        Un no terminal sin producción para el token actual se reintenta tras descartar los tokens
+        que no están en su PRIMERO ni en su SIGUIENTE (el conjunto de sincronización, al que se agrega
+        el fin de línea para no saltar sentencias completas), o se descarta si no puede empezar por
+        el token; un terminal que no coincide se da por insertado. El fin de entrada '$' no se da por
+        insertado mientras quedan tokens: se descartan hasta uno con el que pueda empezar el símbolo
+        inicial (como el fin de línea) y el análisis continúa con '$' y ese símbolo en la pila. Los
+        errores en el mismo token en que se reanudó el análisis no se reportan (son errores en cascada)
+        y descartan ese token para asegurar el avance; en un fin de línea se descartan en cambio los
+        símbolos de la pila.
+        Retorna las columnas y la posición del token con el que continúa, o None si se alcanzó el límite.
+        """
+        if self.halted:
+            return None  # El lexer se detuvo en el análisis en una pasada (ver lexer_columns)
+        grammar = self.grammar
+        end = grammar.terminal_ids['$']
+        newline = grammar.terminal_ids.get('tk_newline', end)
+        next_columns = self.columns.__next__
+        self.position = position
+        self.current_rule = grammar.symbol_names[rule] if rule is not None else None
+
+        if position != self.error_position:
+            if top >= grammar.n_terms:
+                expected = self.expected_tokens(self.current_rule)
+            else:
+                expected = [grammar.symbol_names[top]]
+            self.report_syntax_error(expected, current_rule=self.current_rule)
+            if self.halted:
+                return None
+            if top >= grammar.n_terms:
+                row = (top - grammar.n_terms) * grammar.n_columns
+                sync = grammar.sync_columns(top)
+                while (term != end and term != newline and grammar.table[row + term] < 0
+                       and grammar.table[row + alt] < 0 and term not in sync and alt not in sync):
+                    term, alt = next_columns()
+                    position += 1
+                if grammar.table[row + term] >= 0 or grammar.table[row + alt] >= 0:
+                    self.stack.append(top)
+        elif top != end and term != end and term != newline:
+            term, alt = next_columns()
+            position += 1
+            self.stack.append(top)
+
+        if top == end and term != end:
+            if position == self.error_position:
+                term, alt = next_columns()  # Error en cascada: se descarta el token para asegurar el avance
+                position += 1
+            start = grammar.nonterminal_ids[grammar.start_symbol]
+            row = (start - grammar.n_terms) * grammar.n_columns
+            while term != end and grammar.table[row + term] < 0 and grammar.table[row + alt] < 0:
+                term, alt = next_columns()
+                position += 1
+            self.stack.extend((end, start))
+
+        self.error_position = position
+        return term, alt, position
+
+    def all_diagnostics(self):
+        """Retorna los errores léxicos del análisis en una pasada (ver from_lexer) y los sintácticos,
+        ordenados por línea y columna y hasta `max_errors`.
+
+        Los motores que analizan una línea completa por paso pueden reportar errores léxicos algo más
+        adelante en el código que el error sintáctico que agotó el límite; esos no se incluyen.
+        """
+        if self.lexer is None:
+            return tuple(self.diagnostics)
+        diagnostics = sorted(self.lexer.diagnostics + self.diagnostics, key=lambda diagnostic: diagnostic[:2])
+        return tuple(diagnostics[:self.max_errors])
+
     def expected_tokens(self, non_terminal):
         """Obtiene la lista de tokens esperados en un punto dado."""
         expected = []
@@ -264,15 +981,27 @@ class Parser:
 
     def report_syntax_error(self, expected_tokens, current_rule):
         """Reporte de error sintáctico incluyendo la regla en evaluación."""
-        if not self.error_reported:
-            line = self.current_token[2]
-            column = self.current_token[3]
-            found_lexeme = self.current_token[1]
-            expected = ', '.join(f'"{et}"' for et in expected_tokens)
-            error_message = (f"<{line},{column}> Error sintáctico en la regla '{current_rule}': "
-                             f"se encontró \"{found_lexeme}\"; se esperaba: {expected}.")
-            print(error_message)
+        if not self.halted:
+            line, column, detail = self.describe_syntax_error(self.current(), expected_tokens, current_rule)
+            error_message = f"<{line},{column}> {detail}"
+            if not self.error_reported:
+                self.error_message = error_message
+                self.diagnostic = (line, column, detail)
+            self.diagnostics.append((line, column, detail))
+            if self.verbose:
+                print(error_message)
             self.error_reported = True
+            # En el análisis en una pasada los errores léxicos también cuentan para el límite
+            errors = len(self.diagnostics) + (len(self.lexer.diagnostics) if self.lexer is not None else 0)
+            self.halted = self.max_errors is not None and errors >= self.max_errors
+
+    def describe_syntax_error(self, token, expected_tokens, current_rule):
+        """Retorna (línea, columna, mensaje) del error sintáctico encontrado en `token`."""
+        found_lexeme = token[1] if len(token) == 4 else token[0]
+        expected = ', '.join(f'"{et}"' for et in expected_tokens)
+        detail = (f"Error sintáctico en la regla '{current_rule}': "
+                  f"se encontró \"{found_lexeme}\"; se esperaba: {expected}.")
+        return token[-2], token[-1], detail
 
     def tokenize_from_file(self, filename):
         """Lee los tokens desde un archivo y los devuelve en una lista."""
@@ -0,0 +1,270 @@
+# regex_lexer.py
+
+import re
+from types import SimpleNamespace
+
+from lexer import Lexer
+from tokens import (DELIMITERS, OPERATOR_MATCHES, OPERATORS, TOKEN_IDS, RESERVED_IDS, ID, INTEGER, STRING, NEWLINE,
+                    INDENT, DEDENT)
+
+# Operadores que el lexer por caracteres puede reconocer (ver tokens.OPERATOR_MATCHES).
+# Se ordenan de mayor a menor longitud para que la alternativa más larga gane.
+_SCANNED_OPERATORS = sorted((op for matches in OPERATOR_MATCHES.values() for op, _, _ in matches), key=len,
+                            reverse=True)
+
+# Expresión maestra: salta los espacios y captura un grupo por cada rama de Lexer.scan()
+MASTER_PATTERN = re.compile(r'[ \t]*(?:' + '|'.join([
+    r'(?P<newline>\n)',
+    r'(?P<comment>#[^\n]*)',
+    r'(?P<triple>"""|' + "''')",
+    r'(?P<string>["\'])',
+    r'(?P<identifier>[A-Za-z_][A-Za-z0-9_]*)',
+    r'(?P<number>[0-9]+)',
+    '(?P<operator>' + '|'.join(re.escape(op) for op in _SCANNED_OPERATORS) + ')',
+    '(?P<delimiter>[' + re.escape(''.join(DELIMITERS)) + '])',
+]) + ')')
+INDENT_PATTERN = re.compile(r'[ \t\f]*')
+
+# Tipo de token (entero) de cada operador y delimitador
+OPERATOR_KINDS = {op: TOKEN_IDS[name] for op, name in OPERATORS.items()}
+DELIMITER_KINDS = {char: TOKEN_IDS[name] for char, name in DELIMITERS.items()}
+
+# Lo que RegexLexer.scan_code necesita para recorrer un código en str; MappedLexer define su versión en bytes.
+# `word` reconoce un carácter que continúa un identificador o invalida un número (str.isalnum() o '_'),
+# y los caracteres mayores que `last_ascii` pueden continuar un identificador fuera de ASCII
+TEXT_SYNTAX = SimpleNamespace(
+    master=MASTER_PATTERN,
+    indent=INDENT_PATTERN,
+    word=re.compile(r'\w').match,
+    reserved=RESERVED_IDS,
+    operators=OPERATOR_KINDS,
+    delimiters=DELIMITER_KINDS,
+    newline='\n',
+    backslash='\\',
+    last_ascii='\x7f',
+    decode=str,
+)
+
+
+class RegexLexer(Lexer):
+    """Lexer que recorta los tokens con una única expresión regular compilada.
+
+    Produce exactamente la misma secuencia de tokens que Lexer (incluidas las posiciones),
+    pero corta identificadores, números, cadenas y comentarios como rebanadas del código y
+    calcula la columna a partir del desplazamiento desde el último salto de línea.
+    Con un flujo de entrada (iter_tokens) lee el flujo completo antes de analizar.
+    """
+
+    def scan(self):
+        """Recorre el código con la expresión maestra agregando tokens a `self.tokens`."""
+        if self.stream is not None:
+            self.code += self.stream.read()
+            self.stream = None
+        yield from self.scan_code(TEXT_SYNTAX)
+
+    def scan_code(self, syntax):
+        """Recorre `self.code` con las expresiones y tablas de `syntax` (ver TEXT_SYNTAX), que definen si el
+        código es un str o bytes, agregando tokens a `self.tokens`."""
+        code = self.code
+        end = len(code)
+        append = self.tokens.append
+        intern = self.symbols.intern  # Con bytes: cada lexema distinto se decodifica una sola vez
+        match_token = syntax.master.match
+        match_indent = syntax.indent.match
+        match_word = syntax.word
+        reserved = syntax.reserved
+        operators = syntax.operators
+        delimiters = syntax.delimiters
+        newline = syntax.newline
+        last_ascii = syntax.last_ascii
+        pos = self.position
+        line = self.line
+        line_base = pos - self.column  # La columna de `pos` es pos - line_base
+        at_line_start = True
+
+        while True:
+            if self.halted or pos >= end:
+                break
+
+            # Manejar indentación al inicio de una línea
+            if at_line_start:
+                at_line_start = False
+                if code[pos] != newline:
+                    indent_end = match_indent(code, pos).end()
+                    if indent_end > pos:
+                        self.line = line
+                        current_indent = self.measure_indentation(syntax.decode(code[pos:indent_end]))
+                    else:
+                        current_indent = 0
+                    pos = indent_end
+                    column = current_indent + 1
+                    line_base = pos - column
+                    self.emit_indentation(current_indent, line, column)
+                    continue
+
+            match = match_token(code, pos)
+            if match is None:
+                pos, line, line_base = self.scan_fallback(pos, line, line_base)
+                continue
+            kind = match.lastgroup
+            start = match.start(kind)
+            pos = match.end()
+
+            if kind == 'identifier':
+                if pos < end and code[pos] > last_ascii:
+                    pos = self.extend_identifier(pos)
+                name = code[start:pos]
+                kind = reserved.get(name)
+                if kind is not None:
+                    append(kind, line, start - line_base)
+                else:
+                    append(ID, line, start - line_base, start, pos, intern(name))
+            elif kind == 'operator':
+                append(operators[match.group(kind)], line, start - line_base)
+            elif kind == 'number':
+                if pos < end and match_word(code, pos):
+                    pos = self.finish_number(start, pos, line, line_base)
+                else:
+                    append(INTEGER, line, start - line_base, start, pos, intern(code[start:pos]))
+            elif kind == 'delimiter':
+                append(delimiters[code[start]], line, start - line_base)
+            elif kind == 'newline':
+                line += 1
+                line_base = pos - 1
+                at_line_start = True
+                # La barra invertida al final de la línea (p. ej. en un comentario) une las líneas
+                if start == 0 or code[start - 1] != syntax.backslash:
+                    append(NEWLINE, line, 1)
+                self.position = pos  # Posición de inicio de línea visible para quien consume scan()
+                self.line = line
+                yield
+            elif kind == 'comment':
+                continue
+            elif kind == 'string':
+                close = code.find(code[start:start + 1], pos)
+                if close == -1:
+                    pos = end
+                    self.line = line
+                    self.column = start - line_base
+                    self.report_error("Error en cadena de texto")
+                    line, line_base = self.line, end - self.column
+                    continue
+                append(STRING, line, start - line_base, pos, close)
+                # Lexer cuenta dos veces cada carácter y cada salto de línea del contenido
+                pos = close + 1
+                line, line_base = self.skip_quoted(start, pos, 1, 1, line, line_base)
+            else:  # triple
+                close = code.find(code[start:start + 3], pos)
+                if close == -1:
+                    pos = end
+                    self.line = line
+                    self.column = start - line_base
+                    self.report_error("Error en comentario multilínea")
+                    line, line_base = self.line, end - self.column
+                    continue
+                pos = close + 3
+                line, line_base = self.skip_quoted(start, pos, 3, 3, line, line_base)
+
+        self.position = pos
+        self.line = line
+        self.column = pos - line_base
+
+        # Inserta un tk_newline si el último token no es un tk_newline
+        last_kind = self.tokens.kinds[-1] if self.tokens else self.last_kind
+        if last_kind is not None and last_kind != NEWLINE:
+            append(NEWLINE, self.line, self.column)
+
+        # Manejar dedentaciones al final del archivo
+        while len(self.indent_stack) > 1:
+            self.indent_stack.pop()
+            append(DEDENT, self.line, self.column)
+        yield
+
+    def measure_indentation(self, indentation):
+        """Calcula el nivel de una sangría igual que Lexer.handle_indentation."""
+        if ' ' in indentation and '\t' in indentation:
+            raise TabError(f"Inconsistent use of tabs and spaces for indentation at line {self.line}")
+        current_indent = 0
+        for char in indentation:
+            if char == '\t':
+                current_indent += (8 - (current_indent % 8))  # Múltiplo de 8
+        return current_indent + indentation.count(' ')
+
+    def emit_indentation(self, current_indent, line, column):
+        """Genera los tokens tk_indent y tk_dedent para el nivel de sangría dado."""
+        previous_indent = self.indent_stack[-1]
+        if current_indent > previous_indent:
+            self.indent_stack.append(current_indent)
+            self.tokens.append(INDENT, line, column)
+        elif current_indent < previous_indent:
+            while len(self.indent_stack) > 1 and self.indent_stack[-1] > current_indent:
+                self.indent_stack.pop()
+                self.tokens.append(DEDENT, line, column)
+
+    def char(self, pos):
+        """Retorna el carácter del código en `pos`; en un código en bytes (ver MappedLexer), el de ese byte."""
+        char = self.code[pos]
+        return char if isinstance(char, str) else chr(char)
+
+    def skip_quoted(self, start, end, opening, closing, line, line_base):
+        """Ajusta línea y columna tras una cadena o comentario multilínea entre `start` y `end`.
+
+        El contenido se cuenta sobre una rebanada: mmap no tiene count().
+        """
+        code = self.code
+        newline = '\n' if isinstance(code, str) else b'\n'
+        newlines = code[start + opening:end - closing].count(newline)
+        if newlines:
+            last_newline = code.rfind(newline, start + opening, end - closing)
+            column = 1 + 2 * (end - closing - last_newline - 1) + closing
+            return line + 2 * newlines, end - column
+        column = (start - line_base) + opening + 2 * (end - closing - start - opening) + closing
+        return line, end - column
+
+    def extend_identifier(self, pos):
+        """Extiende un identificador con caracteres alfanuméricos fuera de ASCII."""
+        char = self.char
+        while pos < len(self.code) and (char(pos).isalnum() or char(pos) == '_'):
+            pos += 1
+        return pos
+
+    def finish_number(self, start, pos, line, line_base):
+        """Agrega el token de un número y reporta error si le sigue una letra."""
+        code = self.code
+        char = self.char
+        while pos < len(code) and char(pos).isdigit():
+            pos += 1
+        self.tokens.append(INTEGER, line, start - line_base, start, pos, self.symbols.intern(code[start:pos]))
+        if pos < len(code) and (char(pos).isalpha() or char(pos) == '_'):
+            self.line = line
+            self.column = pos - line_base
+            self.report_error()
+            if not self.halted:
+                pos += 1  # Saltar el carácter inválido
+        return pos
+
+    def scan_fallback(self, pos, line, line_base):
+        """Analiza caracteres fuera de la expresión maestra (Unicode) o reporta el error léxico."""
+        code = self.code
+        char = self.char
+        while char(pos) == ' ' or char(pos) == '\t':
+            pos += 1
+            if pos == len(code):
+                return pos, line, line_base
+        if char(pos).isalpha():
+            end = self.extend_identifier(pos + 1)
+            name = code[pos:end]
+            kind = RESERVED_IDS.get(name)
+            if kind is not None:
+                self.tokens.append(kind, line, pos - line_base)
+            else:
+                self.tokens.append(ID, line, pos - line_base, pos, end, self.symbols.intern(name))
+            return end, line, line_base
+        if char(pos).isdigit():
+            return self.finish_number(pos, pos + 1, line, line_base), line, line_base
+        self.line = line
+        self.column = pos - line_base
+        self.report_error()
+        if not self.halted:
+            pos += 1  # Saltar el carácter inválido
+        return pos, line, line_base
@@ -0,0 +1,153 @@
+# result_cache.py
+
+import hashlib
+import marshal
+import os
+import tempfile
+
+from sinks import decode_tokens, encode_tokens
+
+# Directorio por defecto de la caché de resultados
+DEFAULT_RESULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'analizador', 'results')
+
+# Tamaño máximo por defecto de la caché, en bytes
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Al superar el tamaño máximo se eliminan las entradas menos usadas hasta bajar a esta fracción
+EVICTION_TARGET = 0.8
+
+# Extensión de los archivos de la caché
+ENTRY_SUFFIX = '.res'
+
+# Módulos cuyo código determina el resultado de un análisis o el formato de las entradas (sinks.py codifica
+# los tokens guardados): si cambia alguno, los resultados guardados dejan de ser válidos (ver analyzer_version).
+# grammar_tables.py es opcional (ver Grammar.load_table_module)
+ANALYZER_MODULES = ('tokens.py', 'lexer.py', 'regex_lexer.py', 'mapped_lexer.py', 'parallel_lexer.py', 'parser.py',
+                    'grammar_tables.py', 'sinks.py', 'driver.py')
+
+_analyzer_version = None
+
+
+def analyzer_version():
+    """Hash del código de ANALYZER_MODULES; se calcula una vez por proceso."""
+    global _analyzer_version
+    if _analyzer_version is None:
+        digest = hashlib.sha256()
+        directory = os.path.dirname(os.path.abspath(__file__))
+        for name in ANALYZER_MODULES:
+            digest.update(name.encode() + b'\n')
+            try:
+                with open(os.path.join(directory, name), 'rb') as file:
+                    digest.update(file.read())
+            except FileNotFoundError:
+                pass  # Módulo opcional ausente: su nombre basta para distinguir la versión
+        _analyzer_version = digest.hexdigest()
+    return _analyzer_version
+
+
+class ResultCache:
+    """Caché en disco de los resultados de driver.analyze_source, indexada por el hash del código fuente,
+    de la gramática, de la versión del analizador y de las opciones del análisis (ver key).
+
+    Cada entrada es un archivo marshal con el resultado y, con `store_tokens`, los tokens en el
+    formato binario de sinks.BinarySink. Los archivos se escriben en un temporal y se renombran, así
+    que varios procesos pueden compartir el directorio: un lector ve una entrada completa o ninguna.
+    Leer una entrada actualiza su fecha de modificación; cuando lo escrito por este proceso supera
+    una décima parte de `max_bytes` se recorre el directorio y, si excede `max_bytes`, se eliminan
+    las entradas usadas hace más tiempo (LRU). Con varios procesos el tamaño puede excederse
+    transitoriamente en lo que cada uno escribió desde su última revisión.
+    """
+
+    def __init__(self, directory=DEFAULT_RESULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES, store_tokens=False):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.store_tokens = store_tokens
+        self.written = 0  # Bytes escritos desde la última revisión del tamaño
+
+    def key(self, source, grammar_hash, engine, max_errors, fused=False):
+        """Retorna la clave de un análisis; `source` es el contenido del archivo en bytes."""
+        digest = hashlib.sha256(f"{analyzer_version()}\n{grammar_hash}\n{engine}\n{max_errors}\n{fused}\n".encode())
+        digest.update(source)
+        return digest.hexdigest()
+
+    def path(self, key):
+        """Ruta del archivo de una entrada (repartidas en subdirectorios por los dos primeros caracteres)."""
+        return os.path.join(self.directory, key[:2], key + ENTRY_SUFFIX)
+
+    def load(self, key):
+        """Retorna la entrada guardada ({'result': ..., 'tokens': ...}) o None si no existe o está dañada."""
+        path = self.path(key)
+        try:
+            with open(path, 'rb') as file:
+                entry = marshal.loads(file.read())
+            os.utime(path)  # Marca la entrada como usada recientemente
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+        return entry if isinstance(entry, dict) and 'result' in entry else None
+
+    def get(self, key):
+        """Retorna el resultado guardado con la clave, o None."""
+        entry = self.load(key)
+        return entry['result'] if entry is not None else None
+
+    def get_tokens(self, key):
+        """Retorna el TokenBuffer guardado con la clave, o None si no se guardaron sus tokens."""
+        entry = self.load(key)
+        if entry is None or entry.get('tokens') is None:
+            return None
+        try:
+            return decode_tokens(entry['tokens'])
+        except ValueError:
+            return None
+
+    def put(self, key, result, tokens=None):
+        """Guarda un resultado (y sus tokens si se indican y `store_tokens` está activo) de forma atómica."""
+        entry = {'result': result,
+                 'tokens': encode_tokens(tokens) if tokens is not None and self.store_tokens else None}
+        data = marshal.dumps(entry)
+        path = self.path(key)
+        tmp_path = None
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            with os.fdopen(fd, 'wb') as file:
+                file.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            # La caché es opcional: un directorio sin permisos o un disco lleno no impiden el análisis
+            if tmp_path is not None:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+            return
+        self.written += len(data)
+        if self.written > self.max_bytes // 10:
+            self.written = 0
+            self.evict()
+
+    def evict(self):
+        """Elimina las entradas usadas hace más tiempo si la caché ocupa más de `max_bytes`."""
+        entries = []
+        for root, dirs, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith(ENTRY_SUFFIX):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue  # Otro proceso la eliminó
+                entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        if total <= self.max_bytes:
+            return
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes * EVICTION_TARGET:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
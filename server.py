@@ -0,0 +1,245 @@
+# server.py
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from driver import analyze_source_in_worker, init_worker, pool_context
+from lexer import ENGINES
+from parser import Grammar
+
+# Estados de las respuestas que no provienen del análisis (ver driver.OK y los demás)
+BAD_REQUEST = 'bad_request'
+TIMEOUT = 'timeout'
+INTERNAL_ERROR = 'internal_error'
+
+# Longitud máxima de una línea del protocolo (una petición con su código fuente)
+MAX_LINE = 64 * 1024 * 1024
+
+
+class AnalysisServer:
+    """Servicio de análisis que mantiene una gramática construida y un pool de procesos entre peticiones.
+
+    Protocolo JSON-lines: cada línea recibida es una petición
+    {"id": ..., "source": "código", "engine": "char", "max_errors": 1, "timeout": 5.0}
+    (solo "source" es obligatorio; "max_errors" 0 significa sin límite) y por cada una se escribe
+    una línea con el resultado de driver.analyze_source más "id" y "seconds" (tiempo del análisis),
+    o con el estado BAD_REQUEST, TIMEOUT o INTERNAL_ERROR y un "message". Las respuestas se
+    escriben a medida que terminan, no en el orden de las peticiones.
+
+    Como mucho `max_pending` peticiones se analizan o esperan a la vez: al llegar a ese límite se
+    deja de leer la conexión hasta que alguna termine. Una petición que supera su tiempo límite se
+    responde con TIMEOUT, pero su proceso trabajador sigue ocupado hasta terminarla y la petición
+    cuenta para `max_pending` hasta entonces. Si un proceso trabajador muere (p. ej. por falta de
+    memoria), las peticiones en curso se responden con INTERNAL_ERROR y el pool se vuelve a crear.
+    """
+
+    def __init__(self, grammar_file='gramatica.txt', jobs=None, engine='char', max_errors=1, timeout=10.0,
+                 max_pending=None):
+        self.grammar_file = grammar_file
+        self.jobs = jobs or os.cpu_count() or 1
+        self.engine = engine
+        self.max_errors = max_errors
+        self.timeout = timeout
+        self.max_pending = max_pending or 4 * self.jobs
+        self.executor = None
+        self.pending = None
+        self.grammar = None
+
+    async def start(self):
+        """Construye la gramática, inicia los procesos trabajadores y espera a que estén listos."""
+        self.grammar = Grammar(self.grammar_file)
+        self.executor = self.create_pool()
+        self.pending = asyncio.Semaphore(self.max_pending)
+        # Con 'fork' el primer envío crea todos los procesos: la primera petición no paga ese costo
+        await asyncio.get_running_loop().run_in_executor(self.executor, analyze_source_in_worker, '',
+                                                         self.engine, self.max_errors)
+
+    def create_pool(self):
+        """Crea el pool de procesos trabajadores, cada uno con la gramática y las opciones del servicio."""
+        return ProcessPoolExecutor(max_workers=self.jobs, mp_context=pool_context(), initializer=init_worker,
+                                   initargs=(self.grammar, self.engine, self.max_errors))
+
+    def replace_pool(self, broken):
+        """Reemplaza el pool `broken`, en el que murió un proceso trabajador, si aún no se reemplazó."""
+        if self.executor is broken:
+            broken.shutdown(wait=False, cancel_futures=True)
+            self.executor = self.create_pool()
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+            self.executor = None
+
+    async def analyze(self, request):
+        """Atiende una petición ya decodificada y retorna su respuesta y el futuro de su análisis en el pool
+        (None si la petición no es válida), que tras un TIMEOUT sigue en curso hasta que el proceso
+        trabajador la termine."""
+        request_id = request.get('id') if isinstance(request, dict) else None
+        try:
+            code, engine, max_errors, timeout = self.read_request(request)
+        except ValueError as error:
+            return {'id': request_id, 'status': BAD_REQUEST, 'message': str(error)}, None
+
+        loop = asyncio.get_running_loop()
+        executor = self.executor
+        future = None
+        try:
+            try:
+                future = loop.run_in_executor(executor, analyze_source_in_worker, code, engine, max_errors)
+            except BrokenProcessPool:
+                # El pool se rompió en un análisis que ya nadie espera (p. ej. tras un TIMEOUT): se reintenta
+                self.replace_pool(executor)
+                executor = self.executor
+                future = loop.run_in_executor(executor, analyze_source_in_worker, code, engine, max_errors)
+            # shield: al vencer el tiempo límite el futuro no se cancela, para saber cuándo termina
+            result = await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            return {'id': request_id, 'status': TIMEOUT,
+                    'message': f"El análisis superó el tiempo límite de {timeout} s"}, future
+        except BrokenProcessPool as error:  # Murió un proceso trabajador: el pool ya no acepta trabajos
+            self.replace_pool(executor)
+            return ({'id': request_id, 'status': INTERNAL_ERROR, 'message': f"{type(error).__name__}: {error}"},
+                    future)
+        except Exception as error:  # Fallo del trabajador (p. ej. recursión demasiado profunda)
+            return ({'id': request_id, 'status': INTERNAL_ERROR, 'message': f"{type(error).__name__}: {error}"},
+                    future)
+        return {'id': request_id, **result}, future
+
+    def read_request(self, request):
+        """Valida una petición y retorna (código, motor, límite de errores, tiempo límite)."""
+        if not isinstance(request, dict):
+            raise ValueError("La petición debe ser un objeto JSON")
+        code = request.get('source')
+        if not isinstance(code, str):
+            raise ValueError("Falta el código fuente ('source')")
+        engine = request.get('engine', self.engine)
+        if engine not in ENGINES:
+            raise ValueError(f"Motor léxico desconocido: '{engine}'")
+        max_errors = request.get('max_errors', self.max_errors)
+        if max_errors is not None and (not isinstance(max_errors, int) or max_errors < 0):
+            raise ValueError("'max_errors' debe ser un entero no negativo")
+        timeout = request.get('timeout', self.timeout)
+        if timeout is not None and (not isinstance(timeout, (int, float)) or timeout <= 0):
+            raise ValueError("'timeout' debe ser un número positivo")
+        return code, engine, max_errors or None, timeout
+
+    async def serve(self, reader, writer):
+        """Atiende las peticiones de una conexión (o de la entrada estándar) hasta que se cierre."""
+        lock = asyncio.Lock()
+        tasks = set()
+
+        async def respond(line):
+            future = None
+            try:
+                try:
+                    request = json.loads(line)
+                except ValueError as error:
+                    response = {'id': None, 'status': BAD_REQUEST, 'message': f"JSON inválido: {error}"}
+                else:
+                    response, future = await self.analyze(request)
+                async with lock:
+                    writer.write(json.dumps(response, ensure_ascii=False).encode('utf-8') + b'\n')
+                    await writer.drain()
+            finally:
+                if future is not None and not future.done():
+                    # Tras un TIMEOUT el lugar se libera cuando el proceso trabajador queda libre
+                    future.add_done_callback(lambda _: self.pending.release())
+                else:
+                    self.pending.release()
+
+        try:
+            while True:
+                await self.pending.acquire()  # Contrapresión: no se lee más mientras el pool está saturado
+                try:
+                    line = await reader.readline()
+                except ValueError:  # Línea más larga que MAX_LINE
+                    self.pending.release()
+                    break
+                if not line.strip():
+                    self.pending.release()
+                    if not line:
+                        break
+                    continue
+                task = asyncio.create_task(respond(line))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.wait(tasks)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+
+class StdioStream:
+    """Entrada y salida estándar con la parte de la interfaz de asyncio.StreamReader y StreamWriter
+    que usa AnalysisServer.serve. Las líneas se leen en un hilo, ya que la entrada puede ser un archivo."""
+
+    async def readline(self):
+        return await asyncio.get_running_loop().run_in_executor(None, sys.stdin.buffer.readline)
+
+    def write(self, data):
+        sys.stdout.buffer.write(data)
+
+    async def drain(self):
+        sys.stdout.buffer.flush()
+
+    def close(self):
+        sys.stdout.buffer.flush()
+
+    async def wait_closed(self):
+        pass
+
+
+async def run_server(server, socket_path=None, host='127.0.0.1', port=None):
+    """Inicia el servicio en un socket Unix, en un puerto TCP local o (por defecto) en la entrada estándar."""
+    await server.start()
+    try:
+        if socket_path is not None:
+            listener = await asyncio.start_unix_server(server.serve, socket_path, limit=MAX_LINE)
+            print(f"Servidor escuchando en '{socket_path}'.", file=sys.stderr)
+        elif port is not None:
+            listener = await asyncio.start_server(server.serve, host, port, limit=MAX_LINE)
+            print(f"Servidor escuchando en {host}:{port}.", file=sys.stderr)
+        else:
+            stream = StdioStream()
+            await server.serve(stream, stream)
+            return
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        server.close()
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Servicio de análisis léxico y sintáctico (protocolo JSON-lines).")
+    arg_parser.add_argument('--socket', metavar='RUTA', help="escucha en un socket Unix")
+    arg_parser.add_argument('--port', type=int, help="escucha en un puerto TCP (por defecto: entrada estándar)")
+    arg_parser.add_argument('--host', default='127.0.0.1', help="dirección del puerto TCP (por defecto: 127.0.0.1)")
+    arg_parser.add_argument('--grammar', default='gramatica.txt', help="archivo de gramática")
+    arg_parser.add_argument('--jobs', '-j', type=int, default=None,
+                            help="procesos trabajadores (por defecto: uno por núcleo)")
+    arg_parser.add_argument('--engine', choices=ENGINES, default='char',
+                            help="motor léxico por defecto de las peticiones (por defecto: char)")
+    arg_parser.add_argument('--max-errors', type=int, default=1, metavar='N',
+                            help="errores a reportar por petición (0: sin límite; por defecto: 1)")
+    arg_parser.add_argument('--timeout', type=float, default=10.0, metavar='SEG',
+                            help="tiempo límite por petición en segundos (por defecto: 10)")
+    arg_parser.add_argument('--max-pending', type=int, default=None, metavar='N',
+                            help="peticiones en curso antes de dejar de leer (por defecto: 4 por proceso)")
+    args = arg_parser.parse_args()
+    server = AnalysisServer(args.grammar, jobs=args.jobs, engine=args.engine, max_errors=args.max_errors or None,
+                            timeout=args.timeout, max_pending=args.max_pending)
+    try:
+        asyncio.run(run_server(server, args.socket, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
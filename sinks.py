@@ -0,0 +1,190 @@
+# sinks.py
+
+import struct
+import sys
+from array import array
+
+from tokens import HAS_LEXEME, TOKEN_NAMES, TokenBuffer
+
+# Tokens formateados por cada escritura de TextSink
+BATCH_SIZE = 8192
+
+# Encabezado del formato binario: firma, cantidad de tokens y bytes del código fuente (UTF-8)
+BINARY_MAGIC = b'TOKB'
+BINARY_HEADER = struct.Struct('<4sII')
+BINARY_COLUMNS = ('kinds', 'lines', 'columns', 'starts', 'ends')
+
+
+class TokenSink:
+    """Destino de los tokens y errores de un lexer (ver Lexer.write_output).
+
+    `write_tokens` recibe el TokenBuffer completo una vez terminado el análisis, `write_errors`
+    el texto de los errores léxicos (si los hubo) y `close` se llama al final.
+    """
+
+    def write_tokens(self, tokens):
+        pass
+
+    def write_errors(self, message):
+        pass
+
+    def close(self):
+        pass
+
+
+class NullSink(TokenSink):
+    """Descarta los tokens."""
+
+
+class TextSink(TokenSink):
+    """Escribe los tokens en el formato de texto <nombre,[lexema,]línea,columna>, uno por línea.
+
+    El archivo se abre (y se vacía) recién al escribir, en la ruta de esta instancia, y los tokens se
+    formatean y escriben en lotes de BATCH_SIZE. Con `echo` también se muestran en pantalla.
+    `target` puede ser una ruta o un archivo de texto ya abierto (que no se cierra).
+    """
+
+    def __init__(self, target, echo=False):
+        self.target = target
+        self.echo = echo
+        self.file = None
+
+    def open(self):
+        if self.file is None:
+            self.file = open(self.target, 'w') if isinstance(self.target, str) else self.target
+        return self.file
+
+    def write(self, text):
+        self.open().write(text)
+        if self.echo:
+            sys.stdout.write(text)
+
+    def write_tokens(self, tokens):
+        self.open()
+        for start in range(0, len(tokens), BATCH_SIZE):
+            self.write(''.join(format_tokens(tokens, start, min(start + BATCH_SIZE, len(tokens)))))
+
+    def write_errors(self, message):
+        self.write(message)
+        if self.echo:
+            sys.stdout.write('\n')  # Como print(), que agregaba un salto de línea al mensaje
+
+    def close(self):
+        if self.file is not None and self.file is not self.target:
+            self.file.close()
+        self.file = None
+
+
+class BinarySink(TokenSink):
+    """Guarda los tokens en formato binario: las columnas del TokenBuffer como enteros de 32 bits
+    y el código fuente en UTF-8 (ver read_binary_tokens). Los errores no se guardan.
+
+    Un código en bytes (ver mapped_lexer, que solo lo conserva si es ASCII) se escribe sin copiarlo:
+    sus desplazamientos en bytes coinciden con los de caracteres.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def write_tokens(self, tokens):
+        with open(self.path, 'wb') as file:
+            for chunk in binary_chunks(tokens):
+                file.write(chunk)
+
+
+class BufferSink(TokenSink):
+    """Conserva el TokenBuffer producido por el lexer en `tokens` (p. ej. para guardarlo en result_cache)."""
+
+    def __init__(self):
+        self.tokens = None
+
+    def write_tokens(self, tokens):
+        self.tokens = tokens
+
+
+class CallbackSink(TokenSink):
+    """Llama a `on_token` con cada token en formato de tupla (nombre, [lexema,] línea, columna)
+    y a `on_errors` (si se indica) con el texto de los errores."""
+
+    def __init__(self, on_token, on_errors=None):
+        self.on_token = on_token
+        self.on_errors = on_errors
+
+    def write_tokens(self, tokens):
+        for token in tokens.tuples():
+            self.on_token(token)
+
+    def write_errors(self, message):
+        if self.on_errors is not None:
+            self.on_errors(message)
+
+
+def format_tokens(tokens, start, stop):
+    """Genera las líneas de texto de los tokens [start, stop) de un TokenBuffer."""
+    source = tokens.source
+    if not isinstance(source, str):
+        source = LexemeDecoder(source)  # Código en bytes: cada lexema se decodifica al formatearlo
+    kinds, lines, columns, starts, ends = tokens.kinds, tokens.lines, tokens.columns, tokens.starts, tokens.ends
+    for index in range(start, stop):
+        kind = kinds[index]
+        if HAS_LEXEME[kind]:
+            yield f"<{TOKEN_NAMES[kind]},{source[starts[index]:ends[index]]},{lines[index]},{columns[index]}>\n"
+        else:
+            yield f"<{TOKEN_NAMES[kind]},{lines[index]},{columns[index]}>\n"
+
+
+class LexemeDecoder:
+    """Rebanadas de un código en bytes decodificadas como texto."""
+    __slots__ = ('source',)
+
+    def __init__(self, source):
+        self.source = source
+
+    def __getitem__(self, index):
+        return self.source[index].decode('utf-8')
+
+
+def binary_chunks(tokens):
+    """Genera las partes del formato binario de un TokenBuffer (ver BinarySink): encabezado, columnas y código."""
+    source = tokens.source.encode('utf-8') if isinstance(tokens.source, str) else tokens.source
+    yield BINARY_HEADER.pack(BINARY_MAGIC, len(tokens), len(source))
+    for name in BINARY_COLUMNS:
+        column = getattr(tokens, name)
+        if sys.byteorder == 'big':
+            column = array('i', column)
+            column.byteswap()
+        yield column.tobytes()
+    yield source
+
+
+def encode_tokens(tokens):
+    """Retorna un TokenBuffer en el formato binario de BinarySink."""
+    return b''.join(binary_chunks(tokens))
+
+
+def read_binary_tokens(path):
+    """Lee un archivo escrito por BinarySink y retorna su TokenBuffer."""
+    with open(path, 'rb') as file:
+        data = file.read()
+    try:
+        return decode_tokens(data)
+    except ValueError:
+        raise ValueError(f"'{path}' no es un archivo de tokens binario") from None
+
+
+def decode_tokens(data):
+    """Reconstruye el TokenBuffer de datos en el formato binario de BinarySink."""
+    if len(data) < BINARY_HEADER.size or data[:len(BINARY_MAGIC)] != BINARY_MAGIC:
+        raise ValueError("Los datos no están en el formato de tokens binario")
+    _, count, source_size = BINARY_HEADER.unpack_from(data)
+    offset = BINARY_HEADER.size
+    tokens = TokenBuffer()
+    for name in BINARY_COLUMNS:
+        column = getattr(tokens, name)
+        column.frombytes(data[offset:offset + 4 * count])
+        if sys.byteorder == 'big':
+            column.byteswap()
+        offset += 4 * count
+    tokens.symbols = array('i', [-1]) * count  # Sin tabla de símbolos: los lexemas se leen del código
+    tokens.source = data[offset:offset + source_size].decode('utf-8')
+    return tokens
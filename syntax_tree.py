@@ -0,0 +1,172 @@
+# syntax_tree.py
+
+from array import array
+
+from tokens import DELIMITERS
+
+# Terminales que solo delimitan la sintaxis; la vista AST los omite
+SYNTAX_ONLY = frozenset(DELIMITERS.values()) | {'tk_newline', 'tk_indent', 'tk_dedent', '$'}
+
+# Sufijos de los no terminales auxiliares de las listas (p. ej. STATEMENT_LIST_PRIME); la vista AST
+# reemplaza cada uno por sus hijos, de modo que una lista queda como una sola secuencia de elementos
+HELPER_SUFFIXES = ('_PRIME', '_LIST')
+
+
+class SyntaxTree:
+    """Árbol de sintaxis concreto guardado en columnas paralelas de enteros (una arena de nodos).
+
+    Cada nodo es una posición en `kinds` (ID del símbolo, ver Grammar.compile_tables), `first_tokens`
+    (índice del primer token del nodo; en una hoja, el token que emparejó), `child_starts` y
+    `child_counts`. Los hijos de un nodo son los nodos [child_start, child_start + child_count) y se
+    guardan en orden inverso (el último hijo primero), el mismo en que Parser apila la producción.
+    El nodo 0 es la raíz. Tras un error sintáctico el árbol queda incompleto: los nodos que no se
+    llegaron a analizar conservan first_token -1 y ningún hijo.
+    """
+    __slots__ = ('symbol_names', 'n_terms', 'tokens', 'kinds', 'first_tokens', 'child_starts', 'child_counts')
+
+    def __init__(self, symbol_names, n_terms, tokens=None):
+        self.symbol_names = symbol_names  # Nombre de cada ID de símbolo
+        self.n_terms = n_terms  # Los IDs menores son terminales
+        self.tokens = tokens  # Tokens analizados (TokenBuffer o lista), si se pueden indexar
+        self.kinds = array('i')
+        self.first_tokens = array('i')
+        self.child_starts = array('i')
+        self.child_counts = array('i')
+
+    def append(self, kind):
+        """Agrega un nodo sin hijos ni token y retorna su índice."""
+        self.kinds.append(kind)
+        self.first_tokens.append(-1)
+        self.child_starts.append(0)
+        self.child_counts.append(0)
+        return len(self.kinds) - 1
+
+    def nbytes(self):
+        """Memoria ocupada por las columnas de la arena, en bytes."""
+        return sum(column.itemsize * len(column) for column in (self.kinds, self.first_tokens,
+                                                                 self.child_starts, self.child_counts))
+
+    def children(self, index):
+        """Retorna los índices de los hijos de un nodo, en orden."""
+        start = self.child_starts[index]
+        return range(start + self.child_counts[index] - 1, start - 1, -1)
+
+    def preorder(self, index=0):
+        """Genera los índices de los nodos del subárbol en preorden, sin recursión."""
+        stack = [index]
+        while stack:
+            index = stack.pop()
+            yield index
+            start = self.child_starts[index]
+            stack.extend(range(start, start + self.child_counts[index]))
+
+    def node(self, index):
+        """Retorna la vista del nodo `index`."""
+        return Node(self, index)
+
+    @property
+    def root(self):
+        return Node(self, 0)
+
+    def ast(self):
+        """Retorna la raíz de la vista AST del árbol (ver AstNode)."""
+        return AstNode(self, 0)
+
+    def ast_children(self, index, limit=None):
+        """Retorna los índices de los hijos de un nodo en la vista AST (como máximo `limit`).
+
+        Se omiten los terminales de SYNTAX_ONLY y los no terminales vacíos, los no terminales
+        auxiliares (HELPER_SUFFIXES) se reemplazan por sus hijos y las cadenas de no terminales
+        con un solo hijo se reducen a ese hijo.
+        """
+        children = []
+        pending = [iter(self.children(index))]
+        while pending and len(children) != limit:
+            child = next(pending[-1], None)
+            if child is None:
+                pending.pop()
+                continue
+            name = self.symbol_names[self.kinds[child]]
+            if self.kinds[child] < self.n_terms:
+                if name not in SYNTAX_ONLY:
+                    children.append(child)
+            elif name.endswith(HELPER_SUFFIXES):
+                pending.append(iter(self.children(child)))
+            else:
+                child = self.collapse(child)
+                if child is not None:
+                    children.append(child)
+        return children
+
+    def collapse(self, index):
+        """Retorna el nodo que representa a `index` en la vista AST (None si queda vacío)."""
+        while self.kinds[index] >= self.n_terms:
+            children = self.ast_children(index, limit=2)  # Basta saber si tiene uno solo
+            if len(children) != 1:
+                return index if children else None
+            index = children[0]
+        return index
+
+    def __len__(self):
+        return len(self.kinds)
+
+
+class Node:
+    """Vista ligera de un nodo del árbol de sintaxis concreto."""
+    __slots__ = ('tree', 'index')
+
+    def __init__(self, tree, index):
+        self.tree = tree
+        self.index = index
+
+    @property
+    def kind(self):
+        return self.tree.kinds[self.index]
+
+    @property
+    def name(self):
+        return self.tree.symbol_names[self.tree.kinds[self.index]]
+
+    @property
+    def is_terminal(self):
+        return self.tree.kinds[self.index] < self.tree.n_terms
+
+    @property
+    def first_token(self):
+        return self.tree.first_tokens[self.index]
+
+    @property
+    def token(self):
+        """Token emparejado por una hoja (None en no terminales, nodos sin analizar o sin tokens indexables)."""
+        first = self.tree.first_tokens[self.index]
+        if not self.is_terminal or first < 0 or self.tree.tokens is None:
+            return None
+        return self.tree.tokens[first]
+
+    @property
+    def children(self):
+        return [type(self)(self.tree, child) for child in self.tree.children(self.index)]
+
+    def __iter__(self):
+        return iter(self.children)
+
+    def __len__(self):
+        return self.tree.child_counts[self.index]
+
+    def __repr__(self):
+        token = self.token
+        if token is not None and len(token) == 4:
+            return f"{type(self).__name__}({self.name}, {token[1]!r})"
+        return f"{type(self).__name__}({self.name})"
+
+
+class AstNode(Node):
+    """Vista AST de un nodo: sus hijos se calculan al consultarlos, sin copiar el árbol (ver SyntaxTree.ast_children)."""
+    __slots__ = ()
+
+    @property
+    def children(self):
+        return [AstNode(self.tree, child) for child in self.tree.ast_children(self.index)]
+
+    def __len__(self):
+        return len(self.tree.ast_children(self.index))
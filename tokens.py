@@ -1,3 +1,5 @@
+from array import array
+
 # Palabras reservadas adicionales
 RESERVED_WORDS = {
     "False", "None", "True", "and", "as", "assert", "async", "await", "break", 
@@ -37,3 +39,242 @@ def is_operator(char):
 
 def is_delimiter(char):
     return char in DELIMITERS
+
+
+# Tipos de token que puede producir el lexer, codificados como enteros
+SPECIAL_TOKENS = ('id', 'tk_entero', 'tk_string', 'tk_newline', 'tk_indent', 'tk_dedent')
+TOKEN_NAMES = SPECIAL_TOKENS + tuple(sorted(RESERVED_WORDS)) + tuple(OPERATORS.values()) + tuple(DELIMITERS.values())
+TOKEN_IDS = {name: kind for kind, name in enumerate(TOKEN_NAMES)}
+ID, INTEGER, STRING, NEWLINE, INDENT, DEDENT = (TOKEN_IDS[name] for name in SPECIAL_TOKENS)
+RESERVED_IDS = {word: TOKEN_IDS[word] for word in RESERVED_WORDS}
+HAS_LEXEME = bytes(kind in (ID, INTEGER, STRING) for kind in range(len(TOKEN_NAMES)))  # Tipos con lexema
+
+
+# Operadores que empiezan con cada carácter que es por sí mismo un operador, como (operador, longitud, tipo)
+# del más largo al más corto: el primero que coincide en el código es el más largo posible
+OPERATOR_MATCHES = {
+    char: tuple(sorted(((op, len(op), TOKEN_IDS[name]) for op, name in OPERATORS.items() if op[0] == char),
+                       key=lambda match: -match[1]))
+    for char in OPERATORS if len(char) == 1
+}
+
+# Clases de carácter con las que Lexer.scan() elige la rama que analiza el siguiente token
+(CHAR_BLANK, CHAR_COMMENT, CHAR_QUOTE, CHAR_IDENTIFIER, CHAR_DIGIT, CHAR_OPERATOR, CHAR_DELIMITER,
+ CHAR_INVALID) = range(8)
+
+
+def char_class(char):
+    """Clase de un carácter, con las comprobaciones de Lexer.scan() en su orden (el salto de línea y la
+    sangría se tratan antes)."""
+    if char == ' ' or char == '\t':
+        return CHAR_BLANK
+    if char == '#':
+        return CHAR_COMMENT
+    if char == '"' or char == "'":
+        return CHAR_QUOTE
+    if char.isalpha() or char == '_':
+        return CHAR_IDENTIFIER
+    if char.isdigit():
+        return CHAR_DIGIT
+    if is_operator(char):
+        return CHAR_OPERATOR
+    if is_delimiter(char):
+        return CHAR_DELIMITER
+    return CHAR_INVALID
+
+
+# Clase de cada carácter ASCII; los demás se clasifican con char_class al encontrarlos
+ASCII_CHAR_CLASSES = {chr(code): char_class(chr(code)) for code in range(128)}
+
+
+class SymbolTable:
+    """Tabla de símbolos que asigna a cada identificador y literal entero distinto un ID entero pequeño.
+
+    `ids` va del texto al ID y `names[id]` del ID al texto, que se guarda una sola vez aunque aparezca
+    millones de veces. `counts[id]` cuenta las apariciones internadas (una por token analizado, así que
+    un texto analizado de nuevo, p. ej. en incremental, vuelve a contarse). Con un código en bytes
+    (ver mapped_lexer) el lexema en bytes también queda en `ids`, así que se decodifica solo la primera vez.
+    Una misma tabla se puede compartir entre varios lexers (p. ej. los archivos de driver.analyze_paths).
+    """
+    __slots__ = ('ids', 'names', 'counts')
+
+    def __init__(self):
+        self.ids = {}
+        self.names = []
+        self.counts = array('i')
+
+    def intern(self, name):
+        """Retorna el ID de `name` (str o bytes en UTF-8), agregándolo si es nuevo, y cuenta su aparición."""
+        symbol = self.ids.get(name)
+        if symbol is None:
+            symbol = self.add(name)
+        self.counts[symbol] += 1
+        return symbol
+
+    def add(self, name):
+        """Agrega un texto nuevo (str o bytes en UTF-8) sin contar apariciones y retorna su ID."""
+        text = name if isinstance(name, str) else name.decode('utf-8')
+        symbol = self.ids.get(text)
+        if symbol is None:
+            symbol = self.ids[text] = len(self.names)
+            self.names.append(text)
+            self.counts.append(0)
+        self.ids[name] = symbol
+        return symbol
+
+    def merge(self, names, counts):
+        """Agrega los símbolos de otra tabla (sus `names` y `counts`) y retorna el ID que tiene aquí cada uno."""
+        remap = array('i', map(self.add, names))
+        for symbol, count in zip(remap, counts):
+            self.counts[symbol] += count
+        return remap
+
+    def get(self, name):
+        """Retorna el ID de `name`, o None si no está en la tabla."""
+        return self.ids.get(name)
+
+    def most_common(self, count=None):
+        """Retorna los (texto, apariciones) más frecuentes, de mayor a menor."""
+        ranked = sorted(range(len(self.names)), key=self.counts.__getitem__, reverse=True)
+        return [(self.names[symbol], self.counts[symbol]) for symbol in ranked[:count]]
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self.ids
+
+
+# Columnas de TokenBuffer, una posición por token
+TOKEN_COLUMNS = ('kinds', 'lines', 'columns', 'starts', 'ends', 'symbols')
+
+
+class TokenBuffer:
+    """Almacena los tokens en columnas paralelas de enteros (estructura de arreglos).
+
+    Cada token ocupa una posición en `kinds`, `lines`, `columns`, `starts`, `ends` y `symbols`.
+    El lexema no se copia: es la rebanada source[start:end] del código fuente. Solo los
+    identificadores, enteros y cadenas tienen lexema (ver HAS_LEXEME); en los demás tokens
+    `start` y `end` no tienen significado. El código fuente también puede ser bytes (p. ej. el mmap
+    de mapped_lexer): entonces `start` y `end` son desplazamientos en bytes y el lexema se decodifica
+    recién al pedirlo. Si el búfer tiene `symbol_table` (ver SymbolTable), los identificadores y enteros
+    guardan en `symbols` su ID en ella; los demás tokens, y todos los de un búfer sin tabla, guardan -1.
+    """
+    __slots__ = ('source', 'symbol_table') + TOKEN_COLUMNS
+
+    def __init__(self, source='', symbol_table=None):
+        self.source = source
+        self.symbol_table = symbol_table
+        self.kinds = array('i')
+        self.lines = array('i')
+        self.columns = array('i')
+        self.starts = array('i')
+        self.ends = array('i')
+        self.symbols = array('i')
+
+    def append(self, kind, line, column, start=-1, end=-1, symbol=-1):
+        """Agrega un token; `start` y `end` delimitan su lexema en el código fuente y `symbol` es su ID en
+        la tabla de símbolos."""
+        self.kinds.append(kind)
+        self.lines.append(line)
+        self.columns.append(column)
+        self.starts.append(start)
+        self.ends.append(end)
+        self.symbols.append(symbol)
+
+    def clear(self):
+        """Elimina todos los tokens conservando el código fuente."""
+        for name in TOKEN_COLUMNS:
+            del getattr(self, name)[:]
+
+    def discard(self, count):
+        """Elimina los primeros `count` tokens (ya consumidos, ver Parser.lexer_columns)."""
+        for name in TOKEN_COLUMNS:
+            del getattr(self, name)[:count]
+
+    def lexeme(self, index):
+        """Retorna el lexema del token `index`, o None si el token no tiene lexema."""
+        if not HAS_LEXEME[self.kinds[index]]:
+            return None
+        symbol = self.symbols[index]
+        if symbol >= 0:
+            return self.symbol_table.names[symbol]  # El texto internado, sin crear otra cadena
+        lexeme = self.source[self.starts[index]:self.ends[index]]
+        return lexeme if isinstance(lexeme, str) else lexeme.decode('utf-8')
+
+    def splice(self, start, stop, tokens):
+        """Reemplaza los tokens [start, stop) por los de otro TokenBuffer (con la misma tabla de símbolos)."""
+        for name in TOKEN_COLUMNS:
+            getattr(self, name)[start:stop] = getattr(tokens, name)
+
+    def tuples(self):
+        """Genera los tokens en el formato de tuplas (nombre, [lexema,] línea, columna)."""
+        for index in range(len(self.kinds)):
+            yield Token(self, index).as_tuple()
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self.kinds)
+        if not 0 <= index < len(self.kinds):
+            raise IndexError("índice de token fuera de rango")
+        return Token(self, index)
+
+    def __iter__(self):
+        for index in range(len(self.kinds)):
+            yield Token(self, index)
+
+
+class Token:
+    """Vista ligera de un token dentro de un TokenBuffer.
+
+    Se comporta como la tupla (nombre, [lexema,] línea, columna) que producía el lexer
+    para que el código existente pueda indexarla igual.
+    """
+    __slots__ = ('buffer', 'index')
+
+    def __init__(self, buffer, index):
+        self.buffer = buffer
+        self.index = index
+
+    @property
+    def kind(self):
+        return self.buffer.kinds[self.index]
+
+    @property
+    def name(self):
+        return TOKEN_NAMES[self.buffer.kinds[self.index]]
+
+    @property
+    def lexeme(self):
+        return self.buffer.lexeme(self.index)
+
+    @property
+    def symbol(self):
+        return self.buffer.symbols[self.index]
+
+    @property
+    def line(self):
+        return self.buffer.lines[self.index]
+
+    @property
+    def column(self):
+        return self.buffer.columns[self.index]
+
+    def as_tuple(self):
+        """Retorna el token como tupla (nombre, [lexema,] línea, columna)."""
+        lexeme = self.lexeme
+        if lexeme is None:
+            return (self.name, self.line, self.column)
+        return (self.name, lexeme, self.line, self.column)
+
+    def __len__(self):
+        return 4 if HAS_LEXEME[self.buffer.kinds[self.index]] else 3
+
+    def __getitem__(self, index):
+        return self.as_tuple()[index]
+
+    def __repr__(self):
+        return f"Token{self.as_tuple()}"